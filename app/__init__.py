@@ -2,9 +2,10 @@ from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
 from config import Config
+from app.utils.engines import RoutingSession
 
-# Initialize SQLAlchemy extension
-db = SQLAlchemy()
+# Initialize SQLAlchemy extension; its sessions can route reads to a read-only engine
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 # Initialize Migrate extension for handling database migrations
 migrate = Migrate()
 
@@ -23,13 +24,32 @@ def create_app(config_class=Config):
     # Load configuration from Config class
     app.config.from_object(config_class)
     
+    # Configure the writer pool and the read-only engine before the engines are created
+    from app.utils.engines import configure_engines, register_read_routing
+    configure_engines(app)
+    
     # Initialize extensions with the app
     db.init_app(app)
     migrate.init_app(app, db)
     
+    # Serve the reads of GET and HEAD requests from the read-only engine
+    register_read_routing(app, db)
+
+    # Apply the SQLite connection profile (WAL, foreign keys, caches) and maintenance
+    from app.utils.sqlite import configure_sqlite
+    configure_sqlite(app, db)
+
     # Register Jinja2 filters
-    from app.utils.markdown_parser import convert_markdown_to_html
+    from app.utils.markdown_parser import convert_markdown_to_html, configure_cache, configure_pool
+    from app.models.mixins import prerender_markdown
+    configure_cache(app.config.get('MARKDOWN_CACHE_SIZE', 1024))
+    configure_pool(app.config.get('MARKDOWN_POOL_WORKERS', 0), app.config.get('MARKDOWN_POOL_THRESHOLD', 64))
     app.jinja_env.filters['markdown'] = convert_markdown_to_html
+    app.jinja_env.globals['prerender_markdown'] = prerender_markdown
+    
+    # Set up the response cache for the project and sprint views
+    from app.utils.response_cache import configure_response_cache
+    configure_response_cache(app.config)
     
     # Register blueprints
     from app.routes.project_routes import project_bp
@@ -38,6 +58,8 @@ def create_app(config_class=Config):
     from app.routes.issue_routes import issue_bp
     from app.routes.main_routes import main_bp
     from app.routes.htmx_routes import htmx_bp
+    from app.routes.stats_routes import stats_bp
+    from app.routes.search_routes import search_bp
     
     app.register_blueprint(project_bp)
     app.register_blueprint(sprint_bp)
@@ -45,6 +67,8 @@ def create_app(config_class=Config):
     app.register_blueprint(issue_bp)
     app.register_blueprint(main_bp)
     app.register_blueprint(htmx_bp)  # Register the HTMX blueprint
+    app.register_blueprint(stats_bp)
+    app.register_blueprint(search_bp)
     
     # Register MCP API blueprint
     from app.api.api import mcp_api_bp
@@ -54,6 +78,10 @@ def create_app(config_class=Config):
     from app.mcp import setup_mcp_server
     app = setup_mcp_server(app)
     
+    # Register CLI commands
+    from app.commands import register_commands
+    register_commands(app)
+    
     # Import models to ensure they are registered with SQLAlchemy
     from app.models import project, sprint, task, issue
 
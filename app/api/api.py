@@ -6,12 +6,16 @@ the Build Together (BTG) application. These endpoints implement the necessary fu
 for the MCP tools without duplicating the MCP server implementation.
 """
 
-from flask import Blueprint, jsonify, request
+from typing import Optional
+from flask import Blueprint, current_app, jsonify, request
 from app.models.project import Project
 from app.models.sprint import Sprint
 from app.models.task import Task
 from app.models.issue import Issue
+from app.models.search import SearchError, find, parse_kinds
 from app import db
+from app.mcp import ToolParameterError, get_compiled_tools
+from app.utils.engines import use_reader
 
 # Create a blueprint for MCP API endpoints
 mcp_api_bp = Blueprint('mcp_api', __name__, url_prefix='/mcp')
@@ -19,6 +23,16 @@ mcp_api_bp = Blueprint('mcp_api', __name__, url_prefix='/mcp')
 # Define an empty tools dictionary that will be populated after all functions are defined
 TOOLS = {}
 
+# Session.info key set while the tools of a batch are running
+BATCH_KEY = 'mcp_batch'
+
+# Default largest number of calls accepted by /mcp/execute_batch
+DEFAULT_BATCH_MAX_CALLS = 100
+
+# Transaction modes for /mcp/execute_batch
+BATCH_MODE_ATOMIC = 'atomic'
+BATCH_MODE_BEST_EFFORT = 'best_effort'
+
 # Helper functions to replace the ones from tool_definitions
 def get_tool_definition(tool_name):
     """Get tool definition by name"""
@@ -28,6 +42,86 @@ def get_tool_parameters(tool_name):
     """Get parameters for a tool (placeholder for now)"""
     return {}
 
+def _commit():
+    """
+    Commit the changes made by a tool
+    
+    Inside /mcp/execute_batch the changes are only flushed, so IDs are assigned
+    for later calls while the batch decides when to commit or roll back.
+    """
+    if db.session.info.get(BATCH_KEY):
+        db.session.flush()
+    else:
+        db.session.commit()
+
+def _name_error(model, name):
+    """
+    Return an error result if a name does not fit the model's name column
+    
+    SQLite accepts strings of any length; PostgreSQL rejects the statement.
+    """
+    max_length = model.name.type.length
+    if name is not None and len(name) > max_length:
+        return {"error": f"Name must be at most {max_length} characters"}
+    return None
+
+class BatchCallError(Exception):
+    """Raised when a call in a batch fails or refers to a failed or unknown call"""
+
+def _resolve_refs(value, results, labels):
+    """
+    Replace {"$ref": "<call>.<field>"} objects with values from earlier results
+    
+    <call> is either the zero-based index of an earlier call or the label given
+    in its "id", and <field> is a dotted path into its result (e.g. "0.id" or
+    "sprint.project_id").
+    
+    Args:
+        value: Parameter value, possibly containing references
+        results: Results of the calls executed so far (None for failed calls)
+        labels: Mapping of call labels to indexes
+        
+    Returns:
+        The value with every reference replaced
+    """
+    if isinstance(value, dict):
+        if set(value) == {'$ref'}:
+            call, _, path = str(value['$ref']).partition('.')
+            index = labels.get(call, int(call) if call.isdigit() else None)
+            if index is None or index >= len(results):
+                raise BatchCallError(f"Reference '{value['$ref']}' does not point to an earlier call")
+            resolved = results[index]
+            if resolved is None:
+                raise BatchCallError(f"Reference '{value['$ref']}' points to a failed call")
+            for key in filter(None, path.split('.')):
+                if not isinstance(resolved, dict) or key not in resolved:
+                    raise BatchCallError(f"Reference '{value['$ref']}' does not match the result of call {index}")
+                resolved = resolved[key]
+            return resolved
+        return {key: _resolve_refs(item, results, labels) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_resolve_refs(item, results, labels) for item in value]
+    return value
+
+def _run_batch_call(call, results, labels):
+    """Run one call of a batch and return its result, raising BatchCallError on failure"""
+    if not isinstance(call, dict) or not call.get('name'):
+        raise BatchCallError('Invalid call: Missing tool name')
+    tool = get_compiled_tools().get(call['name'])
+    if not tool:
+        raise BatchCallError(f"Tool '{call['name']}' not found")
+    
+    parameters = _resolve_refs(call.get('parameters') or call.get('arguments') or {}, results, labels)
+    try:
+        result = tool(parameters)
+    except ToolParameterError as e:
+        raise BatchCallError(str(e))
+    
+    # Tools report missing rows and invalid values as an error result
+    if isinstance(result, dict) and 'error' in result:
+        raise BatchCallError(result['error'])
+    return result
+
 @mcp_api_bp.route('/', methods=['GET'])
 def mcp_root():
     """Root endpoint for the MCP server"""
@@ -41,15 +135,8 @@ def ping():
 @mcp_api_bp.route('/tools', methods=['GET'])
 def get_tools():
     """Return the list of available tools"""
-    # Return tool definitions with descriptions for the MCP inspector
-    tool_definitions = []
-    for name, func in TOOLS.items():
-        description = func.__doc__ or f"Execute the {name} tool"
-        tool_definitions.append({
-            "name": name,
-            "description": description.strip()
-        })
-    return jsonify(tool_definitions)
+    # Return tool definitions with descriptions and parameters for the MCP inspector
+    return jsonify([tool.describe() for tool in get_compiled_tools().values()])
 
 @mcp_api_bp.route('/execute', methods=['POST'])
 def execute_tool():
@@ -62,56 +149,125 @@ def execute_tool():
     print(f"MCP execute tool: {tool_name} with parameters: {parameters}")
     
     # Find the tool implementation
-    tool_impl = TOOLS.get(tool_name)
-    if not tool_impl:
+    tool = get_compiled_tools().get(tool_name)
+    if not tool:
         return jsonify({"error": f"Tool '{tool_name}' not found"})
     
-    # Handle parameter validation to ensure we only use parameters that match our data model
-    if tool_name in ['create_task', 'update_task', 'create_issue', 'update_issue']:
-        # If old parameter names are used, return an error with guidance
-        if 'title' in parameters or 'description' in parameters:
-            return jsonify({
-                "error": f"Invalid parameters for tool '{tool_name}'. Use 'details' instead of 'title' or 'description' to match the data model."
-            })
+    # list_* and get_* tools read from the read-only engine
+    if tool.read_only:
+        use_reader(db.session)
     
-    # Execute the tool with the provided parameters
+    # Execute the tool with the provided parameters, rejecting unknown
+    # parameters (e.g. 'title' instead of 'details') before calling it
     try:
-        # Ensure boolean parameters are properly handled
-        for key, value in parameters.items():
-            if isinstance(value, str) and value.lower() in ['true', 'false']:
-                parameters[key] = value.lower() == 'true'
-        
-        result = tool_impl(**parameters)
+        result = tool(parameters)
         return jsonify({"result": result})
     except Exception as e:
         return jsonify({"error": str(e)})
 
+@mcp_api_bp.route('/execute_batch', methods=['POST'])
+def execute_batch():
+    """
+    Execute an ordered list of tool calls in a single database session
+    
+    Request body:
+        calls: List of {"name", "parameters"} objects, each with an optional "id"
+            label; parameters may contain {"$ref": "<index or label>.<field>"}
+            to use a value from an earlier call's result
+        mode: "atomic" (default) commits only if every call succeeds, while
+            "best_effort" runs each call in a savepoint and commits the ones that succeed
+    
+    Returns:
+        JSON response with one {"result"} or {"error"} entry per call in request order
+    """
+    data = request.get_json(silent=True)
+    if isinstance(data, list):
+        data = {'calls': data}
+    if not isinstance(data, dict) or not isinstance(data.get('calls'), list) or not data['calls']:
+        return jsonify({"error": "Invalid request: 'calls' must be a non-empty list"}), 400
+    
+    calls = data['calls']
+    mode = data.get('mode', BATCH_MODE_ATOMIC)
+    if mode not in (BATCH_MODE_ATOMIC, BATCH_MODE_BEST_EFFORT):
+        return jsonify({"error": f"Invalid mode: {mode}. Must be '{BATCH_MODE_ATOMIC}' or '{BATCH_MODE_BEST_EFFORT}'"}), 400
+    max_calls = current_app.config.get('MCP_BATCH_MAX_CALLS', DEFAULT_BATCH_MAX_CALLS)
+    if len(calls) > max_calls:
+        return jsonify({"error": f"A batch may contain at most {max_calls} calls"}), 400
+    
+    labels = {call['id']: index for index, call in enumerate(calls)
+              if isinstance(call, dict) and isinstance(call.get('id'), str)}
+    results = []
+    entries = []
+    failed = False
+    
+    db.session.info[BATCH_KEY] = True
+    try:
+        for index, call in enumerate(calls):
+            if failed and mode == BATCH_MODE_ATOMIC:
+                entries.append({"error": "Not executed because an earlier call failed"})
+                continue
+            
+            savepoint = db.session.begin_nested() if mode == BATCH_MODE_BEST_EFFORT else None
+            try:
+                result = _run_batch_call(call, results, labels)
+                if savepoint is not None:
+                    savepoint.commit()
+                results.append(result)
+                entries.append({"result": result})
+            except Exception as e:
+                if savepoint is not None and savepoint.is_active:
+                    savepoint.rollback()
+                failed = True
+                results.append(None)
+                entries.append({"error": str(e)})
+        
+        if failed and mode == BATCH_MODE_ATOMIC:
+            db.session.rollback()
+            committed = False
+        else:
+            db.session.commit()
+            committed = True
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({"error": str(e), "results": entries}), 500
+    finally:
+        db.session.info.pop(BATCH_KEY, None)
+    
+    return jsonify({"mode": mode, "committed": committed, "results": entries})
+
 # Tool implementations
 
-def list_projects():
+def list_projects() -> list:
     """List all projects"""
     projects = Project.query.all()
     return [project.to_dict() for project in projects]
 
-def get_project(project_id):
+def get_project(project_id: int) -> dict:
     """Get a project by ID"""
     project = Project.query.get(project_id)
     if not project:
         return {"error": f"Project with ID {project_id} not found"}
     return project.to_dict()
 
-def create_project(name, description=""):
+def create_project(name: str, description: Optional[str] = "") -> dict:
     """Create a new project"""
+    error = _name_error(Project, name)
+    if error:
+        return error
     project = Project(name=name, description=description)
     db.session.add(project)
-    db.session.commit()
+    _commit()
     return project.to_dict()
 
-def update_project(project_id, name=None, description=None, requirements=None, implementation_details=None):
+def update_project(project_id: int, name: Optional[str] = None, description: Optional[str] = None,
+                   requirements: Optional[str] = None, implementation_details: Optional[str] = None) -> dict:
     """Update an existing project"""
     project = Project.query.get(project_id)
     if not project:
         return {"error": f"Project with ID {project_id} not found"}
+    error = _name_error(Project, name)
+    if error:
+        return error
     
     if name is not None:
         project.name = name
@@ -122,20 +278,20 @@ def update_project(project_id, name=None, description=None, requirements=None, i
     if implementation_details is not None:
         project.implementation_details = implementation_details
     
-    db.session.commit()
+    _commit()
     return project.to_dict()
 
-def delete_project(project_id):
+def delete_project(project_id: int) -> dict:
     """Delete a project by ID"""
     project = Project.query.get(project_id)
     if not project:
         return {"error": f"Project with ID {project_id} not found"}
     
     db.session.delete(project)
-    db.session.commit()
+    _commit()
     return {"success": True, "message": f"Project with ID {project_id} deleted"}
 
-def list_sprints(project_id=None):
+def list_sprints(project_id: Optional[int] = None) -> list:
     """List all sprints, optionally filtered by project ID"""
     if project_id:
         sprints = Sprint.query.filter_by(project_id=project_id).all()
@@ -143,18 +299,21 @@ def list_sprints(project_id=None):
         sprints = Sprint.query.all()
     return [sprint.to_dict() for sprint in sprints]
 
-def get_sprint(sprint_id):
+def get_sprint(sprint_id: int) -> dict:
     """Get a sprint by ID"""
     sprint = Sprint.query.get(sprint_id)
     if not sprint:
         return {"error": f"Sprint with ID {sprint_id} not found"}
     return sprint.to_dict()
 
-def create_sprint(name, project_id, description=None, status="Planned"):
+def create_sprint(name: str, project_id: int, description: Optional[str] = None, status: Optional[str] = "Planned") -> dict:
     """Create a new sprint"""
     # Validate status if provided
     if status and status not in Sprint.VALID_STATUSES:
         return {"error": f"Invalid status: {status}. Must be one of {Sprint.VALID_STATUSES}"}
+    error = _name_error(Sprint, name)
+    if error:
+        return error
         
     sprint = Sprint(name=name, project_id=project_id)
     
@@ -164,10 +323,11 @@ def create_sprint(name, project_id, description=None, status="Planned"):
         sprint.status = status
         
     db.session.add(sprint)
-    db.session.commit()
+    _commit()
     return sprint.to_dict()
 
-def update_sprint(sprint_id, name=None, project_id=None, description=None, status=None):
+def update_sprint(sprint_id: int, name: Optional[str] = None, project_id: Optional[int] = None,
+                  description: Optional[str] = None, status: Optional[str] = None) -> dict:
     """Update an existing sprint"""
     sprint = Sprint.query.get(sprint_id)
     if not sprint:
@@ -176,6 +336,9 @@ def update_sprint(sprint_id, name=None, project_id=None, description=None, statu
     # Validate status if provided
     if status and status not in Sprint.VALID_STATUSES:
         return {"error": f"Invalid status: {status}. Must be one of {Sprint.VALID_STATUSES}"}
+    error = _name_error(Sprint, name)
+    if error:
+        return error
     
     if name is not None:
         sprint.name = name
@@ -186,20 +349,20 @@ def update_sprint(sprint_id, name=None, project_id=None, description=None, statu
     if status is not None:
         sprint.status = status
     
-    db.session.commit()
+    _commit()
     return sprint.to_dict()
 
-def delete_sprint(sprint_id):
+def delete_sprint(sprint_id: int) -> dict:
     """Delete a sprint by ID"""
     sprint = Sprint.query.get(sprint_id)
     if not sprint:
         return {"error": f"Sprint with ID {sprint_id} not found"}
     
     db.session.delete(sprint)
-    db.session.commit()
+    _commit()
     return {"success": True, "message": f"Sprint with ID {sprint_id} deleted"}
 
-def list_tasks(sprint_id=None):
+def list_tasks(sprint_id: Optional[int] = None) -> list:
     """List all tasks, optionally filtered by sprint ID"""
     if sprint_id:
         tasks = Task.query.filter_by(sprint_id=sprint_id).all()
@@ -207,21 +370,22 @@ def list_tasks(sprint_id=None):
         tasks = Task.query.all()
     return [task.to_dict() for task in tasks]
 
-def get_task(task_id):
+def get_task(task_id: int) -> dict:
     """Get a task by ID"""
     task = Task.query.get(task_id)
     if not task:
         return {"error": f"Task with ID {task_id} not found"}
     return task.to_dict()
 
-def create_task(details, sprint_id, completed=False):
+def create_task(details: str, sprint_id: int, completed: Optional[bool] = False) -> dict:
     """Create a new task"""
     task = Task(details=details, sprint_id=sprint_id, completed=completed)
     db.session.add(task)
-    db.session.commit()
+    _commit()
     return task.to_dict()
 
-def update_task(task_id, details=None, sprint_id=None, completed=None):
+def update_task(task_id: int, details: Optional[str] = None, sprint_id: Optional[int] = None,
+                completed: Optional[bool] = None) -> dict:
     """Update an existing task"""
     task = Task.query.get(task_id)
     if not task:
@@ -234,20 +398,20 @@ def update_task(task_id, details=None, sprint_id=None, completed=None):
     if completed is not None:
         task.completed = completed
     
-    db.session.commit()
+    _commit()
     return task.to_dict()
 
-def delete_task(task_id):
+def delete_task(task_id: int) -> dict:
     """Delete a task by ID"""
     task = Task.query.get(task_id)
     if not task:
         return {"error": f"Task with ID {task_id} not found"}
     
     db.session.delete(task)
-    db.session.commit()
+    _commit()
     return {"success": True, "message": f"Task with ID {task_id} deleted"}
 
-def list_issues(sprint_id=None):
+def list_issues(sprint_id: Optional[int] = None) -> list:
     """List all issues, optionally filtered by sprint ID"""
     if sprint_id:
         issues = Issue.query.filter_by(sprint_id=sprint_id).all()
@@ -255,21 +419,22 @@ def list_issues(sprint_id=None):
         issues = Issue.query.all()
     return [issue.to_dict() for issue in issues]
 
-def get_issue(issue_id):
+def get_issue(issue_id: int) -> dict:
     """Get an issue by ID"""
     issue = Issue.query.get(issue_id)
     if not issue:
         return {"error": f"Issue with ID {issue_id} not found"}
     return issue.to_dict()
 
-def create_issue(details, sprint_id, completed=False):
+def create_issue(details: str, sprint_id: int, completed: Optional[bool] = False) -> dict:
     """Create a new issue"""
     issue = Issue(details=details, sprint_id=sprint_id, completed=completed)
     db.session.add(issue)
-    db.session.commit()
+    _commit()
     return issue.to_dict()
 
-def update_issue(issue_id, details=None, sprint_id=None, completed=None):
+def update_issue(issue_id: int, details: Optional[str] = None, sprint_id: Optional[int] = None,
+                 completed: Optional[bool] = None) -> dict:
     """Update an existing issue"""
     issue = Issue.query.get(issue_id)
     if not issue:
@@ -282,19 +447,29 @@ def update_issue(issue_id, details=None, sprint_id=None, completed=None):
     if completed is not None:
         issue.completed = completed
     
-    db.session.commit()
+    _commit()
     return issue.to_dict()
 
-def delete_issue(issue_id):
+def delete_issue(issue_id: int) -> dict:
     """Delete an issue by ID"""
     issue = Issue.query.get(issue_id)
     if not issue:
         return {"error": f"Issue with ID {issue_id} not found"}
     
     db.session.delete(issue)
-    db.session.commit()
+    _commit()
     return {"success": True, "message": f"Issue with ID {issue_id} deleted"}
 
+def search(query: str, kind: Optional[str] = None, limit: int = 20) -> list:
+    """Search projects, sprints, tasks and issues by text, best matches first, optionally filtered by comma separated kinds"""
+    # Invalid input is reported like any other invalid parameter
+    if limit < 1:
+        raise ToolParameterError("limit must be a positive integer")
+    try:
+        return find(query, kinds=parse_kinds(kind), limit=min(limit, current_app.config.get('API_MAX_PAGE_SIZE', 1000)))
+    except SearchError as e:
+        raise ToolParameterError(str(e))
+
 # Now populate the TOOLS dictionary with all the functions after they've been defined
 TOOLS = {
     "list_projects": list_projects,
@@ -316,5 +491,6 @@ TOOLS = {
     "get_issue": get_issue,
     "create_issue": create_issue,
     "update_issue": update_issue,
-    "delete_issue": delete_issue
+    "delete_issue": delete_issue,
+    "search": search
 }
@@ -0,0 +1,49 @@
+"""
+CLI commands for the BTG application.
+
+These commands are registered on the app by create_app(), so they are
+available through the `flask` command line tool.
+"""
+import click
+from flask import Flask
+
+def register_commands(app: Flask) -> None:
+    """
+    Register the custom CLI commands with the Flask application
+    
+    Args:
+        app: The Flask application instance
+    """
+    @app.cli.command('recount')
+    @click.option('--check', is_flag=True, help='Only report drifted sprints without repairing them.')
+    def recount(check):
+        """
+        Verify the stored task and issue counters of every sprint.
+        
+        Counters that do not match the live counts are repaired unless --check is given.
+        """
+        from app.models import Sprint
+        
+        drifted = Sprint.recount(repair=not check)
+        
+        for sprint, stored, expected in drifted:
+            click.echo(f'Sprint {sprint.id} ({sprint.name}): stored {stored}, actual {expected}')
+        
+        if not drifted:
+            click.echo('All sprint counters are correct.')
+        elif check:
+            click.echo(f'{len(drifted)} sprint(s) have drifted counters. Run without --check to repair them.')
+        else:
+            click.echo(f'Repaired counters for {len(drifted)} sprint(s).')
+    
+    @app.cli.command('reindex')
+    def reindex():
+        """
+        Rebuild the full-text search index from the projects, sprints, tasks and issues.
+        
+        The triggers keep the index current; this repairs it after changes made
+        with the triggers missing, e.g. data loaded before the index existed.
+        """
+        from app.models.search import rebuild
+        
+        click.echo(f'Indexed {rebuild()} item(s).')
@@ -4,12 +4,21 @@ MCP Server Setup for BTG
 This module handles the integration between the BTG Flask application
 and the MCP server implementation. It sets up the necessary routes and
 connections for the MCP server to communicate with the application.
+
+Tool signatures are introspected once at startup from the functions in
+app.api.api.TOOLS. Each tool gets a compiled binder that checks parameter
+names and converts values to the annotated types, so dispatching a call is a
+dictionary lookup plus the precomputed conversions. Read-only tools (list_*
+and get_*) run against the read-only engine (see app.utils.engines).
 """
 
-from flask import Flask, Blueprint, request, jsonify
-import importlib.util
-import sys
-import os
+from flask import Flask, Blueprint, current_app, request, jsonify
+import inspect
+import types
+import typing
+
+from app import db
+from app.utils.engines import use_reader
 
 # Import the MCP tool definitions
 try:
@@ -18,115 +27,231 @@ except ImportError:
     # Fallback to API tools if MCP package is not available
     MCP_TOOLS = []
 
+# Key of the compiled tools in app.extensions
+EXTENSION_KEY = 'mcp_tools'
+
+# JSON type names reported for annotated parameter types
+JSON_TYPES = {bool: 'boolean', int: 'integer', float: 'number', str: 'string'}
+
+# Name prefixes and names of tools that only read, so they can use the read-only engine
+READ_ONLY_PREFIXES = ('list_', 'get_')
+READ_ONLY_TOOLS = ('search',)
+
+class ToolParameterError(ValueError):
+    """Raised when a tool call has unknown, missing or invalid parameters"""
+
+def _coerce_bool(value):
+    """Convert JSON booleans and their common string and integer spellings"""
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, str) and value.lower() in ('true', '1', 'yes'):
+        return True
+    if isinstance(value, str) and value.lower() in ('false', '0', 'no'):
+        return False
+    if isinstance(value, int) and value in (0, 1):
+        return bool(value)
+    raise ValueError(value)
+
+def _coerce_int(value):
+    """Convert integers and integral strings or floats"""
+    if isinstance(value, bool):
+        raise ValueError(value)
+    if isinstance(value, int):
+        return value
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, str):
+        return int(value.strip())
+    raise ValueError(value)
+
+def _coerce_float(value):
+    """Convert numbers and numeric strings"""
+    if isinstance(value, bool):
+        raise ValueError(value)
+    return float(value)
+
+def _coerce_str(value):
+    """Accept strings only, so ids or objects are not silently stringified"""
+    if isinstance(value, str):
+        return value
+    raise ValueError(value)
+
+# Converters for the supported parameter annotations
+COERCERS = {bool: _coerce_bool, int: _coerce_int, float: _coerce_float, str: _coerce_str}
+
+class CompiledTool:
+    """
+    A tool function with its parameters introspected once
+
+    Attributes:
+        name: Tool name
+        func: Tool implementation
+        description: Docstring of the tool function
+        parameters: Mapping of parameter name to (type, required, default, allow_none)
+        read_only: Whether the tool only reads and may use the read-only engine
+    """
+
+    def __init__(self, name, func):
+        self.name = name
+        self.func = func
+        self.description = (func.__doc__ or f"Execute the {name} tool").strip()
+        self.read_only = name.startswith(READ_ONLY_PREFIXES) or name in READ_ONLY_TOOLS
+        self.parameters = {}
+        self._coercers = {}
+
+        hints = typing.get_type_hints(func)
+        for param in inspect.signature(func).parameters.values():
+            annotation = hints.get(param.name)
+            allow_none = param.default is None
+            # Unwrap Optional[X] to X
+            args = typing.get_args(annotation)
+            if typing.get_origin(annotation) in (typing.Union, types.UnionType) and type(None) in args:
+                allow_none = True
+                annotation = next(arg for arg in args if arg is not type(None))
+
+            required = param.default is inspect.Parameter.empty
+            self.parameters[param.name] = (annotation, required, None if required else param.default, allow_none)
+            self._coercers[param.name] = COERCERS.get(annotation)
+
+        self._required = [name for name, (_, required, _, _) in self.parameters.items() if required]
+
+    def bind(self, parameters):
+        """
+        Check and convert the parameters of a call
+
+        Args:
+            parameters: Parameter dictionary from the request
+
+        Returns:
+            dict: Keyword arguments for the tool function
+
+        Raises:
+            ToolParameterError: If a parameter is unknown, missing or has the wrong type
+        """
+        if not isinstance(parameters, dict):
+            raise ToolParameterError(f"Parameters for tool '{self.name}' must be an object")
+
+        unknown = [name for name in parameters if name not in self.parameters]
+        if unknown:
+            raise ToolParameterError(
+                f"Unknown parameter(s) for tool '{self.name}': {', '.join(unknown)}. "
+                f"Expected: {', '.join(self.parameters) or 'no parameters'}"
+            )
+        missing = [name for name in self._required if name not in parameters]
+        if missing:
+            raise ToolParameterError(f"Missing required parameter(s) for tool '{self.name}': {', '.join(missing)}")
+
+        kwargs = {}
+        for name, value in parameters.items():
+            coercer = self._coercers[name]
+            if value is None and self.parameters[name][3]:
+                kwargs[name] = None
+            elif coercer is None:
+                kwargs[name] = value
+            else:
+                try:
+                    kwargs[name] = coercer(value)
+                except (ValueError, TypeError):
+                    expected = JSON_TYPES[self.parameters[name][0]]
+                    raise ToolParameterError(
+                        f"Invalid value for parameter '{name}' of tool '{self.name}': expected {expected}"
+                    )
+        return kwargs
+
+    def __call__(self, parameters):
+        """Bind the parameters and run the tool"""
+        return self.func(**self.bind(parameters))
+
+    def describe(self):
+        """Return the tool definition served by /mcp/tools"""
+        return {
+            "name": self.name,
+            "description": self.description,
+            "parameters": {
+                name: {
+                    "type": JSON_TYPES.get(annotation, "any"),
+                    "required": required,
+                    **({} if required else {"default": default})
+                }
+                for name, (annotation, required, default, _) in self.parameters.items()
+            }
+        }
+
+def compile_tools(tools):
+    """
+    Introspect every tool function once
+
+    Args:
+        tools: Mapping of tool name to function
+
+    Returns:
+        dict: Mapping of tool name to CompiledTool
+    """
+    return {name: CompiledTool(name, func) for name, func in tools.items()}
+
+def get_compiled_tools():
+    """Return the compiled tools of the current app"""
+    return current_app.extensions[EXTENSION_KEY]
+
 def setup_mcp_server(app: Flask) -> Flask:
     """
     Set up the MCP server integration with the Flask application
-    
+
     Args:
         app: The Flask application instance
-        
+
     Returns:
         The modified Flask application
     """
+    # Compile the tool signatures once for all requests
+    from app.api.api import TOOLS
+    app.extensions[EXTENSION_KEY] = compile_tools(TOOLS)
+
     # Add a blueprint for MCP-related routes
     mcp_bp = Blueprint('mcp', __name__)
-    
+
     @mcp_bp.route('/mcp/execute', methods=['POST'])
     def execute_mcp_tool():
         """
         Execute an MCP tool through the API
-        
+
         This endpoint receives tool execution requests from the MCP server,
         forwards them to the appropriate API endpoint, and returns the results.
         """
         # Get the tool name and parameters from the request
         data = request.get_json()
-        
+
         if not data or "name" not in data:
             return jsonify({"error": "Invalid request: Missing tool name"}), 400
-            
+
         tool_name = data.get("name")
         parameters = data.get("parameters", {})
-        
-        # Import and execute the API function
+
+        # Check if the tool exists
+        tool = get_compiled_tools().get(tool_name)
+        if tool is None:
+            return jsonify({"error": f"Tool '{tool_name}' not found"}), 404
+
         try:
-            # Import the module dynamically
-            from app.api.api import TOOLS
-            
-            # Check if the tool exists
-            if tool_name not in TOOLS:
-                return jsonify({"error": f"Tool '{tool_name}' not found"}), 404
-                
-            # Get the tool function and call it with the parameters
-            tool_func = TOOLS[tool_name]
-            
-            # Call the tool function
-            if parameters:
-                # Process boolean parameters to ensure proper type conversion
-                processed_parameters = {}
-                
-                # Import tool definitions to check parameter types
-                from app.api.api import get_tools
-                tool_defs = get_tools().json
-                
-                # Find the tool definition to validate parameter types
-                tool_def = next((t for t in tool_defs if t.get("name") == tool_name), None)
-                
-                if tool_def and "parameters" in tool_def:
-                    # Process each parameter according to its defined type
-                    param_defs = tool_def["parameters"]
-                    
-                    for param_name, param_value in parameters.items():
-                        if param_name in param_defs:
-                            param_type = param_defs[param_name].get("type")
-                            
-                            # Handle specific type conversions
-                            if param_type == "boolean" and not isinstance(param_value, bool):
-                                # Convert string or other representations to boolean
-                                if isinstance(param_value, str):
-                                    if param_value.lower() in ["true", "1", "yes"]:
-                                        processed_parameters[param_name] = True
-                                    elif param_value.lower() in ["false", "0", "no"]:
-                                        processed_parameters[param_name] = False
-                                    else:
-                                        processed_parameters[param_name] = param_value
-                                else:
-                                    # Try to convert to boolean based on truthiness
-                                    processed_parameters[param_name] = bool(param_value)
-                            elif param_type == "integer" and not isinstance(param_value, int):
-                                # Try to convert to integer
-                                try:
-                                    processed_parameters[param_name] = int(param_value)
-                                except (ValueError, TypeError):
-                                    processed_parameters[param_name] = param_value
-                            else:
-                                processed_parameters[param_name] = param_value
-                        else:
-                            # Pass through parameters not in the definition
-                            processed_parameters[param_name] = param_value
-                else:
-                    # If no tool definition is found, use parameters as-is
-                    processed_parameters = parameters
-                
-                # Log the processed parameters
-                app.logger.info(f"Executing tool '{tool_name}' with processed parameters: {processed_parameters}")
-                
-                # Call the tool function with the processed parameters
-                result = tool_func(**processed_parameters)
-            else:
-                result = tool_func()
-                
-            # Return the result
+            kwargs = tool.bind(parameters)
+        except ToolParameterError as e:
+            return jsonify({"error": str(e)}), 400
+
+        if tool.read_only:
+            use_reader(db.session)
+
+        try:
+            # Call the tool function with the converted parameters
+            result = tool.func(**kwargs)
             return jsonify({"result": result})
-            
         except Exception as e:
             # Return any errors
             return jsonify({"error": str(e)}), 500
-    
+
     # Register the blueprint with the app
     app.register_blueprint(mcp_bp)
-    
+
     # Log that the MCP server has been set up
     app.logger.info("MCP server integration has been set up")
-    
+
     return app
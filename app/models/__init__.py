@@ -3,3 +3,10 @@ from app.models.project import Project
 from app.models.sprint import Sprint
 from app.models.task import Task
 from app.models.issue import Issue
+
+# Register the listeners that keep the sprint counters up to date
+from app.models import counters
+# Register the listeners that bump project and sprint versions for ETags
+from app.models import versions
+# Register the listeners that create the full-text search index with the tables
+from app.models import search
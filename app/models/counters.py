@@ -0,0 +1,107 @@
+"""
+Denormalized per-sprint task and issue counters
+
+Sprint rows carry open/done counts for their tasks and issues. These listeners
+keep the counts correct inside the same transaction as the change: every flush
+that creates, deletes, toggles or moves a Task or Issue between sprints turns
+into a relative UPDATE on the affected sprint rows.
+
+Writes that bypass the ORM unit of work (raw SQL, Query.update/delete) are not
+seen here. Such drift is repaired by `flask recount`, and reads fall back to
+live counts whenever a stored counter is NULL or negative.
+"""
+from collections import defaultdict
+from sqlalchemy import event, inspect, update
+from sqlalchemy.orm import Session
+from app.models.sprint import Sprint
+from app.models.task import Task
+from app.models.issue import Issue
+
+# Session.info key holding the pending counter deltas for the current flush
+DELTAS_KEY = 'sprint_count_deltas'
+# Session.info key holding the sprint IDs whose counters were updated by the flush
+TOUCHED_KEY = 'sprint_counts_touched'
+
+# Counter columns per model, indexed by completion state
+COUNTER_COLUMNS = {
+    Task: {False: 'open_task_count', True: 'done_task_count'},
+    Issue: {False: 'open_issue_count', True: 'done_issue_count'},
+}
+
+def _original_value(obj, attr):
+    """Return the database value of an attribute before pending changes"""
+    history = inspect(obj).attrs[attr].history
+    if history.deleted:
+        return history.deleted[0]
+    if history.unchanged:
+        return history.unchanged[0]
+    return getattr(obj, attr)
+
+def _add(deltas, model, sprint, completed, amount):
+    """Record a counter change for a sprint (given as an ID or a pending Sprint)"""
+    if sprint is not None:
+        deltas[sprint][COUNTER_COLUMNS[model][bool(completed)]] += amount
+
+@event.listens_for(Session, 'before_flush')
+def _collect_deltas(session, flush_context, instances):
+    """Work out how each pending Task/Issue change affects the sprint counters"""
+    deltas = session.info.setdefault(DELTAS_KEY, defaultdict(lambda: defaultdict(int)))
+
+    for obj in session.new:
+        if type(obj) in COUNTER_COLUMNS:
+            # The sprint may itself be pending if it was assigned via the relationship
+            sprint = obj.sprint_id if obj.sprint_id is not None else obj.sprint
+            _add(deltas, type(obj), sprint, obj.completed, 1)
+
+    for obj in session.deleted:
+        if type(obj) in COUNTER_COLUMNS:
+            _add(deltas, type(obj), _original_value(obj, 'sprint_id'), _original_value(obj, 'completed'), -1)
+
+    for obj in session.dirty:
+        if type(obj) not in COUNTER_COLUMNS or not session.is_modified(obj):
+            continue
+        state = inspect(obj)
+        if not (state.attrs.sprint_id.history.has_changes() or state.attrs.completed.history.has_changes()):
+            continue
+        old_sprint = _original_value(obj, 'sprint_id')
+        old_completed = _original_value(obj, 'completed')
+        new_sprint = obj.sprint_id if obj.sprint_id is not None else obj.sprint
+        if old_sprint == new_sprint and bool(old_completed) == bool(obj.completed):
+            continue
+        _add(deltas, type(obj), old_sprint, old_completed, -1)
+        _add(deltas, type(obj), new_sprint, obj.completed, 1)
+
+@event.listens_for(Session, 'after_flush')
+def _apply_deltas(session, flush_context):
+    """Apply the collected deltas as relative UPDATEs in the flush transaction"""
+    deltas = session.info.pop(DELTAS_KEY, None)
+    if not deltas:
+        return
+
+    touched = session.info.setdefault(TOUCHED_KEY, set())
+    connection = session.connection()
+    for sprint, changes in deltas.items():
+        sprint_id = sprint.id if isinstance(sprint, Sprint) else sprint
+        changes = {column: amount for column, amount in changes.items() if amount}
+        if sprint_id is None or not changes:
+            continue
+        connection.execute(
+            update(Sprint.__table__)
+            .where(Sprint.__table__.c.id == sprint_id)
+            .values({column: Sprint.__table__.c[column] + amount for column, amount in changes.items()})
+        )
+        touched.add(sprint_id)
+
+@event.listens_for(Session, 'after_flush_postexec')
+def _expire_counters(session, flush_context):
+    """Expire counter attributes on loaded sprints so they are re-read from the database"""
+    for sprint_id in session.info.pop(TOUCHED_KEY, ()):
+        sprint = session.identity_map.get(inspect(Sprint).identity_key_from_primary_key((sprint_id,)))
+        if sprint is not None:
+            session.expire(sprint, list(Sprint.COUNTER_COLUMNS))
+
+@event.listens_for(Session, 'after_soft_rollback')
+def _discard_deltas(session, previous_transaction):
+    """Forget pending deltas if the transaction or a savepoint is rolled back"""
+    session.info.pop(DELTAS_KEY, None)
+    session.info.pop(TOUCHED_KEY, None)
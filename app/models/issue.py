@@ -1,13 +1,17 @@
 from app import db
 from datetime import datetime
+from app.models.mixins import RenderedMarkdownMixin, register_markdown_hooks
 
-class Issue(db.Model):
+@register_markdown_hooks
+class Issue(RenderedMarkdownMixin, db.Model):
     """
     Issue model representing a problem or bug within a sprint
     
     Fields:
     - id: Primary key
     - details: Issue details (required)
+    - details_html: Sanitized HTML rendered from details
+    - html_version: Markdown renderer version used for the stored HTML
     - completed: Whether the issue is resolved (boolean)
     - starred: Whether the issue is starred/important (boolean)
     - sprint_id: Foreign key to the associated sprint
@@ -17,14 +21,27 @@ class Issue(db.Model):
     # Table name
     __tablename__ = 'issues'
     
+    # Indexes
+    # Covers filtering by sprint and the (completed, created_at) sort order
+    __table_args__ = (
+        db.Index('ix_issues_sprint_id_completed_created_at', 'sprint_id', 'completed', 'created_at'),
+    )
+    
+    # Markdown fields with a stored HTML rendering
+    MARKDOWN_FIELDS = ('details',)
+    
     # Columns
     id = db.Column(db.Integer, primary_key=True)
     details = db.Column(db.Text, nullable=False)
-    completed = db.Column(db.Boolean, default=False)
+    details_html = db.Column(db.Text, nullable=True)
+    # Old values of completed and sprint_id are always loaded on change so the
+    # sprint counters in app.models.counters can be adjusted precisely
+    completed = db.column_property(db.Column(db.Boolean, default=False), active_history=True)
     starred = db.Column(db.Boolean, default=False)  # New field to mark issues as starred/important
-    sprint_id = db.Column(db.Integer, db.ForeignKey('sprints.id'), nullable=False)
+    sprint_id = db.column_property(db.Column(db.Integer, db.ForeignKey('sprints.id', ondelete='CASCADE'), nullable=False), active_history=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    html_version = db.Column(db.Integer, nullable=True)
     
     def __repr__(self):
         """String representation of the Issue object"""
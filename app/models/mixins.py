@@ -0,0 +1,105 @@
+from sqlalchemy import event, inspect
+from markupsafe import Markup
+from app.utils.markdown_parser import RENDERER_VERSION, convert_markdown_to_html, render_many
+
+class RenderedMarkdownMixin:
+    """
+    Mixin for models that store pre-rendered HTML next to their markdown fields
+
+    Models using this mixin list their markdown source columns in MARKDOWN_FIELDS
+    and declare a matching `<field>_html` Text column for each one, plus an
+    integer `html_version` column recording the renderer version that produced
+    the stored HTML. The HTML is computed on write by the before_insert and
+    before_update hooks registered with register_markdown_hooks().
+    """
+    # Names of the markdown source columns; overridden by each model
+    MARKDOWN_FIELDS = ()
+
+    def render_markdown_fields(self, fields=None):
+        """
+        Recompute the stored HTML for the given markdown fields
+
+        Args:
+            fields: Iterable of field names to render (default: all MARKDOWN_FIELDS)
+        """
+        for field in fields or self.MARKDOWN_FIELDS:
+            setattr(self, f'{field}_html', str(convert_markdown_to_html(getattr(self, field))))
+        self.html_version = RENDERER_VERSION
+
+    def rendered(self, field):
+        """
+        Return the sanitized HTML for a markdown field
+
+        Uses the stored HTML when it was produced by the current renderer version,
+        otherwise renders the source text on the fly. Stale rows are rewritten on
+        their next update.
+
+        Args:
+            field: Name of the markdown source column
+
+        Returns:
+            Markup: Safe HTML for use in templates
+        """
+        if self.has_fresh_html(field):
+            return Markup(getattr(self, f'{field}_html'))
+        prerendered = getattr(self, '_prerendered', {})
+        if field in prerendered:
+            return prerendered[field]
+        return convert_markdown_to_html(getattr(self, field))
+
+    def has_fresh_html(self, field):
+        """Return True if the stored HTML for field was produced by the current renderer"""
+        return getattr(self, f'{field}_html') is not None and self.html_version == RENDERER_VERSION
+
+def prerender_markdown(items, field):
+    """
+    Render a markdown field for a list of objects in a single batch
+
+    Objects whose stored HTML is stale or missing are rendered together through
+    render_many, so a list view does one batched pass instead of one markdown and
+    bleach pass per item. The results are kept on the instances and returned by
+    rendered() for the rest of the request.
+
+    Args:
+        items: Iterable of objects using RenderedMarkdownMixin
+        field: Name of the markdown source column
+
+    Returns:
+        list: The objects, so templates can loop over the result directly
+    """
+    items = list(items)
+    stale = [item for item in items if not item.has_fresh_html(field)]
+    if stale:
+        for item, html in zip(stale, render_many(getattr(item, field) for item in stale)):
+            item.__dict__.setdefault('_prerendered', {})[field] = html
+    return items
+
+def _render_on_insert(mapper, connection, target):
+    """Render every markdown field before a new row is inserted"""
+    target.render_markdown_fields()
+
+def _render_on_update(mapper, connection, target):
+    """Re-render changed markdown fields, or all of them if the stored HTML is stale"""
+    if target.html_version != RENDERER_VERSION:
+        target.render_markdown_fields()
+        return
+
+    state = inspect(target)
+    changed = [field for field in target.MARKDOWN_FIELDS
+               if state.attrs[field].history.has_changes()]
+    if changed:
+        target.render_markdown_fields(changed)
+
+def register_markdown_hooks(model):
+    """
+    Register the before_insert/before_update hooks that keep the stored HTML in sync
+
+    Args:
+        model: Model class using RenderedMarkdownMixin
+
+    Returns:
+        The model class, so this can be used as a class decorator
+    """
+    event.listen(model, 'before_insert', _render_on_insert)
+    event.listen(model, 'before_update', _render_on_update)
+    return model
@@ -1,8 +1,10 @@
 from app import db
 from datetime import datetime
 from app.models.sprint import Sprint
+from app.models.mixins import RenderedMarkdownMixin, register_markdown_hooks
 
-class Project(db.Model):
+@register_markdown_hooks
+class Project(RenderedMarkdownMixin, db.Model):
     """
     Project model representing an AI coding project
     
@@ -12,32 +14,51 @@ class Project(db.Model):
     - description: Project description and goals
     - requirements: Project requirements
     - implementation_details: Project implementation details
+    - description_html, requirements_html, implementation_details_html: Sanitized HTML
+      rendered from the matching markdown fields
     - created_at: Timestamp when the project was created
     - updated_at: Timestamp when the project was last updated
+    - html_version: Markdown renderer version used for the stored HTML
+    - version: Change counter, bumped whenever the project or anything under it changes
     - sprints: Relationship to Sprint model (one-to-many)
     """
     # Table name
     __tablename__ = 'projects'
     
+    # Markdown fields with a stored HTML rendering
+    MARKDOWN_FIELDS = ('description', 'requirements', 'implementation_details')
+    
     # Columns
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
     description = db.Column(db.Text, nullable=True)
     requirements = db.Column(db.Text, nullable=True)
     implementation_details = db.Column(db.Text, nullable=True)
+    description_html = db.Column(db.Text, nullable=True)
+    requirements_html = db.Column(db.Text, nullable=True)
+    implementation_details_html = db.Column(db.Text, nullable=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    html_version = db.Column(db.Integer, nullable=True)
+    # Bumped by app.models.versions on every change to the project, its sprints, tasks or issues
+    version = db.Column(db.Integer, nullable=False, default=1)
     
     # Relationships
-    # One project can have many sprints
-    sprints = db.relationship('Sprint', backref='project', lazy='dynamic', cascade='all, delete-orphan')
+    # One project can have many sprints, removed with their tasks and issues by
+    # ON DELETE CASCADE in the database (passive_deletes skips loading them)
+    sprints = db.relationship('Sprint', backref='project', lazy='dynamic', cascade='all, delete-orphan', passive_deletes=True)
     
     def __repr__(self):
         """String representation of the Project object"""
         return f'<Project {self.name}>'
     
-    def get_sorted_sprints(self):
-        """Returns a list of sprints sorted by status priority (Active, Planned, Completed)"""
+    def get_sorted_sprints(self, with_items=False):
+        """
+        Returns a list of sprints sorted by status priority (Active, Planned, Completed) with their counts attached
+        
+        Args:
+            with_items: Also eagerly load the sorted tasks and issues of every sprint
+        """
         from app.models import Sprint
         
         # Define the status priority for sorting
@@ -48,7 +69,14 @@ class Project(db.Model):
         }
         
         # Get all sprints for this project and sort them by status priority
-        return sorted(self.sprints.all(), key=lambda sprint: status_priority.get(sprint.status, 3))
+        sprints = sorted(self.sprints.all(), key=lambda sprint: status_priority.get(sprint.status, 3))
+        
+        # Load task and issue counts for all sprints in one query
+        Sprint.attach_counts(sprints)
+        
+        if with_items:
+            Sprint.load_items(sprints)
+        return sprints
     
     def get_sprint_count(self):
         """Returns the total number of sprints for this project"""
@@ -0,0 +1,373 @@
+"""
+Full-text search over projects, sprints, tasks and issues.
+
+All four kinds share one index table, search_index, with one row per item:
+
+- title: the project or sprint name (empty for tasks and issues)
+- body: the project description, requirements and implementation details,
+  the sprint description, or the task or issue details
+
+The row key is the item ID times 4 plus the code of its kind, so the triggers
+on the source tables reach an item's row through the primary key. Update
+triggers only fire when an indexed column changes; counter, version and
+completed updates leave the index alone.
+
+- SQLite: an FTS5 virtual table with the porter stemmer, ranked by bm25 with
+  title matches weighted ten times higher than body matches.
+- PostgreSQL (12 or later): a table with a stored tsvector column (title
+  weight A, body weight B) under a GIN index, ranked by ts_rank.
+
+The index is created with the tables by db.create_all(), and `flask reindex`
+rebuilds it from the source tables. Existing databases get it from migration
+d2f7a9c4e613, which keeps its own copy of the statements; a change to the
+index here needs a new migration.
+"""
+import re
+from collections import namedtuple
+
+from markupsafe import escape
+from sqlalchemy import bindparam, event, select, text
+
+from app import db
+from app.models.project import Project
+from app.models.sprint import Sprint
+from app.models.task import Task
+from app.models.issue import Issue
+
+# Name of the index table
+INDEX_TABLE = 'search_index'
+
+# Indexed source table of each kind: row key code, table, title column and body columns
+Source = namedtuple('Source', ['code', 'table', 'title', 'body'])
+SOURCES = {
+    'project': Source(0, 'projects', 'name', ('description', 'requirements', 'implementation_details')),
+    'sprint': Source(1, 'sprints', 'name', ('description',)),
+    'task': Source(2, 'tasks', None, ('details',)),
+    'issue': Source(3, 'issues', None, ('details',)),
+}
+
+# Column holding the row key of the index table per database
+KEY_COLUMNS = {'sqlite': 'rowid', 'postgresql': 'id'}
+
+# Words of a query that are used; the rest are ignored
+MAX_TERMS = 16
+
+# Markers around matched words in snippets, replaced by <mark> after escaping
+HIGHLIGHT_START = '\x02'
+HIGHLIGHT_STOP = '\x03'
+
+# Longest title shown for tasks and issues, which have no name
+TITLE_LENGTH = 80
+
+
+class SearchError(ValueError):
+    """Raised when a search query or kind filter is invalid"""
+
+
+def _row_values(source, row):
+    """Return the SQL expressions of the index row of a source row (`new` or a table alias)"""
+    key = f'{row}.id * 4 + {source.code}'
+    title = f"coalesce({row}.{source.title}, '')" if source.title else "''"
+    body = " || ' ' || ".join(f"coalesce({row}.{column}, '')" for column in source.body)
+    return key, title, body
+
+
+def _indexed_columns(source):
+    """Return the columns whose changes must update the index, comma separated"""
+    return ', '.join(column for column in (source.title, *source.body) if column)
+
+
+def _sqlite_create_statements():
+    """Return the statements creating the FTS5 table and its triggers"""
+    statements = [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {INDEX_TABLE} "
+        f"USING fts5(kind UNINDEXED, item_id UNINDEXED, title, body, tokenize='porter unicode61')"
+    ]
+    for kind, source in SOURCES.items():
+        key, title, body = _row_values(source, 'new')
+        insert = (f"INSERT INTO {INDEX_TABLE} (rowid, kind, item_id, title, body) "
+                  f"VALUES ({key}, '{kind}', new.id, {title}, {body});")
+        delete = f"DELETE FROM {INDEX_TABLE} WHERE rowid = old.id * 4 + {source.code};"
+        trigger = f'{INDEX_TABLE}_{source.table}'
+        statements += [
+            f"CREATE TRIGGER IF NOT EXISTS {trigger}_insert AFTER INSERT ON {source.table} "
+            f"BEGIN {insert} END",
+            f"CREATE TRIGGER IF NOT EXISTS {trigger}_update AFTER UPDATE OF {_indexed_columns(source)} "
+            f"ON {source.table} BEGIN {delete} {insert} END",
+            f"CREATE TRIGGER IF NOT EXISTS {trigger}_delete AFTER DELETE ON {source.table} "
+            f"BEGIN {delete} END",
+        ]
+    return statements
+
+
+def _postgresql_create_statements():
+    """Return the statements creating the tsvector table, its GIN index and the triggers"""
+    statements = [
+        f"CREATE TABLE IF NOT EXISTS {INDEX_TABLE} ("
+        f"id bigint PRIMARY KEY, kind varchar(10) NOT NULL, item_id integer NOT NULL, "
+        f"title text NOT NULL, body text NOT NULL, "
+        f"document tsvector GENERATED ALWAYS AS ("
+        f"setweight(to_tsvector('english', title), 'A') || setweight(to_tsvector('english', body), 'B')"
+        f") STORED)",
+        f"CREATE INDEX IF NOT EXISTS ix_{INDEX_TABLE}_document ON {INDEX_TABLE} USING gin (document)",
+    ]
+    for kind, source in SOURCES.items():
+        key, title, body = _row_values(source, 'NEW')
+        function = f'{INDEX_TABLE}_{source.table}'
+        statements += [
+            f"CREATE OR REPLACE FUNCTION {function}() RETURNS trigger LANGUAGE plpgsql AS $$\n"
+            f"BEGIN\n"
+            f"    IF TG_OP = 'DELETE' THEN\n"
+            f"        DELETE FROM {INDEX_TABLE} WHERE id = OLD.id * 4 + {source.code};\n"
+            f"        RETURN OLD;\n"
+            f"    END IF;\n"
+            f"    INSERT INTO {INDEX_TABLE} (id, kind, item_id, title, body)\n"
+            f"    VALUES ({key}, '{kind}', NEW.id, {title}, {body})\n"
+            f"    ON CONFLICT (id) DO UPDATE SET title = EXCLUDED.title, body = EXCLUDED.body;\n"
+            f"    RETURN NEW;\n"
+            f"END\n"
+            f"$$",
+            f"DROP TRIGGER IF EXISTS {function} ON {source.table}",
+            f"CREATE TRIGGER {function} AFTER INSERT OR DELETE OR UPDATE OF {_indexed_columns(source)} "
+            f"ON {source.table} FOR EACH ROW EXECUTE FUNCTION {function}()",
+        ]
+    return statements
+
+
+def create_statements(dialect_name):
+    """
+    Return the statements creating the search index and its triggers
+
+    Args:
+        dialect_name: SQLAlchemy dialect name of the database
+
+    Returns:
+        list: SQL statements; empty for databases without full-text search support
+    """
+    if dialect_name == 'sqlite':
+        return _sqlite_create_statements()
+    if dialect_name == 'postgresql':
+        return _postgresql_create_statements()
+    return []
+
+
+def drop_statements(dialect_name):
+    """
+    Return the statements dropping the search index and its triggers
+
+    Args:
+        dialect_name: SQLAlchemy dialect name of the database
+
+    Returns:
+        list: SQL statements; empty for databases without full-text search support
+    """
+    statements = []
+    for source in SOURCES.values():
+        name = f'{INDEX_TABLE}_{source.table}'
+        if dialect_name == 'sqlite':
+            statements += [f'DROP TRIGGER IF EXISTS {name}_{action}' for action in ('insert', 'update', 'delete')]
+        elif dialect_name == 'postgresql':
+            statements += [f'DROP TRIGGER IF EXISTS {name} ON {source.table}', f'DROP FUNCTION IF EXISTS {name}()']
+    if dialect_name in KEY_COLUMNS:
+        statements.append(f'DROP TABLE IF EXISTS {INDEX_TABLE}')
+    return statements
+
+
+def rebuild_statements(dialect_name):
+    """
+    Return the statements refilling the search index from the source tables
+
+    Args:
+        dialect_name: SQLAlchemy dialect name of the database
+
+    Returns:
+        list: SQL statements; empty for databases without full-text search support
+    """
+    key_column = KEY_COLUMNS.get(dialect_name)
+    if key_column is None:
+        return []
+
+    statements = [f'DELETE FROM {INDEX_TABLE}']
+    for kind, source in SOURCES.items():
+        key, title, body = _row_values(source, 'source')
+        statements.append(
+            f"INSERT INTO {INDEX_TABLE} ({key_column}, kind, item_id, title, body) "
+            f"SELECT {key}, '{kind}', source.id, {title}, {body} FROM {source.table} AS source"
+        )
+    if dialect_name == 'sqlite':
+        # Merge the b-tree segments written by the bulk insert
+        statements.append(f"INSERT INTO {INDEX_TABLE} ({INDEX_TABLE}) VALUES ('optimize')")
+    return statements
+
+
+@event.listens_for(db.metadata, 'after_create')
+def _create_index(target, connection, **kw):
+    """Create the search index whenever db.create_all() creates the tables"""
+    for statement in create_statements(connection.dialect.name):
+        connection.exec_driver_sql(statement)
+
+
+@event.listens_for(db.metadata, 'before_drop')
+def _drop_index(target, connection, **kw):
+    """Drop the search index before db.drop_all() drops the tables it is filled from"""
+    for statement in drop_statements(connection.dialect.name):
+        connection.exec_driver_sql(statement)
+
+
+def rebuild():
+    """
+    Refill the search index from the source tables and commit
+
+    Returns:
+        int: Number of indexed items
+    """
+    for statement in rebuild_statements(db.session.get_bind().dialect.name):
+        db.session.execute(text(statement))
+    db.session.commit()
+    return db.session.execute(text(f'SELECT count(*) FROM {INDEX_TABLE}')).scalar()
+
+
+def parse_kinds(value):
+    """
+    Parse a comma separated kind filter such as "task,issue"
+
+    Args:
+        value: The filter string, or None for all kinds
+
+    Returns:
+        list: Kind names, or None for all kinds
+
+    Raises:
+        SearchError: If a kind is unknown
+    """
+    if not value:
+        return None
+    kinds = [kind.strip() for kind in value.split(',') if kind.strip()]
+    _check_kinds(kinds)
+    return kinds or None
+
+
+def _check_kinds(kinds):
+    """Raise SearchError if any of the kinds is unknown"""
+    unknown = [kind for kind in kinds or () if kind not in SOURCES]
+    if unknown:
+        raise SearchError(f"Invalid kind: {', '.join(unknown)}. Must be one of {list(SOURCES)}")
+
+
+def _terms(query):
+    """Return the words of a query, dropping operators and punctuation"""
+    terms = re.findall(r'\w+', query or '')[:MAX_TERMS]
+    if not terms:
+        raise SearchError('Search query must contain at least one word')
+    return terms
+
+
+def _ranked_rows(dialect_name, terms, kinds, limit, offset):
+    """Run the ranking query and return (kind, item_id, score, snippet) rows, best first"""
+    kind_filter = 'AND kind IN :kinds' if kinds else ''
+    params = {'limit': limit, 'offset': offset}
+    if dialect_name == 'sqlite':
+        # Quoted prefix terms, implicitly ANDed: `"sprint"* "plan"*`
+        params.update(match=' '.join(f'"{term}"*' for term in terms), start=HIGHLIGHT_START, stop=HIGHLIGHT_STOP)
+        sql = (
+            f"SELECT kind, item_id, -bm25({INDEX_TABLE}, 0.0, 0.0, 10.0, 1.0) AS score, "
+            f"snippet({INDEX_TABLE}, 3, :start, :stop, '…', 16) AS snippet "
+            f"FROM {INDEX_TABLE} WHERE {INDEX_TABLE} MATCH :match {kind_filter} "
+            f"ORDER BY score DESC, rowid LIMIT :limit OFFSET :offset"
+        )
+    elif dialect_name == 'postgresql':
+        params.update(
+            match=' & '.join(f'{term}:*' for term in terms),
+            options=f'StartSel={HIGHLIGHT_START}, StopSel={HIGHLIGHT_STOP}, MaxWords=24, MinWords=8'
+        )
+        # Headlines are only built for the rows on the page
+        sql = (
+            f"SELECT kind, item_id, score, ts_headline('english', body, search_query, :options) AS snippet FROM ("
+            f"SELECT id, kind, item_id, body, search_query, ts_rank(document, search_query) AS score "
+            f"FROM {INDEX_TABLE}, to_tsquery('english', :match) AS search_query "
+            f"WHERE document @@ search_query {kind_filter} "
+            f"ORDER BY score DESC, id LIMIT :limit OFFSET :offset"
+            f") AS hits ORDER BY score DESC, id"
+        )
+    else:
+        raise SearchError(f'Full-text search is not available for {dialect_name} databases')
+
+    statement = text(sql)
+    if kinds:
+        statement = statement.bindparams(bindparam('kinds', expanding=True))
+        params['kinds'] = kinds
+    return db.session.execute(statement, params).all()
+
+
+def _summary(details):
+    """Return the first line of a task or issue, shortened to TITLE_LENGTH characters"""
+    line = next((line.strip() for line in (details or '').splitlines() if line.strip()), '')
+    return line if len(line) <= TITLE_LENGTH else line[:TITLE_LENGTH - 1].rstrip() + '…'
+
+
+def _load_items(kind, ids):
+    """Return the title, project ID and sprint ID of the items of one kind, by ID"""
+    if kind == 'project':
+        rows = db.session.execute(select(Project.id, Project.name).where(Project.id.in_(ids)))
+        return {row.id: (row.name, row.id, None) for row in rows}
+    if kind == 'sprint':
+        rows = db.session.execute(select(Sprint.id, Sprint.name, Sprint.project_id).where(Sprint.id.in_(ids)))
+        return {row.id: (row.name, row.project_id, row.id) for row in rows}
+
+    model = Task if kind == 'task' else Issue
+    rows = db.session.execute(
+        select(model.id, model.details, model.sprint_id, Sprint.project_id)
+        .join(Sprint, Sprint.id == model.sprint_id)
+        .where(model.id.in_(ids))
+    )
+    return {row.id: (_summary(row.details), row.project_id, row.sprint_id) for row in rows}
+
+
+def _highlight(snippet):
+    """Escape a snippet and wrap the matched words in <mark>"""
+    return str(escape((snippet or '').strip())).replace(HIGHLIGHT_START, '<mark>').replace(HIGHLIGHT_STOP, '</mark>')
+
+
+def find(query, kinds=None, limit=20, offset=0):
+    """
+    Search the index, best matches first
+
+    Every word of the query must match, as a word or the start of one.
+    Operators and punctuation in the query are ignored.
+
+    Args:
+        query: Words to search for
+        kinds: Kinds to return ('project', 'sprint', 'task', 'issue'), or None for all
+        limit: Maximum number of results
+        offset: Number of results to skip
+
+    Returns:
+        list: Result dictionaries with kind, id, title, snippet (HTML with the
+        matches in <mark>), score (higher is better), project_id and sprint_id
+
+    Raises:
+        SearchError: If the query has no words or a kind is unknown
+    """
+    _check_kinds(kinds)
+    rows = _ranked_rows(db.session.get_bind().dialect.name, _terms(query), kinds, limit, offset)
+
+    items = {}
+    for kind in {row.kind for row in rows}:
+        items[kind] = _load_items(kind, [row.item_id for row in rows if row.kind == kind])
+
+    results = []
+    for row in rows:
+        item = items[row.kind].get(row.item_id)
+        if item is None:
+            continue
+        title, project_id, sprint_id = item
+        results.append({
+            'kind': row.kind,
+            'id': row.item_id,
+            'title': title,
+            'snippet': _highlight(row.snippet),
+            'score': round(float(row.score), 6),
+            'project_id': project_id,
+            'sprint_id': sprint_id,
+        })
+    return results
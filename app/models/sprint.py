@@ -1,9 +1,12 @@
 from app import db
 from datetime import datetime
+from sqlalchemy import case, event, func, literal, select, union_all
 from app.models.issue import Issue
 from app.models.task import Task
+from app.models.mixins import RenderedMarkdownMixin, register_markdown_hooks
 
-class Sprint(db.Model):
+@register_markdown_hooks
+class Sprint(RenderedMarkdownMixin, db.Model):
     """
     Sprint model representing a work period within a project
     
@@ -11,16 +14,27 @@ class Sprint(db.Model):
     - id: Primary key
     - name: Sprint name (required)
     - description: Sprint description
+    - description_html: Sanitized HTML rendered from description
     - status: Sprint status (Planned, Active, Completed)
     - project_id: Foreign key to the associated project
     - created_at: Timestamp when the sprint was created
     - updated_at: Timestamp when the sprint was last updated
+    - html_version: Markdown renderer version used for the stored HTML
+    - version: Change counter, bumped whenever the sprint or its tasks and issues change
+    - open_task_count, done_task_count: Denormalized task counts
+    - open_issue_count, done_issue_count: Denormalized issue counts
     - tasks: Relationship to Task model (one-to-many)
     - issues: Relationship to Issue model (one-to-many)
     """
     # Table name
     __tablename__ = 'sprints'
     
+    # Indexes
+    # Covers listing a project's sprints, optionally by status
+    __table_args__ = (
+        db.Index('ix_sprints_project_id_status', 'project_id', 'status'),
+    )
+    
     # Status options
     STATUS_PLANNED = 'Planned'
     STATUS_ACTIVE = 'Active'
@@ -29,20 +43,42 @@ class Sprint(db.Model):
     # Valid status values
     VALID_STATUSES = [STATUS_PLANNED, STATUS_ACTIVE, STATUS_COMPLETED]
     
+    # Markdown fields with a stored HTML rendering
+    MARKDOWN_FIELDS = ('description',)
+    
+    # Denormalized counter columns and the get_counts() keys they back
+    COUNTER_COLUMNS = {
+        'open_task_count': 'open_tasks',
+        'done_task_count': 'done_tasks',
+        'open_issue_count': 'open_issues',
+        'done_issue_count': 'done_issues',
+    }
+    
     # Columns
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
     description = db.Column(db.Text, nullable=True)
+    description_html = db.Column(db.Text, nullable=True)
     status = db.Column(db.String(20), default=STATUS_PLANNED)
-    project_id = db.Column(db.Integer, db.ForeignKey('projects.id'), nullable=False)
+    project_id = db.Column(db.Integer, db.ForeignKey('projects.id', ondelete='CASCADE'), nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    html_version = db.Column(db.Integer, nullable=True)
+    # Bumped by app.models.versions on every change to the sprint, its tasks or issues
+    version = db.Column(db.Integer, nullable=False, default=1)
+    # Counters maintained on write by app.models.counters (NULL means unknown)
+    open_task_count = db.Column(db.Integer, default=0)
+    done_task_count = db.Column(db.Integer, default=0)
+    open_issue_count = db.Column(db.Integer, default=0)
+    done_issue_count = db.Column(db.Integer, default=0)
     
     # Relationships
+    # Tasks and issues are removed by ON DELETE CASCADE in the database, so
+    # deleting a sprint does not load its children first (passive_deletes)
     # One sprint can have many tasks
-    tasks = db.relationship('Task', backref='sprint', lazy='dynamic', cascade='all, delete-orphan')
+    tasks = db.relationship('Task', backref='sprint', lazy='dynamic', cascade='all, delete-orphan', passive_deletes=True)
     # One sprint can have many issues
-    issues = db.relationship('Issue', backref='sprint', lazy='dynamic', cascade='all, delete-orphan')
+    issues = db.relationship('Issue', backref='sprint', lazy='dynamic', cascade='all, delete-orphan', passive_deletes=True)
     
     def __repr__(self):
         """String representation of the Sprint object"""
@@ -57,7 +93,8 @@ class Sprint(db.Model):
             'status': self.status,
             'project_id': self.project_id,
             'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
+            **self.counts_dict()
         }
         
     def get_sorted_tasks(self):
@@ -65,20 +102,188 @@ class Sprint(db.Model):
         Get tasks sorted by:
         1. Open tasks first (oldest first)
         2. Closed tasks second (oldest first)
+        
+        The list is loaded with a single query and memoized on the sprint
+        until it is expired (e.g. by a commit).
         """
-        open_tasks = self.tasks.filter_by(completed=False).order_by(Task.created_at.asc()).all()
-        closed_tasks = self.tasks.filter_by(completed=True).order_by(Task.created_at.asc()).all()
-        return open_tasks + closed_tasks
+        if '_sorted_tasks' not in self.__dict__:
+            self._sorted_tasks = self.tasks.order_by(Task.completed.asc().nulls_first(), Task.created_at.asc()).all()
+        return self._sorted_tasks
     
     def get_sorted_issues(self):
         """
         Get issues sorted by:
         1. Open issues first (oldest first)
         2. Closed issues second (oldest first)
+        
+        The list is loaded with a single query and memoized on the sprint
+        until it is expired (e.g. by a commit).
+        """
+        if '_sorted_issues' not in self.__dict__:
+            self._sorted_issues = self.issues.order_by(Issue.completed.asc().nulls_first(), Issue.created_at.asc()).all()
+        return self._sorted_issues
+    
+    @staticmethod
+    def load_items(sprints):
+        """
+        Eagerly load the sorted tasks and issues of many sprints
+        
+        Runs one query for the tasks and one for the issues of all given sprints,
+        regardless of how many sprints there are, and memoizes the results so
+        get_sorted_tasks() and get_sorted_issues() do not query again.
+        
+        Args:
+            sprints: List of Sprint objects
+            
+        Returns:
+            The same list of sprints
+        """
+        if not sprints:
+            return sprints
+        
+        sprint_ids = [sprint.id for sprint in sprints]
+        for model, attribute in ((Task, '_sorted_tasks'), (Issue, '_sorted_issues')):
+            items = {sprint_id: [] for sprint_id in sprint_ids}
+            query = model.query.filter(model.sprint_id.in_(sprint_ids)).order_by(
+                model.sprint_id, model.completed.asc().nulls_first(), model.created_at.asc()
+            )
+            for item in query:
+                items[item.sprint_id].append(item)
+            for sprint in sprints:
+                setattr(sprint, attribute, items[sprint.id])
+        return sprints
+    
+    @staticmethod
+    def count_items(sprint_ids=None, project_id=None):
+        """
+        Count open and done tasks and issues per sprint in a single query
+        
+        Args:
+            sprint_ids: Optional list of sprint IDs to restrict the counts to
+            project_id: Optional project ID to restrict the counts to
+            
+        Returns:
+            dict: Mapping of sprint ID to a dict with open_tasks, done_tasks,
+            open_issues and done_issues counts
+        """
+        items = union_all(
+            select(Task.sprint_id.label('sprint_id'), literal('tasks').label('kind'), Task.completed.label('completed')),
+            select(Issue.sprint_id.label('sprint_id'), literal('issues').label('kind'), Issue.completed.label('completed'))
+        ).subquery()
+        
+        query = select(
+            items.c.sprint_id,
+            items.c.kind,
+            func.count().label('total'),
+            func.sum(case((items.c.completed == True, 1), else_=0)).label('done')
+        ).group_by(items.c.sprint_id, items.c.kind)
+        
+        if sprint_ids is not None:
+            query = query.where(items.c.sprint_id.in_(sprint_ids))
+        if project_id is not None:
+            query = query.join(Sprint, Sprint.id == items.c.sprint_id).where(Sprint.project_id == project_id)
+        
+        counts = {}
+        for sprint_id, kind, total, done in db.session.execute(query):
+            sprint_counts = counts.setdefault(sprint_id, Sprint.empty_counts())
+            sprint_counts[f'open_{kind}'] = total - (done or 0)
+            sprint_counts[f'done_{kind}'] = done or 0
+        return counts
+    
+    @staticmethod
+    def empty_counts():
+        """Return the counts dictionary for a sprint without tasks or issues"""
+        return {'open_tasks': 0, 'done_tasks': 0, 'open_issues': 0, 'done_issues': 0}
+    
+    @staticmethod
+    def attach_counts(sprints):
+        """
+        Load open/done task and issue counts for many sprints with one query
+        
+        The counts are stored on each sprint and returned by get_counts(), so
+        templates can show them without issuing per-sprint count queries.
+        
+        Args:
+            sprints: List of Sprint objects
+            
+        Returns:
+            The same list of sprints
+        """
+        # Only sprints whose stored counters look drifted need live counts
+        drifted = []
+        for sprint in sprints:
+            counts = sprint.stored_counts()
+            if counts is None:
+                drifted.append(sprint)
+            else:
+                sprint._counts = counts
+        
+        if drifted:
+            counts = Sprint.count_items(sprint_ids=[sprint.id for sprint in drifted])
+            for sprint in drifted:
+                sprint._counts = counts.get(sprint.id, Sprint.empty_counts())
+        return sprints
+    
+    def stored_counts(self):
+        """
+        Get the denormalized counts stored on the sprint row
+        
+        Returns:
+            dict: Counts keyed like get_counts(), or None if any stored counter
+            is NULL or negative and therefore cannot be trusted
+        """
+        counts = {key: getattr(self, column) for column, key in Sprint.COUNTER_COLUMNS.items()}
+        if any(value is None or value < 0 for value in counts.values()):
+            return None
+        return counts
+    
+    @staticmethod
+    def recount(repair=True):
+        """
+        Compare the stored counters of every sprint against live counts
+        
+        Args:
+            repair: Whether to overwrite drifted counters with the live values
+            
+        Returns:
+            list: (sprint, stored_counts, live_counts) tuples for drifted sprints
+        """
+        live = Sprint.count_items()
+        drifted = []
+        for sprint in Sprint.query.order_by(Sprint.id).all():
+            expected = live.get(sprint.id, Sprint.empty_counts())
+            stored = {key: getattr(sprint, column) for column, key in Sprint.COUNTER_COLUMNS.items()}
+            if stored != expected:
+                drifted.append((sprint, stored, expected))
+                if repair:
+                    for column, key in Sprint.COUNTER_COLUMNS.items():
+                        setattr(sprint, column, expected[key])
+        if repair and drifted:
+            db.session.commit()
+        return drifted
+    
+    def get_counts(self):
         """
-        open_issues = self.issues.filter_by(completed=False).order_by(Issue.created_at.asc()).all()
-        closed_issues = self.issues.filter_by(completed=True).order_by(Issue.created_at.asc()).all()
-        return open_issues + closed_issues
+        Get the number of open and done tasks and issues in this sprint
+        
+        Uses the denormalized counters on the sprint row, falling back to a
+        single aggregated query when they show signs of drift.
+        
+        Returns:
+            dict: open_tasks, done_tasks, open_issues and done_issues counts
+        """
+        counts = getattr(self, '_counts', None)
+        if counts is None:
+            counts = self.stored_counts()
+            if counts is None:
+                counts = Sprint.count_items(sprint_ids=[self.id]).get(self.id, Sprint.empty_counts())
+            self._counts = counts
+        return counts
+    
+    def counts_dict(self):
+        """Return the task and issue counters for API responses"""
+        counts = self.get_counts()
+        return {column: counts[key] for column, key in Sprint.COUNTER_COLUMNS.items()}
     
     def to_dict_simple(self):
         """Convert sprint to dictionary without related objects for API responses"""
@@ -89,5 +294,12 @@ class Sprint(db.Model):
             'status': self.status,
             'project_id': self.project_id,
             'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
+            **self.counts_dict()
         }
+
+@event.listens_for(Sprint, 'expire')
+def _clear_memos(target, attrs):
+    """Drop attached counts and memoized item lists when the sprint is expired, e.g. after a commit"""
+    for name in ('_counts', '_sorted_tasks', '_sorted_issues'):
+        target.__dict__.pop(name, None)
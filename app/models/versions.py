@@ -0,0 +1,130 @@
+"""
+Per-entity version counters for conditional GETs
+
+Projects and sprints carry a `version` column that is part of their ETag.
+These listeners bump it inside the same transaction as any change that alters
+what a client would see: a sprint's version changes with the sprint itself and
+with every task or issue under it, and a project's version changes with the
+project and with every sprint, task or issue under it.
+
+The IDs bumped during a transaction are kept until it ends, so that
+after_commit listeners (such as the response cache) can act on exactly the
+projects and sprints that changed. Like the sprint counters in
+app.models.counters, writes that bypass the ORM unit of work are not seen here.
+"""
+from sqlalchemy import event, inspect, select, update
+from sqlalchemy.orm import Session
+from app.models.project import Project
+from app.models.sprint import Sprint
+from app.models.task import Task
+from app.models.issue import Issue
+
+# Session.info key holding the projects and sprints to bump for the current flush
+PENDING_KEY = 'entity_versions_pending'
+# Session.info key holding the objects whose version was bumped by the flush
+BUMPED_KEY = 'entity_versions_bumped'
+# Session.info key holding every project and sprint ID bumped in the current transaction
+CHANGED_KEY = 'entity_versions_changed'
+
+def _values(obj, attr):
+    """Return the current and database values of an attribute (either may be a pending object)"""
+    values = {getattr(obj, attr)}
+    history = inspect(obj).attrs[attr].history
+    values.update(history.deleted)
+    return values
+
+def _parent(obj, key_attr, relationship):
+    """Return the parent's ID, or the pending parent object if it has no ID yet"""
+    parent_id = getattr(obj, key_attr)
+    return parent_id if parent_id is not None else getattr(obj, relationship)
+
+@event.listens_for(Session, 'before_flush')
+def _collect_changes(session, flush_context, instances):
+    """Work out which projects and sprints are affected by the pending changes"""
+    pending = session.info.setdefault(PENDING_KEY, {'projects': set(), 'sprints': set()})
+
+    for obj in session.new:
+        # New rows start at the default version, only their parents are bumped
+        if isinstance(obj, Sprint):
+            pending['projects'].add(_parent(obj, 'project_id', 'project'))
+        elif isinstance(obj, (Task, Issue)):
+            pending['sprints'].add(_parent(obj, 'sprint_id', 'sprint'))
+
+    changed = [obj for obj in session.dirty if session.is_modified(obj)] + list(session.deleted)
+    for obj in changed:
+        if isinstance(obj, Project):
+            pending['projects'].add(obj.id)
+        elif isinstance(obj, Sprint):
+            pending['sprints'].add(obj.id)
+            pending['projects'].update(_values(obj, 'project_id'))
+        elif isinstance(obj, (Task, Issue)):
+            pending['sprints'].update(_values(obj, 'sprint_id'))
+
+@event.listens_for(Session, 'after_flush')
+def _bump_versions(session, flush_context):
+    """Increment the version of every affected sprint and project in the flush transaction"""
+    pending = session.info.pop(PENDING_KEY, None)
+    if not pending:
+        return
+
+    def ids(refs, model):
+        # Pending parents have received their primary key during this flush
+        return {ref.id if isinstance(ref, model) else ref for ref in refs} - {None}
+
+    sprint_ids = ids(pending['sprints'], Sprint)
+    project_ids = ids(pending['projects'], Project)
+
+    connection = session.connection()
+    sprints = Sprint.__table__
+    projects = Project.__table__
+    if sprint_ids:
+        connection.execute(
+            update(sprints).where(sprints.c.id.in_(sprint_ids)).values(version=sprints.c.version + 1)
+        )
+        # Changes to a sprint's tasks and issues also change its project
+        project_ids.update(connection.execute(
+            select(sprints.c.project_id).where(sprints.c.id.in_(sprint_ids))
+        ).scalars())
+    if project_ids:
+        connection.execute(
+            update(projects).where(projects.c.id.in_(project_ids)).values(version=projects.c.version + 1)
+        )
+
+    bumped = session.info.setdefault(BUMPED_KEY, [])
+    bumped.extend((Sprint, sprint_id) for sprint_id in sprint_ids)
+    bumped.extend((Project, project_id) for project_id in project_ids)
+
+    changed = session.info.setdefault(CHANGED_KEY, {'projects': set(), 'sprints': set()})
+    changed['sprints'].update(sprint_ids)
+    changed['projects'].update(project_ids)
+
+@event.listens_for(Session, 'after_flush_postexec')
+def _expire_versions(session, flush_context):
+    """Expire the version attribute on loaded objects so it is re-read from the database"""
+    for model, object_id in session.info.pop(BUMPED_KEY, ()):
+        obj = session.identity_map.get(inspect(model).identity_key_from_primary_key((object_id,)))
+        if obj is not None:
+            session.expire(obj, ['version'])
+
+@event.listens_for(Session, 'after_soft_rollback')
+def _discard_pending(session, previous_transaction):
+    """Forget pending bumps if the transaction or a savepoint is rolled back"""
+    session.info.pop(PENDING_KEY, None)
+    session.info.pop(BUMPED_KEY, None)
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_changed(session):
+    """Forget the changed IDs once the whole transaction is rolled back"""
+    session.info.pop(CHANGED_KEY, None)
+
+def pop_changed(session):
+    """
+    Return and forget the projects and sprints changed in the committed transaction
+
+    Args:
+        session: Session that has just committed
+
+    Returns:
+        dict: 'projects' and 'sprints' sets of IDs (empty if nothing changed)
+    """
+    return session.info.pop(CHANGED_KEY, None) or {'projects': set(), 'sprints': set()}
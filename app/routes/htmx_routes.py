@@ -1,10 +1,59 @@
 from flask import Blueprint, render_template, request, make_response, url_for
 from app import db
 from app.models import Task, Issue, Sprint, Project
+from app.models.search import SearchError, find
+from app.routes.search_routes import serialize_result
+from app.utils.etags import conditional_response, entity_etag
+from app.utils.response_cache import project_tag, response_cache, sprint_tag
 
 # Create blueprint for HTMX routes
 htmx_bp = Blueprint('htmx', __name__, url_prefix='/htmx')
 
+# Number of results shown under the search box
+SEARCH_BOX_RESULTS = 10
+
+def _render_item_update(item, kind, created=False):
+    """
+    Render a changed task or issue with out-of-band updates of its sprint's counts
+
+    The response replaces only the item itself; the open/done badges of the
+    sprint and the sidebar are swapped out-of-band, so a mutation no longer
+    re-renders every task and issue of the sprint.
+
+    Args:
+        item: The task or issue that was changed
+        kind: 'tasks' or 'issues'
+        created: Whether the item was just created and has to be inserted
+
+    Returns:
+        Rendered HTML fragment of the item and the updated counts
+    """
+    sprint = item.sprint
+    counts = sprint.get_counts()
+    insert = None
+    if created:
+        # New items go after the open ones: before the oldest done item, or at the end
+        model = type(item)
+        first_done = None
+        if not item.completed:
+            first_done = model.query.with_entities(model.id).filter(
+                model.sprint_id == sprint.id, model.completed.is_(True)
+            ).order_by(model.created_at, model.id).first()
+        if first_done:
+            insert = f'beforebegin:#{kind[:-1]}-{first_done.id}'
+        else:
+            insert = f'beforeend:#sprint-{kind}-{sprint.id}'
+
+    return render_template(
+        'partials/item_update.html',
+        item=item,
+        kind=kind,
+        sprint=sprint,
+        counts=counts,
+        insert=insert,
+        was_empty=created and counts[f'open_{kind}'] + counts[f'done_{kind}'] == 1
+    )
+
 @htmx_bp.route('/tasks/<int:task_id>/toggle', methods=['POST'])
 def toggle_task(task_id):
     """
@@ -14,7 +63,7 @@ def toggle_task(task_id):
         task_id: ID of the task to toggle
         
     Returns:
-        Rendered HTML fragment of the updated project
+        Rendered HTML fragment of the task with out-of-band count updates
     """
     # Get the task
     task = Task.query.get_or_404(task_id)
@@ -25,12 +74,8 @@ def toggle_task(task_id):
     # Save to database
     db.session.commit()
     
-    # Get the sprint and project for this task
-    sprint = Sprint.query.get(task.sprint_id)
-    project = Project.query.get(sprint.project_id)
-    
-    # Return the specific project context
-    return render_template('partials/sprint.html', sprint=sprint, project=project, is_sprint_detail=True)
+    # Return the task with its sprint's counts swapped out-of-band
+    return _render_item_update(task, 'tasks')
 
 @htmx_bp.route('/issues/<int:issue_id>/toggle', methods=['POST'])
 def toggle_issue(issue_id):
@@ -41,7 +86,7 @@ def toggle_issue(issue_id):
         issue_id: ID of the issue to toggle
         
     Returns:
-        Rendered HTML fragment of the updated project
+        Rendered HTML fragment of the issue with out-of-band count updates
     """
     # Get the issue
     issue = Issue.query.get_or_404(issue_id)
@@ -52,12 +97,8 @@ def toggle_issue(issue_id):
     # Save to database
     db.session.commit()
     
-    # Get the sprint and project for this issue
-    sprint = Sprint.query.get(issue.sprint_id)
-    project = Project.query.get(sprint.project_id)
-    
-    # Return the specific project context
-    return render_template('partials/sprint.html', sprint=sprint, project=project, is_sprint_detail=True)
+    # Return the issue with its sprint's counts swapped out-of-band
+    return _render_item_update(issue, 'issues')
 
 @htmx_bp.route('/tasks/create', methods=['POST'])
 def create_task():
@@ -65,7 +106,7 @@ def create_task():
     HTMX endpoint to create a new task
     
     Returns:
-        Rendered HTML fragment of the updated project or all projects
+        Rendered HTML fragment of the task with out-of-band count updates
     """
     sprint_id = request.form.get('sprint_id')
     details = request.form.get('details')
@@ -85,12 +126,8 @@ def create_task():
             db.session.add(task)
             db.session.commit()
             
-            # Get the project for this sprint
-            project = Project.query.get(sprint.project_id)
-            
-            # Always return the specific project for task operations
-            # Task operations are always performed from the project detail page
-            return render_template('partials/sprint.html', sprint=sprint, project=project, is_sprint_detail=True)
+            # Insert the new task in display order and update the counts out-of-band
+            return _render_item_update(task, 'tasks', created=True)
     
     return '', 400  # Bad request
 
@@ -106,7 +143,7 @@ def create_issue():
     HTMX endpoint to create a new issue
     
     Returns:
-        Rendered HTML fragment of the updated project or all projects
+        Rendered HTML fragment of the issue with out-of-band count updates
     """
     sprint_id = request.form.get('sprint_id')
     details = request.form.get('details')
@@ -126,12 +163,8 @@ def create_issue():
             db.session.add(issue)
             db.session.commit()
             
-            # Get the project for this sprint
-            project = Project.query.get(sprint.project_id)
-            
-            # Always return the specific project for issue operations
-            # Issue operations are always performed from the project detail page
-            return render_template('partials/sprint.html', sprint=sprint, project=project, is_sprint_detail=True)
+            # Insert the new issue in display order and update the counts out-of-band
+            return _render_item_update(issue, 'issues', created=True)
     
     return '', 400  # Bad request
 
@@ -186,7 +219,7 @@ def update_task(task_id):
         task_id: ID of the task to update
         
     Returns:
-        Rendered HTML fragment of the updated project or all projects
+        Rendered HTML fragment of the task with out-of-band count updates
     """
     task = Task.query.get_or_404(task_id)
     
@@ -196,13 +229,8 @@ def update_task(task_id):
     
     db.session.commit()
     
-    # Get the sprint and project for this task
-    sprint = Sprint.query.get(task.sprint_id)
-    project = Project.query.get(sprint.project_id)
-    
-    # Always return the specific project for task operations
-    # Task operations are always performed from the project detail page
-    return render_template('partials/sprint.html', sprint=sprint, project=project, is_sprint_detail=True)
+    # Return the task with its sprint's counts swapped out-of-band
+    return _render_item_update(task, 'tasks')
 
 @htmx_bp.route('/tasks/<int:task_id>/delete', methods=['DELETE', 'POST'])
 def delete_task(task_id):
@@ -248,7 +276,7 @@ def star_task(task_id):
         task_id: ID of the task to star/unstar
         
     Returns:
-        Rendered HTML fragment of the updated project or all projects
+        Rendered HTML fragment of the task with out-of-band count updates
     """
     # Get the task
     task = Task.query.get_or_404(task_id)
@@ -259,13 +287,8 @@ def star_task(task_id):
     # Save to database
     db.session.commit()
     
-    # Get the sprint and project for this task
-    sprint = Sprint.query.get(task.sprint_id)
-    project = Project.query.get(sprint.project_id)
-    
-    # Always return the specific project for task operations
-    # Task operations are always performed from the project detail page
-    return render_template('partials/sprint.html', sprint=sprint, project=project, is_sprint_detail=True)
+    # Return the task with its sprint's counts swapped out-of-band
+    return _render_item_update(task, 'tasks')
 
 # Issue HTMX Routes
 
@@ -295,7 +318,7 @@ def update_issue(issue_id):
         issue_id: ID of the issue to update
         
     Returns:
-        Rendered HTML fragment of the updated project or all projects
+        Rendered HTML fragment of the issue with out-of-band count updates
     """
     issue = Issue.query.get_or_404(issue_id)
     
@@ -309,13 +332,8 @@ def update_issue(issue_id):
     
     db.session.commit()
     
-    # Get the sprint and project for this issue
-    sprint = Sprint.query.get(issue.sprint_id)
-    project = Project.query.get(sprint.project_id)
-    
-    # Always return the specific project for issue operations
-    # Issue operations are always performed from the project detail page
-    return render_template('partials/sprint.html', sprint=sprint, project=project, is_sprint_detail=True)
+    # Return the issue with its sprint's counts swapped out-of-band
+    return _render_item_update(issue, 'issues')
 
 @htmx_bp.route('/issues/<int:issue_id>/delete', methods=['DELETE', 'POST'])
 def delete_issue(issue_id):
@@ -361,7 +379,7 @@ def star_issue(issue_id):
         issue_id: ID of the issue to star/unstar
         
     Returns:
-        Rendered HTML fragment of the updated project
+        Rendered HTML fragment of the issue with out-of-band count updates
     """
     # Get the issue
     issue = Issue.query.get_or_404(issue_id)
@@ -372,13 +390,8 @@ def star_issue(issue_id):
     # Save to database
     db.session.commit()
     
-    # Get the sprint and project for this issue
-    sprint = Sprint.query.get(issue.sprint_id)
-    project = Project.query.get(sprint.project_id)
-    
-    # Always return the specific project for issue operations
-    # Issue operations are always performed from the project detail page
-    return render_template('partials/sprint.html', sprint=sprint, project=project, is_sprint_detail=True)
+    # Return the issue with its sprint's counts swapped out-of-band
+    return _render_item_update(issue, 'issues')
 
 # Sprint HTMX Routes
 
@@ -435,7 +448,7 @@ def create_sprint():
     status = request.form.get('status', 'Planned')
     description = request.form.get('description')
     
-    if project_id and name:
+    if project_id and name and len(name) <= Sprint.name.type.length:
         project = Project.query.get(project_id)
         if project:
             # Create new sprint
@@ -472,15 +485,26 @@ def update_sprint(sprint_id):
         sprint_id: ID of the sprint to update/get
         
     Returns:
-        Rendered HTML fragment of the sprint or updated project
+        Rendered HTML fragment of the sprint or updated project; GET requests
+        get 304 Not Modified when If-None-Match matches the current ETag
     """
     sprint = Sprint.query.get_or_404(sprint_id)
     
     if request.method == 'GET':
-        return render_template('partials/sprint.html', sprint=sprint)
+        # Skip rendering if the client's copy of the fragment is current,
+        # and reuse the cached fragment if nothing in the project changed
+        project = sprint.project
+        return conditional_response(entity_etag('sprint-html', sprint, parent=project), lambda: response_cache.get_or_set(
+            f'sprint_fragment:{sprint.id}:{project.version}',
+            [project_tag(project.id), sprint_tag(sprint.id)],
+            lambda: render_template('partials/sprint.html', sprint=sprint, project=project, is_sprint_detail=True)
+        ))
     
     # Update sprint data
-    sprint.name = request.form.get('name', sprint.name)
+    name = request.form.get('name', sprint.name)
+    if len(name) > Sprint.name.type.length:
+        return '', 400  # Bad request
+    sprint.name = name
     sprint.status = request.form.get('status', sprint.status)
     sprint.description = request.form.get('description', sprint.description)
     
@@ -507,11 +531,7 @@ def delete_sprint(sprint_id):
     sprint = Sprint.query.get_or_404(sprint_id)
     project_id = sprint.project_id
     
-    # Delete all tasks and issues associated with this sprint
-    Task.query.filter_by(sprint_id=sprint_id).delete()
-    Issue.query.filter_by(sprint_id=sprint_id).delete()
-    
-    # Delete the sprint
+    # Delete the sprint; its tasks and issues go with it by ON DELETE CASCADE
     db.session.delete(sprint)
     db.session.commit()
     
@@ -582,7 +602,7 @@ def create_project():
     requirements = request.form.get('requirements', '')
     implementation_details = request.form.get('implementation_details', '')
     
-    if name:
+    if name and len(name) <= Project.name.type.length:
         # Create new project
         project = Project(
             name=name,
@@ -614,7 +634,10 @@ def update_project(project_id):
     project = Project.query.get_or_404(project_id)
     
     # Update project data
-    project.name = request.form.get('name', project.name)
+    name = request.form.get('name', project.name)
+    if len(name) > Project.name.type.length:
+        return '', 400  # Bad request
+    project.name = name
     project.description = request.form.get('description', project.description)
     project.requirements = request.form.get('requirements', project.requirements)
     project.implementation_details = request.form.get('implementation_details', project.implementation_details)
@@ -638,13 +661,8 @@ def delete_project(project_id):
     """
     project = Project.query.get_or_404(project_id)
     
-    # Delete all sprints, tasks, and issues in the project
-    for sprint in Sprint.query.filter_by(project_id=project_id).all():
-        Task.query.filter_by(sprint_id=sprint.id).delete()
-        Issue.query.filter_by(sprint_id=sprint.id).delete()
-        db.session.delete(sprint)
-    
-    # Delete the project
+    # Delete the project; the database cascades the delete to its sprints,
+    # tasks and issues without loading them
     db.session.delete(project)
     db.session.commit()
     
@@ -653,3 +671,19 @@ def delete_project(project_id):
     response.headers['HX-Redirect'] = url_for('main.index')
     
     return response
+
+@htmx_bp.route('/search', methods=['GET'])
+def search():
+    """
+    HTMX endpoint for the search box in the navigation bar
+    
+    Returns:
+        Rendered HTML list of the best matches for the `q` query parameter,
+        or an empty response when the query has no words
+    """
+    query = request.args.get('q', '')
+    try:
+        results = [serialize_result(result) for result in find(query, limit=SEARCH_BOX_RESULTS)]
+    except SearchError:
+        return ''
+    return render_template('partials/search_results.html', results=results, query=query)
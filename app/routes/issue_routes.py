@@ -1,6 +1,9 @@
 from flask import Blueprint, request, jsonify
 from app import db
 from app.models import Issue, Sprint
+from app.utils.bulk import apply_bulk
+from app.utils.pagination import PaginationError, paginate, paginated_response
+from app.utils.streaming import stream_ndjson, wants_ndjson
 from sqlalchemy.exc import SQLAlchemyError
 from marshmallow import Schema, fields, validate, ValidationError
 
@@ -29,37 +32,55 @@ class UpdateIssueSchema(Schema):
     completed = fields.Boolean(required=False)
     sprint_id = fields.Integer(required=False)
 
+# Marshmallow schema for issue updates in a bulk request
+class BulkUpdateIssueSchema(UpdateIssueSchema):
+    """
+    Schema for validating one update in a bulk request
+    
+    Same as UpdateIssueSchema plus the required ID of the issue to update
+    """
+    id = fields.Integer(required=True)
+
 # Create schema instances
 issue_schema = IssueSchema()
 update_issue_schema = UpdateIssueSchema()
+bulk_update_issue_schema = BulkUpdateIssueSchema()
 
 # Routes for issues
 @issue_bp.route('', methods=['GET'])
 def get_issues():
     """
-    API endpoint to get all issues
+    API endpoint to get all issues, one page at a time
     
-    Optional query parameter:
+    Optional query parameters:
         sprint_id: Filter issues by sprint ID
+        limit: Maximum number of issues to return
+        cursor: Cursor from the previous page's pagination.next_cursor
     
     Returns:
-        JSON response with array of all issues
+        JSON response with a page of issues, or NDJSON with every row
+        when the request sends Accept: application/x-ndjson
     """
     try:
         # Check if sprint_id query parameter is provided
         sprint_id = request.args.get('sprint_id', type=int)
         
+        query = Issue.query
         if sprint_id:
             # Get issues for specific sprint
-            issues = Issue.query.filter_by(sprint_id=sprint_id).all()
-        else:
-            # Get all issues
-            issues = Issue.query.all()
+            query = query.filter_by(sprint_id=sprint_id)
             
+        # Stream every matching issue to bulk consumers that ask for NDJSON
+        if wants_ndjson():
+            return stream_ndjson(query, Issue, Issue.to_dict)
+        
+        page = paginate(query, Issue)
+        return paginated_response(page, Issue.to_dict)
+    except PaginationError as e:
         return jsonify({
-            'status': 'success',
-            'data': [issue.to_dict() for issue in issues]
-        }), 200
+            'status': 'error',
+            'message': str(e)
+        }), 400
     except SQLAlchemyError as e:
         return jsonify({
             'status': 'error',
@@ -166,6 +187,30 @@ def create_issue():
             'error': str(e)
         }), 500
 
+@issue_bp.route('/bulk', methods=['POST'])
+def bulk_issues():
+    """
+    API endpoint to create, update and delete many issues in one transaction
+    
+    Request body should contain JSON with optional arrays:
+        create: Issue objects as accepted by POST /api/issues
+        update: Objects with the issue id and the fields to change
+        delete: IDs of issues to delete
+    
+    Returns:
+        JSON response with the created, updated and deleted issues in request order,
+        or validation errors; nothing is written if any item is invalid
+    """
+    try:
+        return apply_bulk(Issue, request.get_json(silent=True), issue_schema, bulk_update_issue_schema)
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        return jsonify({
+            'status': 'error',
+            'message': 'Database error',
+            'error': str(e)
+        }), 500
+
 @issue_bp.route('/<int:issue_id>', methods=['PUT'])
 def update_issue(issue_id):
     """
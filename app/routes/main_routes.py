@@ -1,5 +1,6 @@
 from flask import Blueprint, render_template, request
 from app.models import Project, Sprint, Task, Issue
+from app.utils.response_cache import project_tag, response_cache, sprint_tag
 
 # Create blueprint for main routes
 main_bp = Blueprint('main', __name__)
@@ -64,13 +65,18 @@ def project_detail(project_id):
     Route that renders a single project page
     
     This loads a specific project by ID and passes it to the project_detail template.
-    If the project is not found, returns a 404 error.
+    If the project is not found, returns a 404 error. The rendered page is cached
+    until anything in the project changes.
     """
     # Query the project by ID
     project = Project.query.get_or_404(project_id)
     
-    # Render the project detail template
-    return render_template('project_detail.html', project=project)
+    # Render the project detail template, or reuse the cached page
+    return response_cache.get_or_set(
+        f'project_detail:{project.id}:{project.version}',
+        [project_tag(project.id)],
+        lambda: render_template('project_detail.html', project=project)
+    )
 
 @main_bp.route('/project/<int:project_id>/sprint/<int:sprint_id>')
 def sprint_detail(project_id, sprint_id):
@@ -98,6 +104,11 @@ def sprint_detail(project_id, sprint_id):
     if sprint.project_id != project_id:
         return "Sprint not found in this project", 404
     
-    # Render the sprint detail in project context
+    # Render the sprint detail in project context, or reuse the cached page
     # Pass is_sprint_detail=True to tell the sprint template not to make the sprint collapsible
-    return render_template('sprint_detail.html', project=project, sprint=sprint, is_sprint_detail=True)
+    # The page includes the project sidebar, so it depends on the whole project
+    return response_cache.get_or_set(
+        f'sprint_detail:{sprint.id}:{project.version}',
+        [project_tag(project.id), sprint_tag(sprint.id)],
+        lambda: render_template('sprint_detail.html', project=project, sprint=sprint, is_sprint_detail=True)
+    )
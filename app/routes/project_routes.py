@@ -1,6 +1,10 @@
-from flask import Blueprint, request, jsonify, render_template
+from flask import Blueprint, Response, current_app, request, jsonify, render_template
 from app import db
 from app.models import Project
+from app.utils.etags import conditional_response, entity_etag
+from app.utils.response_cache import project_tag, response_cache
+from app.utils.pagination import PaginationError, paginate, paginated_response
+from app.utils.streaming import stream_ndjson, wants_ndjson
 from sqlalchemy.exc import SQLAlchemyError
 from marshmallow import Schema, fields, validate, ValidationError
 
@@ -38,17 +42,28 @@ update_project_schema = UpdateProjectSchema()
 @project_bp.route('', methods=['GET'])
 def get_projects():
     """
-    API endpoint to get all projects
+    API endpoint to get all projects, one page at a time
+    
+    Optional query parameters:
+        limit: Maximum number of projects to return
+        cursor: Cursor from the previous page's pagination.next_cursor
     
     Returns:
-        JSON response with array of all projects
+        JSON response with a page of projects, or NDJSON with every row
+        when the request sends Accept: application/x-ndjson
     """
     try:
-        projects = Project.query.all()
+        # Stream every project to bulk consumers that ask for NDJSON
+        if wants_ndjson():
+            return stream_ndjson(Project.query, Project, Project.to_dict_simple)
+        
+        page = paginate(Project.query, Project)
+        return paginated_response(page, Project.to_dict_simple)
+    except PaginationError as e:
         return jsonify({
-            'status': 'success',
-            'data': [project.to_dict_simple() for project in projects]
-        }), 200
+            'status': 'error',
+            'message': str(e)
+        }), 400
     except SQLAlchemyError as e:
         return jsonify({
             'status': 'error',
@@ -65,7 +80,8 @@ def get_project(project_id):
         project_id: ID of the project to retrieve
         
     Returns:
-        JSON response with project data or error message
+        JSON response with project data or error message, or 304 Not Modified
+        when If-None-Match matches the current ETag
     """
     try:
         project = Project.query.get(project_id)
@@ -76,10 +92,17 @@ def get_project(project_id):
                 'message': f'Project with ID {project_id} not found'
             }), 404
             
-        return jsonify({
-            'status': 'success',
-            'data': project.to_dict()
-        }), 200
+        # Skip serializing the project if the client's copy is current,
+        # and reuse the cached JSON body if nothing in the project changed
+        def build():
+            body = response_cache.get_or_set(
+                f'project_json:{project.id}:{project.version}',
+                [project_tag(project.id)],
+                lambda: current_app.json.dumps({'status': 'success', 'data': project.to_dict()})
+            )
+            return Response(body, status=200, mimetype='application/json')
+        
+        return conditional_response(entity_etag('project-json', project), build)
     except SQLAlchemyError as e:
         return jsonify({
             'status': 'error',
@@ -236,7 +259,7 @@ def delete_project(project_id):
                 'message': f'Project with ID {project_id} not found'
             }), 404
             
-        # Delete project
+        # Delete project; its sprints, tasks and issues go with it by ON DELETE CASCADE
         db.session.delete(project)
         db.session.commit()
         
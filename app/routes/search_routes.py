@@ -0,0 +1,72 @@
+from flask import Blueprint, request, jsonify, url_for
+from app.models.search import SearchError, find, parse_kinds
+from app.utils.pagination import (PaginationError, Page, decode_offset_cursor, encode_offset_cursor,
+                                  get_limit, paginated_response)
+from sqlalchemy.exc import SQLAlchemyError
+
+# Create blueprint for search routes
+search_bp = Blueprint('search', __name__, url_prefix='/api/search')
+
+def result_url(result):
+    """
+    Return the URL of the page showing a search result
+
+    Tasks and issues link to their sprint page, anchored at the item.
+
+    Args:
+        result: Result dictionary from app.models.search.find()
+
+    Returns:
+        str: The page URL
+    """
+    if result['kind'] == 'project':
+        return url_for('main.project_detail', project_id=result['project_id'])
+    url = url_for('main.sprint_detail', project_id=result['project_id'], sprint_id=result['sprint_id'])
+    if result['kind'] in ('task', 'issue'):
+        url += f"#{result['kind']}-{result['id']}"
+    return url
+
+def serialize_result(result):
+    """Return a search result with the URL of its page"""
+    return dict(result, url=result_url(result))
+
+@search_bp.route('', methods=['GET'])
+def search():
+    """
+    API endpoint to search projects, sprints, tasks and issues, best matches first
+
+    Query parameters:
+        q: Words to search for; each must match a word or the start of one
+        kind: Optional comma separated kinds to return (project, sprint, task, issue)
+        limit: Maximum number of results to return
+        cursor: Cursor from the previous page's pagination.next_cursor
+
+    Returns:
+        JSON response with a page of results, each with kind, id, title,
+        snippet (HTML with the matches in <mark>), score, project_id,
+        sprint_id and url
+    """
+    try:
+        kinds = parse_kinds(request.args.get('kind'))
+        limit = get_limit()
+        cursor = request.args.get('cursor')
+        offset = decode_offset_cursor(cursor) if cursor else 0
+
+        # Fetch one extra result to find out whether there is a next page
+        results = find(request.args.get('q', ''), kinds=kinds, limit=limit + 1, offset=offset)
+        next_cursor = None
+        if len(results) > limit:
+            results = results[:limit]
+            next_cursor = encode_offset_cursor(offset + limit)
+        return paginated_response(Page(results, limit, next_cursor), serialize_result)
+    except (SearchError, PaginationError) as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 400
+    except SQLAlchemyError as e:
+        return jsonify({
+            'status': 'error',
+            'message': 'Database error',
+            'error': str(e)
+        }), 500
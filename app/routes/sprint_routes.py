@@ -1,6 +1,9 @@
 from flask import Blueprint, request, jsonify
 from app import db
 from app.models import Sprint, Project
+from app.utils.etags import conditional_response, entity_etag
+from app.utils.pagination import PaginationError, paginate, paginated_response
+from app.utils.streaming import stream_ndjson, wants_ndjson
 from sqlalchemy.exc import SQLAlchemyError
 from marshmallow import Schema, fields, validate, ValidationError
 
@@ -39,29 +42,37 @@ update_sprint_schema = UpdateSprintSchema()
 @sprint_bp.route('', methods=['GET'])
 def get_sprints():
     """
-    API endpoint to get all sprints
+    API endpoint to get all sprints, one page at a time
     
-    Optional query parameter:
+    Optional query parameters:
         project_id: Filter sprints by project ID
+        limit: Maximum number of sprints to return
+        cursor: Cursor from the previous page's pagination.next_cursor
     
     Returns:
-        JSON response with array of all sprints
+        JSON response with a page of sprints, or NDJSON with every row
+        when the request sends Accept: application/x-ndjson
     """
     try:
         # Check if project_id query parameter is provided
         project_id = request.args.get('project_id', type=int)
         
+        query = Sprint.query
         if project_id:
             # Get sprints for specific project
-            sprints = Sprint.query.filter_by(project_id=project_id).all()
-        else:
-            # Get all sprints
-            sprints = Sprint.query.all()
+            query = query.filter_by(project_id=project_id)
             
+        # Stream every matching sprint to bulk consumers that ask for NDJSON
+        if wants_ndjson():
+            return stream_ndjson(query, Sprint, Sprint.to_dict_simple)
+        
+        page = paginate(query, Sprint)
+        return paginated_response(page, Sprint.to_dict_simple)
+    except PaginationError as e:
         return jsonify({
-            'status': 'success',
-            'data': [sprint.to_dict_simple() for sprint in sprints]
-        }), 200
+            'status': 'error',
+            'message': str(e)
+        }), 400
     except SQLAlchemyError as e:
         return jsonify({
             'status': 'error',
@@ -78,7 +89,8 @@ def get_sprint(sprint_id):
         sprint_id: ID of the sprint to retrieve
         
     Returns:
-        JSON response with sprint data or error message
+        JSON response with sprint data or error message, or 304 Not Modified
+        when If-None-Match matches the current ETag
     """
     try:
         sprint = Sprint.query.get(sprint_id)
@@ -89,10 +101,11 @@ def get_sprint(sprint_id):
                 'message': f'Sprint with ID {sprint_id} not found'
             }), 404
             
-        return jsonify({
+        # Skip serializing the sprint if the client's copy is current
+        return conditional_response(entity_etag('sprint-json', sprint), lambda: (jsonify({
             'status': 'success',
             'data': sprint.to_dict()
-        }), 200
+        }), 200))
     except SQLAlchemyError as e:
         return jsonify({
             'status': 'error',
@@ -267,7 +280,7 @@ def delete_sprint(sprint_id):
                 'message': f'Sprint with ID {sprint_id} not found'
             }), 404
             
-        # Delete sprint
+        # Delete sprint; its tasks and issues go with it by ON DELETE CASCADE
         db.session.delete(sprint)
         db.session.commit()
         
@@ -0,0 +1,23 @@
+from flask import Blueprint, jsonify
+from app.utils.markdown_parser import cache_info
+from app.utils.response_cache import response_cache
+
+# Create blueprint for stats routes
+stats_bp = Blueprint('stats', __name__, url_prefix='/api/stats')
+
+@stats_bp.route('', methods=['GET'])
+def get_stats():
+    """
+    API endpoint to get cache statistics for this worker process
+    
+    Returns:
+        JSON response with the response cache hit ratio and invalidation
+        count, and the markdown render cache counters
+    """
+    return jsonify({
+        'status': 'success',
+        'data': {
+            'response_cache': response_cache.stats(),
+            'markdown_cache': cache_info()
+        }
+    }), 200
@@ -1,6 +1,9 @@
 from flask import Blueprint, request, jsonify
 from app import db
 from app.models import Task, Sprint
+from app.utils.bulk import apply_bulk
+from app.utils.pagination import PaginationError, paginate, paginated_response
+from app.utils.streaming import stream_ndjson, wants_ndjson
 from sqlalchemy.exc import SQLAlchemyError
 from marshmallow import Schema, fields, validate, ValidationError
 
@@ -29,37 +32,55 @@ class UpdateTaskSchema(Schema):
     completed = fields.Boolean(required=False)
     sprint_id = fields.Integer(required=False)
 
+# Marshmallow schema for task updates in a bulk request
+class BulkUpdateTaskSchema(UpdateTaskSchema):
+    """
+    Schema for validating one update in a bulk request
+    
+    Same as UpdateTaskSchema plus the required ID of the task to update
+    """
+    id = fields.Integer(required=True)
+
 # Create schema instances
 task_schema = TaskSchema()
 update_task_schema = UpdateTaskSchema()
+bulk_update_task_schema = BulkUpdateTaskSchema()
 
 # Routes for tasks
 @task_bp.route('', methods=['GET'])
 def get_tasks():
     """
-    API endpoint to get all tasks
+    API endpoint to get all tasks, one page at a time
     
-    Optional query parameter:
+    Optional query parameters:
         sprint_id: Filter tasks by sprint ID
+        limit: Maximum number of tasks to return
+        cursor: Cursor from the previous page's pagination.next_cursor
     
     Returns:
-        JSON response with array of all tasks
+        JSON response with a page of tasks, or NDJSON with every row
+        when the request sends Accept: application/x-ndjson
     """
     try:
         # Check if sprint_id query parameter is provided
         sprint_id = request.args.get('sprint_id', type=int)
         
+        query = Task.query
         if sprint_id:
             # Get tasks for specific sprint
-            tasks = Task.query.filter_by(sprint_id=sprint_id).all()
-        else:
-            # Get all tasks
-            tasks = Task.query.all()
+            query = query.filter_by(sprint_id=sprint_id)
             
+        # Stream every matching task to bulk consumers that ask for NDJSON
+        if wants_ndjson():
+            return stream_ndjson(query, Task, Task.to_dict)
+        
+        page = paginate(query, Task)
+        return paginated_response(page, Task.to_dict)
+    except PaginationError as e:
         return jsonify({
-            'status': 'success',
-            'data': [task.to_dict() for task in tasks]
-        }), 200
+            'status': 'error',
+            'message': str(e)
+        }), 400
     except SQLAlchemyError as e:
         return jsonify({
             'status': 'error',
@@ -166,6 +187,30 @@ def create_task():
             'error': str(e)
         }), 500
 
+@task_bp.route('/bulk', methods=['POST'])
+def bulk_tasks():
+    """
+    API endpoint to create, update and delete many tasks in one transaction
+    
+    Request body should contain JSON with optional arrays:
+        create: Task objects as accepted by POST /api/tasks
+        update: Objects with the task id and the fields to change
+        delete: IDs of tasks to delete
+    
+    Returns:
+        JSON response with the created, updated and deleted tasks in request order,
+        or validation errors; nothing is written if any item is invalid
+    """
+    try:
+        return apply_bulk(Task, request.get_json(silent=True), task_schema, bulk_update_task_schema)
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        return jsonify({
+            'status': 'error',
+            'message': 'Database error',
+            'error': str(e)
+        }), 500
+
 @task_bp.route('/<int:task_id>', methods=['PUT'])
 def update_task(task_id):
     """
@@ -0,0 +1,148 @@
+"""
+Bulk create/update/delete helper for the task and issue API endpoints.
+
+A bulk request carries up to three arrays:
+
+    {
+        "create": [{"details": "...", "sprint_id": 1}, ...],
+        "update": [{"id": 5, "completed": true}, ...],
+        "delete": [7, 8]
+    }
+
+Every item is validated, and every referenced sprint and row is checked,
+before anything is written. All changes are then applied in one transaction.
+Results come back per array in request order.
+"""
+from flask import current_app, jsonify
+from marshmallow import ValidationError, fields
+from app import db
+from app.models import Sprint
+
+# Largest number of items (creates + updates + deletes) accepted in one request
+DEFAULT_BULK_MAX_ITEMS = 1000
+
+# Fields copied from validated create/update items onto the model
+BULK_FIELDS = ('details', 'completed', 'sprint_id')
+
+# Deserializes the IDs in the delete array like the schemas' id fields
+DELETE_ID_FIELD = fields.Integer(required=True, allow_none=False)
+
+
+def apply_bulk(model, json_data, create_schema, update_schema):
+    """
+    Validate and apply a bulk request for tasks or issues
+
+    New rows are added with add_all, so the flush batches their INSERTs while the
+    markdown, counter and version hooks still run for every row.
+
+    Args:
+        model: Task or Issue
+        json_data: Parsed request body
+        create_schema: Schema for new items (loaded with many=True)
+        update_schema: Schema for updates, including the required id (loaded with many=True)
+
+    Returns:
+        tuple: (JSON response, status code)
+    """
+    name = model.__name__
+    if not isinstance(json_data, dict):
+        return jsonify({
+            'status': 'error',
+            'message': 'No input data provided'
+        }), 400
+
+    creates = json_data.get('create') or []
+    updates = json_data.get('update') or []
+    deletes = json_data.get('delete') or []
+    if not all(isinstance(items, list) for items in (creates, updates, deletes)):
+        return jsonify({
+            'status': 'error',
+            'message': 'create, update and delete must be arrays'
+        }), 400
+    if not (creates or updates or deletes):
+        return jsonify({
+            'status': 'error',
+            'message': 'No input data provided'
+        }), 400
+
+    max_items = current_app.config.get('API_BULK_MAX_ITEMS', DEFAULT_BULK_MAX_ITEMS)
+    if len(creates) + len(updates) + len(deletes) > max_items:
+        return jsonify({
+            'status': 'error',
+            'message': f'A bulk request may contain at most {max_items} items'
+        }), 400
+
+    # Validate every item before touching the database; the loaded values are
+    # used from here on, so e.g. "sprint_id": "1" is looked up as 1
+    errors = {}
+    try:
+        creates = create_schema.load(creates, many=True)
+    except ValidationError as e:
+        errors['create'] = e.messages
+    try:
+        updates = update_schema.load(updates, many=True)
+    except ValidationError as e:
+        errors['update'] = e.messages
+    delete_ids, delete_errors = [], {}
+    for index, item_id in enumerate(deletes):
+        try:
+            delete_ids.append(DELETE_ID_FIELD.deserialize(item_id))
+        except ValidationError as e:
+            delete_errors[index] = e.messages
+    deletes = delete_ids
+    if delete_errors:
+        errors['delete'] = delete_errors
+    if errors:
+        return jsonify({
+            'status': 'error',
+            'message': 'Validation error',
+            'errors': errors
+        }), 400
+
+    # Check all referenced sprints and rows with one query each
+    sprint_ids = {item['sprint_id'] for item in creates + updates if 'sprint_id' in item}
+    found_sprints = {sprint_id for (sprint_id,) in
+                     db.session.query(Sprint.id).filter(Sprint.id.in_(sprint_ids))} if sprint_ids else set()
+    missing_sprints = sorted(sprint_ids - found_sprints)
+    if missing_sprints:
+        return jsonify({
+            'status': 'error',
+            'message': f'Sprint(s) not found: {", ".join(map(str, missing_sprints))}'
+        }), 404
+
+    item_ids = {item['id'] for item in updates} | set(deletes)
+    existing = {item.id: item for item in model.query.filter(model.id.in_(item_ids))} if item_ids else {}
+    missing_items = sorted(item_ids - existing.keys())
+    if missing_items:
+        return jsonify({
+            'status': 'error',
+            'message': f'{name}(s) not found: {", ".join(map(str, missing_items))}'
+        }), 404
+
+    # Apply everything in one transaction
+    created = [model(**{field: item[field] for field in BULK_FIELDS if field in item}) for item in creates]
+    db.session.add_all(created)
+
+    for item in updates:
+        obj = existing[item['id']]
+        for field in BULK_FIELDS:
+            if field in item:
+                setattr(obj, field, item[field])
+
+    for item_id in deletes:
+        db.session.delete(existing[item_id])
+
+    # Serialize after the flush has assigned IDs but before commit expires the objects
+    db.session.flush()
+    data = {
+        'created': [obj.to_dict() for obj in created],
+        'updated': [existing[item['id']].to_dict() for item in updates],
+        'deleted': deletes
+    }
+    db.session.commit()
+
+    return jsonify({
+        'status': 'success',
+        'message': f'{name}s created: {len(created)}, updated: {len(updates)}, deleted: {len(deletes)}',
+        'data': data
+    }), 200
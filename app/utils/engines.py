@@ -0,0 +1,156 @@
+"""
+Separate writer and reader engines.
+
+The app engine (the default bind) handles writes through a small pool; with
+the default single connection, writers queue in the pool instead of contending
+for SQLite's write lock. A second engine under the `reader` bind key serves
+reads from a larger pool of read-only connections:
+
+- SQLite: the same database file opened with a `mode=ro` URI. In WAL mode these
+  connections keep reading the last committed state while a write is running.
+- Other databases: DATABASE_READ_URL, e.g. a streaming replica. Without it,
+  reads stay on the writer engine.
+
+PostgreSQL engines use the pool profile from app.utils.postgres; the reader
+gets the same profile with DATABASE_READER_POOL_SIZE connections.
+
+In-memory SQLite databases cannot be shared between engines, so they keep a
+single engine.
+
+GET and HEAD requests and read-only MCP tools mark their session with
+use_reader(). RoutingSession then sends its queries to the reader engine until
+the session flushes or runs an INSERT, UPDATE or DELETE statement: from then on
+everything goes to the writer, so a request that writes always reads its own
+changes.
+"""
+import os
+
+from flask import request
+from flask_sqlalchemy.session import Session
+from sqlalchemy.engine import make_url
+from sqlalchemy.sql.dml import UpdateBase
+
+from app.utils import postgres
+
+# Bind key of the read-only engine
+READER_BIND_KEY = 'reader'
+
+# Session.info key set when the session's reads may go to the reader engine
+READ_ONLY_KEY = 'use_reader'
+
+# Request methods whose sessions read from the reader engine
+READ_METHODS = ('GET', 'HEAD')
+
+
+def _is_memory_sqlite(url):
+    """Return whether the URL points to an in-memory SQLite database"""
+    return url.get_backend_name() == 'sqlite' and url.database in (None, '', ':memory:')
+
+
+def reader_url(app):
+    """
+    Return the URL of the read-only engine, or None if reads use the writer
+
+    Args:
+        app: The Flask application
+
+    Returns:
+        str or URL: DATABASE_READ_URL if set, the SQLite file opened with
+        mode=ro, or None
+    """
+    if app.config.get('DATABASE_READ_URL'):
+        return app.config['DATABASE_READ_URL']
+
+    url = make_url(app.config['SQLALCHEMY_DATABASE_URI'])
+    if url.get_backend_name() != 'sqlite' or _is_memory_sqlite(url):
+        return None
+
+    path = url.database
+    if url.query.get('uri'):
+        path = path[len('file:'):] if path.startswith('file:') else path
+        path = path.split('?')[0]
+    # Relative paths are resolved against the instance folder, as Flask-SQLAlchemy does
+    if not os.path.isabs(path):
+        path = os.path.join(app.instance_path, path)
+    return url.set(database=f'file:{path}', query={**url.query, 'mode': 'ro', 'uri': 'true'})
+
+
+def configure_engines(app):
+    """
+    Add the reader bind and the pool sizes to the app config
+
+    Must run before the Flask-SQLAlchemy extension is initialised.
+
+    Args:
+        app: The Flask application
+    """
+    for key in ('SQLALCHEMY_DATABASE_URI', 'DATABASE_READ_URL'):
+        if isinstance(app.config.get(key), str):
+            app.config[key] = postgres.normalize_url(app.config[key])
+
+    url = make_url(app.config['SQLALCHEMY_DATABASE_URI'])
+    if _is_memory_sqlite(url):
+        return
+
+    reader_pool_size = app.config.get('DATABASE_READER_POOL_SIZE', 8)
+    if postgres.is_postgres(url):
+        defaults = postgres.engine_options(app.config)
+    else:
+        defaults = {'pool_size': app.config.get('DATABASE_WRITER_POOL_SIZE', 1), 'max_overflow': 0}
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {**defaults, **(app.config.get('SQLALCHEMY_ENGINE_OPTIONS') or {})}
+
+    read_url = reader_url(app)
+    if read_url is not None:
+        if postgres.is_postgres(read_url):
+            options = postgres.engine_options(app.config, pool_size=reader_pool_size)
+        else:
+            options = {'pool_size': reader_pool_size, 'max_overflow': 0}
+        binds = dict(app.config.get('SQLALCHEMY_BINDS') or {})
+        binds[READER_BIND_KEY] = {'url': read_url, **options}
+        app.config['SQLALCHEMY_BINDS'] = binds
+
+
+def use_reader(session):
+    """
+    Send the session's reads to the reader engine until it writes
+
+    Args:
+        session: The scoped or plain session of the current request or task
+    """
+    session.info[READ_ONLY_KEY] = True
+
+
+class RoutingSession(Session):
+    """Flask-SQLAlchemy session that routes the reads of read-only sessions to the reader engine"""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        """Return the reader engine for reads of a read-only session, else the usual bind"""
+        if bind is None and self.info.get(READ_ONLY_KEY):
+            if self._flushing or isinstance(clause, UpdateBase):
+                # The session writes after all: keep it on the writer from now on
+                self.info[READ_ONLY_KEY] = False
+            else:
+                engine = self._db.engines.get(READER_BIND_KEY)
+                if engine is not None:
+                    return engine
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+def register_read_routing(app, db):
+    """
+    Mark the sessions of GET and HEAD requests as read-only
+
+    Other requests start on the writer; handlers may still call use_reader()
+    for work that only reads, as the MCP endpoints do for list_* and get_*.
+
+    Args:
+        app: The Flask application
+        db: The Flask-SQLAlchemy extension bound to the app
+    """
+    # The reader bind has no tables of its own: keep it out of create_all() and
+    # drop_all(), which would otherwise look for it in apps without a reader
+    db.metadatas.pop(READER_BIND_KEY, None)
+
+    @app.before_request
+    def _route_reads():
+        db.session.info[READ_ONLY_KEY] = request.method in READ_METHODS
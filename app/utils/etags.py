@@ -0,0 +1,53 @@
+"""
+ETag helpers for conditional GETs.
+
+Entity ETags are built from the row's version counter and updated_at
+timestamp, so they can be checked against If-None-Match after loading a single
+row and before anything is serialized or rendered.
+"""
+from flask import make_response, request
+
+
+def entity_etag(representation, entity, parent=None):
+    """
+    Build the strong ETag for one representation of a project or sprint
+
+    Args:
+        representation: Name of the representation (e.g. 'project-json'), since
+            the JSON and HTML views of the same entity need different ETags
+        entity: Project or Sprint object with version and updated_at columns
+        parent: Optional Project whose fields the representation also shows
+            (e.g. the project name in a sprint's breadcrumb); changes to it
+            don't bump the entity's version, so its version is added
+
+    Returns:
+        str: The unquoted ETag value
+    """
+    updated_at = entity.updated_at.isoformat() if entity.updated_at else ''
+    etag = f'{representation}-{entity.id}-{entity.version}-{updated_at}'
+    if parent is not None:
+        etag += f'-{parent.version}'
+    return etag
+
+
+def conditional_response(etag, build):
+    """
+    Answer a GET with 304 Not Modified if the client already has the current version
+
+    Args:
+        etag: ETag of the current representation
+        build: Function returning the full response (anything make_response
+            accepts), only called when the client's copy is stale
+
+    Returns:
+        Response: 304 without a body, or the built response; both carry the ETag
+    """
+    if request.if_none_match.contains_weak(etag):
+        response = make_response('', 304)
+    else:
+        response = make_response(build())
+
+    response.set_etag(etag)
+    # Let browsers keep the response but revalidate it on every use
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
@@ -2,13 +2,21 @@
 Markdown parser utility for BTG app.
 Provides functions to convert markdown text to HTML for display in the UI.
 """
+import atexit
+import hashlib
+import multiprocessing
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
 import markdown
 import bleach
+import bleach.sanitizer
 from markupsafe import Markup
 
 # List of allowed HTML tags for security
 ALLOWED_TAGS = [
-    'a', 'abbr', 'acronym', 'b', 'blockquote', 'code', 'em', 'i', 'li', 'ol', 
+    'a', 'abbr', 'acronym', 'b', 'blockquote', 'code', 'em', 'i', 'li', 'ol',
     'pre', 'strong', 'ul', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'p', 'hr',
     'br', 'div', 'span', 'table', 'thead', 'tbody', 'tr', 'th', 'td'
 ]
@@ -24,37 +32,274 @@ ALLOWED_ATTRIBUTES = {
     'span': ['class', 'style'],
 }
 
+# Version of the rendering pipeline. Bump this whenever the extensions or the
+# sanitizer allowlist change so that stored HTML is re-rendered lazily.
+RENDERER_VERSION = 1
+
+# Default number of rendered fragments kept in memory
+DEFAULT_CACHE_SIZE = 1024
+
+# Default number of uncached texts in a batch before render_many uses the process pool
+DEFAULT_POOL_THRESHOLD = 64
+
+
+class RenderCache:
+    """
+    Bounded LRU cache of rendered markdown keyed by a hash of the source text
+
+    Entries are the sanitized Markup objects returned by convert_markdown_to_html,
+    so a hit skips both the markdown and the bleach passes. When the cache is full
+    the least recently used entry is evicted. A maxsize of 0 disables caching.
+    """
+
+    def __init__(self, maxsize=DEFAULT_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(text):
+        """Return the cache key for a markdown source string"""
+        return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+    def get(self, key):
+        """Return the cached Markup for key, or None on a miss"""
+        with self._lock:
+            html = self._entries.get(key)
+            if html is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return html
+
+    def set(self, key, html):
+        """Store rendered Markup under key, evicting the oldest entries if needed"""
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[key] = html
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def resize(self, maxsize):
+        """Change the maximum number of entries, evicting immediately if shrinking"""
+        with self._lock:
+            self.maxsize = maxsize
+            while len(self._entries) > max(maxsize, 0):
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """Drop all entries and reset the counters"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def info(self):
+        """Return a dictionary with the cache size and hit/miss counters"""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'size': len(self._entries),
+                'maxsize': self.maxsize
+            }
+
+
+# Shared cache used by the `markdown` Jinja filter
+render_cache = RenderCache()
+
+
+def configure_cache(maxsize):
+    """
+    Resize the shared render cache.
+
+    Args:
+        maxsize (int): Maximum number of cached fragments (0 disables caching)
+    """
+    render_cache.resize(maxsize)
+
+
+# Process pool settings for render_many (workers=0 keeps rendering in-process)
+_pool_settings = {'workers': 0, 'threshold': DEFAULT_POOL_THRESHOLD}
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def configure_pool(workers, threshold=DEFAULT_POOL_THRESHOLD):
+    """
+    Configure the process pool used by render_many for large batches.
+
+    Args:
+        workers (int): Number of worker processes (0 disables the pool)
+        threshold (int): Minimum number of uncached texts in a batch before
+            rendering is fanned out to the pool
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is not None and workers != _pool_settings['workers']:
+            _pool.shutdown(wait=False)
+            _pool = None
+        _pool_settings['workers'] = workers
+        _pool_settings['threshold'] = threshold
+
+
+def _get_pool():
+    """Return the shared process pool, starting it on first use"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # Spawn fresh interpreters instead of forking the web server process
+            _pool = ProcessPoolExecutor(
+                max_workers=_pool_settings['workers'],
+                mp_context=multiprocessing.get_context('spawn')
+            )
+        return _pool
+
+
+@atexit.register
+def _shutdown_pool():
+    """Stop the worker processes when the interpreter exits"""
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+
+
+def cache_info():
+    """Return hit, miss and size counters for the shared render cache"""
+    return render_cache.info()
+
+
+# Extensions loaded into every Markdown engine
+MARKDOWN_EXTENSIONS = [
+    'markdown.extensions.fenced_code',
+    'markdown.extensions.tables',
+    'markdown.extensions.nl2br',
+    'markdown.extensions.sane_lists'
+]
+
+# Markdown engines and bleach cleaners keep parser state between calls and are
+# not thread-safe, so each thread keeps its own instances
+_engines = threading.local()
+
+
+def get_markdown_engine():
+    """
+    Return this thread's Markdown engine, creating it on first use.
+
+    The engine keeps its loaded extensions between calls and must be reset
+    before each conversion.
+    """
+    engine = getattr(_engines, 'markdown', None)
+    if engine is None:
+        engine = markdown.Markdown(extensions=MARKDOWN_EXTENSIONS)
+        _engines.markdown = engine
+    return engine
+
+
+def get_cleaner():
+    """Return this thread's sanitizer built from the allowlists, creating it on first use"""
+    cleaner = getattr(_engines, 'cleaner', None)
+    if cleaner is None:
+        cleaner = bleach.sanitizer.Cleaner(
+            tags=ALLOWED_TAGS,
+            attributes=ALLOWED_ATTRIBUTES,
+            strip=True
+        )
+        _engines.cleaner = cleaner
+    return cleaner
+
+
+def _render(text):
+    """Run the markdown and bleach passes for a single text"""
+    # Convert markdown to HTML using this thread's engine
+    html = get_markdown_engine().reset().convert(text)
+
+    # Sanitize HTML to prevent XSS attacks
+    clean_html = get_cleaner().clean(html)
+
+    # Mark as safe for Jinja2 templates
+    return Markup(clean_html)
+
+
 def convert_markdown_to_html(text):
     """
     Convert markdown text to safe HTML.
-    
+
+    Results are cached by content hash, so rendering the same text again
+    returns the previously sanitized Markup without re-parsing it.
+
     Args:
         text (str): The markdown text to convert
-        
+
     Returns:
         Markup: MarkupSafe's Markup object containing safe HTML
     """
     if not text:
         return Markup("")
-    
-    # Convert markdown to HTML
-    html = markdown.markdown(
-        text,
-        extensions=[
-            'markdown.extensions.fenced_code',
-            'markdown.extensions.tables',
-            'markdown.extensions.nl2br',
-            'markdown.extensions.sane_lists'
-        ]
-    )
-    
-    # Sanitize HTML to prevent XSS attacks
-    clean_html = bleach.clean(
-        html,
-        tags=ALLOWED_TAGS,
-        attributes=ALLOWED_ATTRIBUTES,
-        strip=True
-    )
-    
-    # Mark as safe for Jinja2 templates
-    return Markup(clean_html)
+
+    key = render_cache.make_key(text)
+    html = render_cache.get(key)
+    if html is None:
+        html = _render(text)
+        render_cache.set(key, html)
+    return html
+
+
+def _render_plain(text):
+    """Render a single text in a pool worker and return it as a plain string"""
+    return str(_render(text))
+
+
+def render_many(texts):
+    """
+    Convert a batch of markdown texts to safe HTML.
+
+    Duplicate and already cached texts are rendered only once. When a process
+    pool is configured and the number of texts left to render reaches the pool
+    threshold, the work is fanned out to the worker processes.
+
+    Args:
+        texts (iterable): The markdown texts to convert
+
+    Returns:
+        list: Markup objects in the same order as the input texts
+    """
+    texts = list(texts)
+    results = {}
+    pending = []
+
+    # De-duplicate while keeping the first occurrence order
+    for text in dict.fromkeys(texts):
+        if not text:
+            results[text] = Markup("")
+            continue
+        key = render_cache.make_key(text)
+        html = render_cache.get(key)
+        if html is None:
+            pending.append((key, text))
+        else:
+            results[text] = html
+
+    if pending:
+        sources = [text for _, text in pending]
+        workers = _pool_settings['workers']
+        if workers > 0 and len(sources) >= _pool_settings['threshold']:
+            chunksize = max(1, len(sources) // (workers * 4))
+            rendered = [Markup(html) for html in _get_pool().map(_render_plain, sources, chunksize=chunksize)]
+        else:
+            rendered = [_render(text) for text in sources]
+
+        for (key, text), html in zip(pending, rendered):
+            render_cache.set(key, html)
+            results[text] = html
+
+    return [results[text] for text in texts]
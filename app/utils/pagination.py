@@ -0,0 +1,208 @@
+"""
+Keyset pagination helpers for the BTG API list endpoints.
+
+Pages are ordered by (created_at, id) and the position between pages is
+carried in an opaque cursor encoding the last row of the previous page, so
+fetching a page costs the same no matter how deep into the table it is.
+"""
+import base64
+import json
+from datetime import datetime
+
+from flask import current_app, jsonify, request, url_for
+from sqlalchemy import and_, or_
+
+# Page size used when the client does not send a limit
+DEFAULT_PAGE_SIZE = 100
+
+# Largest page size a client may request
+MAX_PAGE_SIZE = 1000
+
+
+class PaginationError(ValueError):
+    """Raised when the limit or cursor query parameters are invalid"""
+
+
+class Page:
+    """
+    One page of results
+
+    Attributes:
+        items: Model objects on this page
+        limit: Page size used for the query
+        next_cursor: Cursor for the following page, or None on the last page
+    """
+
+    def __init__(self, items, limit, next_cursor):
+        self.items = items
+        self.limit = limit
+        self.next_cursor = next_cursor
+
+
+def encode_cursor(created_at, item_id):
+    """
+    Encode a (created_at, id) position as an opaque URL-safe string
+
+    Args:
+        created_at: Creation timestamp of the last row on a page
+        item_id: Primary key of the last row on a page
+
+    Returns:
+        str: The cursor
+    """
+    payload = json.dumps([created_at.isoformat(), item_id], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor):
+    """
+    Decode a cursor produced by encode_cursor
+
+    Args:
+        cursor: The cursor string from the request
+
+    Returns:
+        tuple: (created_at, id)
+
+    Raises:
+        PaginationError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        created_at, item_id = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        if not isinstance(item_id, int):
+            raise ValueError(item_id)
+        return datetime.fromisoformat(created_at), item_id
+    except (ValueError, TypeError, UnicodeError):
+        raise PaginationError('Invalid cursor')
+
+
+def encode_offset_cursor(offset):
+    """
+    Encode an offset as an opaque cursor, for ranked results that have no stable keyset
+
+    Args:
+        offset: Number of results before the next page
+
+    Returns:
+        str: The cursor
+    """
+    payload = json.dumps({'offset': offset}, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_offset_cursor(cursor):
+    """
+    Decode a cursor produced by encode_offset_cursor
+
+    Args:
+        cursor: The cursor string from the request
+
+    Returns:
+        int: The offset
+
+    Raises:
+        PaginationError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        offset = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))['offset']
+        if not isinstance(offset, int) or isinstance(offset, bool) or offset < 0:
+            raise ValueError(offset)
+        return offset
+    except (ValueError, TypeError, KeyError, UnicodeError):
+        raise PaginationError('Invalid cursor')
+
+
+def get_limit():
+    """
+    Read the page size from the `limit` query parameter
+
+    Falls back to the API_PAGE_SIZE setting and caps the value at API_MAX_PAGE_SIZE.
+
+    Returns:
+        int: The page size
+
+    Raises:
+        PaginationError: If limit is not a positive integer
+    """
+    default = current_app.config.get('API_PAGE_SIZE', DEFAULT_PAGE_SIZE)
+    maximum = current_app.config.get('API_MAX_PAGE_SIZE', MAX_PAGE_SIZE)
+
+    limit = request.args.get('limit')
+    if limit is None:
+        return min(default, maximum)
+    try:
+        limit = int(limit)
+    except ValueError:
+        raise PaginationError('limit must be a positive integer')
+    if limit < 1:
+        raise PaginationError('limit must be a positive integer')
+    return min(limit, maximum)
+
+
+def paginate(query, model):
+    """
+    Fetch one page of a query using the `limit` and `cursor` query parameters
+
+    Args:
+        query: SQLAlchemy query over model, with any filters already applied
+        model: Model class with created_at and id columns
+
+    Returns:
+        Page: The rows of the requested page and the cursor for the next one
+
+    Raises:
+        PaginationError: If the limit or cursor parameters are invalid
+    """
+    limit = get_limit()
+
+    cursor = request.args.get('cursor')
+    if cursor:
+        created_at, item_id = decode_cursor(cursor)
+        query = query.filter(or_(
+            model.created_at > created_at,
+            and_(model.created_at == created_at, model.id > item_id)
+        ))
+
+    # Fetch one extra row to find out whether there is a next page
+    items = query.order_by(model.created_at.asc(), model.id.asc()).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(items) > limit:
+        items = items[:limit]
+        next_cursor = encode_cursor(items[-1].created_at, items[-1].id)
+    return Page(items, limit, next_cursor)
+
+
+def paginated_response(page, serialize):
+    """
+    Build the JSON response for a page
+
+    The body carries the serialized rows in `data` and the page size and next
+    cursor in `pagination`. When there is a next page its URL is also sent in
+    a `Link: <...>; rel="next"` header.
+
+    Args:
+        page: Page returned by paginate()
+        serialize: Function converting one model object to a dictionary
+
+    Returns:
+        tuple: (response, status code)
+    """
+    response = jsonify({
+        'status': 'success',
+        'data': [serialize(item) for item in page.items],
+        'pagination': {
+            'limit': page.limit,
+            'next_cursor': page.next_cursor
+        }
+    })
+
+    if page.next_cursor:
+        args = request.args.to_dict()
+        args['cursor'] = page.next_cursor
+        args['limit'] = page.limit
+        next_url = url_for(request.endpoint, _external=True, **request.view_args, **args)
+        response.headers['Link'] = f'<{next_url}>; rel="next"'
+    return response, 200
@@ -0,0 +1,261 @@
+"""
+Response and fragment cache for the most requested project and sprint views.
+
+Rendered pages and serialized JSON bodies are stored as strings under a key and
+a set of tags such as `project:1` and `sprint:4`. When a transaction that
+changed a project, sprint, task or issue commits, the entries tagged with the
+affected project and sprints are dropped.
+
+Two backends are available: an in-process LRU (the default) and a shared Redis
+backend for deployments running several worker processes. Keys also embed the
+project version, so a worker never serves a page older than the database even
+if it missed an invalidation from another process.
+"""
+import threading
+from collections import OrderedDict
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+try:
+    import redis
+except ImportError:  # pragma: no cover - redis is an optional dependency
+    redis = None
+
+# Default number of entries kept by the in-process backend
+DEFAULT_CACHE_SIZE = 512
+
+# Default lifetime of entries in the shared backend, in seconds
+DEFAULT_TTL = 3600
+
+
+def project_tag(project_id):
+    """Return the tag for entries that depend on a project"""
+    return f'project:{project_id}'
+
+
+def sprint_tag(sprint_id):
+    """Return the tag for entries that depend on a sprint"""
+    return f'sprint:{sprint_id}'
+
+
+class LRUBackend:
+    """
+    In-process LRU backend
+
+    Keeps at most maxsize entries and an index from each tag to the keys stored
+    under it. A maxsize of 0 disables caching.
+    """
+
+    def __init__(self, maxsize=DEFAULT_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._tags = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Return the value stored under key, or None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def set(self, key, value, tags):
+        """Store value under key and index it by tags, evicting the oldest entries if needed"""
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._discard(key)
+            self._entries[key] = (value, tuple(tags))
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.maxsize:
+                self._discard(next(iter(self._entries)))
+
+    def invalidate(self, tags):
+        """Drop every entry stored under any of the tags and return how many were dropped"""
+        with self._lock:
+            keys = set()
+            for tag in tags:
+                keys.update(self._tags.pop(tag, ()))
+            for key in keys:
+                self._discard(key)
+            return len(keys)
+
+    def clear(self):
+        """Drop every entry"""
+        with self._lock:
+            self._entries.clear()
+            self._tags.clear()
+
+    def size(self):
+        """Return the number of stored entries"""
+        return len(self._entries)
+
+    def _discard(self, key):
+        """Remove key and its tag index entries; the lock must be held"""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for tag in entry[1]:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+
+class RedisBackend:
+    """
+    Shared Redis backend
+
+    Values are stored with a TTL and every tag is a Redis set of the keys
+    stored under it, so any worker process can invalidate entries written by
+    the others.
+    """
+
+    def __init__(self, url, ttl=DEFAULT_TTL, prefix='btg:response:'):
+        if redis is None:
+            raise RuntimeError('RESPONSE_CACHE_URL is set but the redis package is not installed')
+        self.client = redis.Redis.from_url(url)
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def get(self, key):
+        """Return the value stored under key, or None"""
+        value = self.client.get(self.prefix + key)
+        return value.decode('utf-8') if value is not None else None
+
+    def set(self, key, value, tags):
+        """Store value under key with the TTL and add key to each tag set"""
+        pipeline = self.client.pipeline()
+        pipeline.set(self.prefix + key, value.encode('utf-8'), ex=self.ttl)
+        for tag in tags:
+            pipeline.sadd(self.prefix + 'tag:' + tag, key)
+            pipeline.expire(self.prefix + 'tag:' + tag, self.ttl)
+        pipeline.execute()
+
+    def invalidate(self, tags):
+        """Drop every entry stored under any of the tags and return how many were dropped"""
+        tag_keys = [self.prefix + 'tag:' + tag for tag in tags]
+        if not tag_keys:
+            return 0
+        keys = self.client.sunion(tag_keys)
+        pipeline = self.client.pipeline()
+        if keys:
+            pipeline.delete(*[self.prefix + key.decode('utf-8') for key in keys])
+        pipeline.delete(*tag_keys)
+        pipeline.execute()
+        return len(keys)
+
+    def clear(self):
+        """Drop every entry under the prefix"""
+        keys = list(self.client.scan_iter(match=self.prefix + '*'))
+        if keys:
+            self.client.delete(*keys)
+
+    def size(self):
+        """Return None since counting shared entries would need a full key scan"""
+        return None
+
+
+class ResponseCache:
+    """
+    Cache front end used by the views
+
+    Wraps a backend and counts hits, misses and invalidated entries.
+    """
+
+    def __init__(self, backend=None):
+        self._lock = threading.Lock()
+        self.reset(backend or LRUBackend())
+
+    def reset(self, backend):
+        """Switch to a new backend and reset the counters"""
+        with self._lock:
+            self.backend = backend
+            self.hits = 0
+            self.misses = 0
+            self.invalidations = 0
+
+    def get_or_set(self, key, tags, build):
+        """
+        Return the cached string for key, building and storing it on a miss
+
+        Args:
+            key: Cache key
+            tags: Tags the entry depends on (see project_tag and sprint_tag)
+            build: Function returning the string to cache
+
+        Returns:
+            str: The cached or freshly built value
+        """
+        value = self.backend.get(key)
+        if value is not None:
+            with self._lock:
+                self.hits += 1
+            return value
+
+        with self._lock:
+            self.misses += 1
+        value = build()
+        self.backend.set(key, value, tags)
+        return value
+
+    def invalidate(self, tags):
+        """Drop the entries stored under any of the tags"""
+        tags = list(tags)
+        if not tags:
+            return
+        dropped = self.backend.invalidate(tags)
+        with self._lock:
+            self.invalidations += dropped
+
+    def stats(self):
+        """Return the hit ratio, invalidation count and size of the cache"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'backend': type(self.backend).__name__,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': self.hits / lookups if lookups else 0.0,
+                'invalidations': self.invalidations,
+                'size': self.backend.size()
+            }
+
+
+# Shared cache used by the project and sprint views
+response_cache = ResponseCache()
+
+
+def configure_response_cache(config):
+    """
+    Replace the shared cache backend according to the app configuration
+
+    Uses the Redis backend when RESPONSE_CACHE_URL is set, otherwise an
+    in-process LRU with RESPONSE_CACHE_SIZE entries. Counters are reset.
+
+    Args:
+        config: The Flask app config
+    """
+    url = config.get('RESPONSE_CACHE_URL')
+    if url:
+        backend = RedisBackend(url, ttl=config.get('RESPONSE_CACHE_TTL', DEFAULT_TTL))
+    else:
+        backend = LRUBackend(config.get('RESPONSE_CACHE_SIZE', DEFAULT_CACHE_SIZE))
+    response_cache.reset(backend)
+
+
+@event.listens_for(Session, 'after_commit')
+def _invalidate_committed(session):
+    """Drop the entries of every project and sprint changed by the committed transaction"""
+    from app.models.versions import pop_changed
+
+    changed = pop_changed(session)
+    response_cache.invalidate(
+        [project_tag(project_id) for project_id in changed['projects']] +
+        [sprint_tag(sprint_id) for sprint_id in changed['sprints']]
+    )
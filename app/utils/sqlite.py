@@ -0,0 +1,177 @@
+"""
+Connection profile and background maintenance for SQLite databases.
+
+Every new connection of the writer and reader engines (see app.utils.engines)
+gets the pragmas configured by the SQLITE_* settings in config.Config. The defaults favour concurrent use by the
+web UI and MCP agents:
+
+- journal_mode=WAL lets readers keep reading while a write transaction is
+  open, instead of queueing behind it and failing with "database is locked"
+- synchronous=NORMAL only fsyncs at checkpoints, which is durable across
+  application crashes in WAL mode
+- busy_timeout makes writers wait for each other instead of failing at once
+- cache_size, mmap_size and temp_store=MEMORY keep hot pages and sorts in memory
+
+foreign_keys=ON is always applied: the projects -> sprints -> tasks/issues
+foreign keys are declared with ON DELETE CASCADE, and SQLite ignores them
+unless every connection turns enforcement on.
+
+PRAGMA optimize runs once at startup and, with a WAL checkpoint, periodically
+on a daemon thread so that query planner statistics stay current and the WAL
+file does not grow without bound under a steady read load.
+"""
+import re
+import threading
+
+from sqlalchemy import event
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.utils.engines import READER_BIND_KEY
+
+# Config keys and the pragmas they set, in the order they are applied. The busy
+# timeout comes first so switching the journal mode waits for other connections.
+PRAGMA_SETTINGS = (
+    ('SQLITE_BUSY_TIMEOUT', 'busy_timeout'),
+    ('SQLITE_JOURNAL_MODE', 'journal_mode'),
+    ('SQLITE_SYNCHRONOUS', 'synchronous'),
+    ('SQLITE_CACHE_SIZE', 'cache_size'),
+    ('SQLITE_MMAP_SIZE', 'mmap_size'),
+    ('SQLITE_TEMP_STORE', 'temp_store'),
+)
+
+# Pragma values are interpolated into SQL, so only plain words and integers are accepted
+PRAGMA_VALUE = re.compile(r'-?\w+')
+
+# Key of the maintenance thread in app.extensions
+EXTENSION_KEY = 'sqlite_maintenance'
+
+
+def build_pragmas(config, read_only=False):
+    """
+    Return the PRAGMA statements for the configured SQLite profile
+
+    Settings that are unset or empty are left at the SQLite default. The
+    journal mode is stored in the database file, so it is only set by the
+    writer; read-only connections cannot change it.
+
+    Args:
+        config: The Flask app config
+        read_only: Build the statements for a read-only connection
+
+    Returns:
+        list: PRAGMA statements to run on every new connection
+
+    Raises:
+        ValueError: If a setting is not a plain word or integer
+    """
+    pragmas = ['PRAGMA foreign_keys=ON']
+    for key, pragma in PRAGMA_SETTINGS:
+        value = config.get(key)
+        if value is None or value == '' or (read_only and pragma == 'journal_mode'):
+            continue
+        if not PRAGMA_VALUE.fullmatch(str(value)):
+            raise ValueError(f'Invalid value for {key}: {value!r}')
+        pragmas.append(f'PRAGMA {pragma}={value}')
+    return pragmas
+
+
+def _apply_pragmas(pragmas):
+    """Return a connect listener that runs the pragmas on a new DBAPI connection"""
+    def apply(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for pragma in pragmas:
+            cursor.execute(pragma)
+        cursor.close()
+    return apply
+
+
+def optimize(engine, checkpoint=False):
+    """
+    Run PRAGMA optimize, optionally after a passive WAL checkpoint
+
+    A passive checkpoint copies as much of the WAL into the database as it can
+    without waiting for readers or writers.
+
+    Args:
+        engine: SQLAlchemy engine of a SQLite database
+        checkpoint: Also checkpoint the write-ahead log
+    """
+    with engine.connect() as connection:
+        if checkpoint:
+            connection.exec_driver_sql('PRAGMA wal_checkpoint(PASSIVE)')
+        connection.exec_driver_sql('PRAGMA optimize')
+
+
+class SQLiteMaintenance(threading.Thread):
+    """
+    Daemon thread that checkpoints the WAL and runs PRAGMA optimize periodically
+
+    Attributes:
+        engine: SQLAlchemy engine of the database
+        interval: Seconds between runs
+        runs: Number of completed runs
+        last_error: Message of the last failed run, if any
+    """
+
+    def __init__(self, engine, interval, logger=None):
+        super().__init__(name='sqlite-maintenance', daemon=True)
+        self.engine = engine
+        self.interval = interval
+        self.logger = logger
+        self.runs = 0
+        self.last_error = None
+        self._stopped = threading.Event()
+
+    def run(self):
+        """Run the maintenance every interval seconds until stopped"""
+        while not self._stopped.wait(self.interval):
+            self.run_once()
+
+    def run_once(self):
+        """Checkpoint and optimize once, logging instead of raising on failure"""
+        try:
+            optimize(self.engine, checkpoint=True)
+            self.runs += 1
+            self.last_error = None
+        except SQLAlchemyError as e:
+            self.last_error = str(e)
+            if self.logger:
+                self.logger.warning('SQLite maintenance failed: %s', e)
+
+    def stop(self):
+        """Stop the thread after the current run"""
+        self._stopped.set()
+
+
+def configure_sqlite(app, db):
+    """
+    Apply the SQLite connection profile to the app's engine
+
+    Registers the connect listeners on the writer and reader engines, runs
+    PRAGMA optimize once and starts the maintenance thread on the writer
+    (except when testing, for in-memory databases or with
+    SQLITE_MAINTENANCE_INTERVAL set to 0). Does nothing when the app uses
+    another database.
+
+    Args:
+        app: The Flask application
+        db: The Flask-SQLAlchemy extension bound to the app
+    """
+    with app.app_context():
+        engine = db.engine
+        reader = db.engines.get(READER_BIND_KEY)
+    if engine.dialect.name != 'sqlite':
+        return
+
+    event.listen(engine, 'connect', _apply_pragmas(build_pragmas(app.config)))
+    # Creates the database file and switches it to WAL before any reader connects
+    optimize(engine)
+    if reader is not None and reader is not engine and reader.dialect.name == 'sqlite':
+        event.listen(reader, 'connect', _apply_pragmas(build_pragmas(app.config, read_only=True)))
+
+    interval = app.config.get('SQLITE_MAINTENANCE_INTERVAL', 0)
+    in_memory = engine.url.database in (None, '', ':memory:')
+    if interval > 0 and not app.testing and not in_memory:
+        maintenance = SQLiteMaintenance(engine, interval, app.logger)
+        maintenance.start()
+        app.extensions[EXTENSION_KEY] = maintenance
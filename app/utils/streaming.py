@@ -0,0 +1,58 @@
+"""
+NDJSON streaming helpers for the BTG API list endpoints.
+
+Bulk consumers can ask for a whole collection as newline-delimited JSON by
+sending `Accept: application/x-ndjson`. Rows are fetched from the database in
+batches and written out as they arrive, so memory use stays flat no matter how
+many rows are exported and the first rows are sent right away.
+"""
+import json
+
+from flask import Response, current_app, request, stream_with_context
+from sqlalchemy.exc import SQLAlchemyError
+
+# MIME type for newline-delimited JSON
+NDJSON_MIMETYPE = 'application/x-ndjson'
+
+# Number of rows fetched from the database per batch when streaming
+DEFAULT_STREAM_BATCH_SIZE = 1000
+
+
+def wants_ndjson():
+    """Return True if the client prefers NDJSON over a JSON page"""
+    return request.accept_mimetypes.best_match(['application/json', NDJSON_MIMETYPE]) == NDJSON_MIMETYPE
+
+
+def stream_ndjson(query, model, serialize):
+    """
+    Stream every row of a query as newline-delimited JSON
+
+    Rows are loaded with yield_per in batches of API_STREAM_BATCH_SIZE and each
+    batch is written as one chunk of lines. Since the status code is sent
+    before the rows, a database error part way through is reported as a final
+    `{"status": "error", ...}` line.
+
+    Args:
+        query: SQLAlchemy query over model, with any filters already applied
+        model: Model class being exported
+        serialize: Function converting one model object to a dictionary
+
+    Returns:
+        Response: Streaming response with one JSON object per line
+    """
+    batch_size = current_app.config.get('API_STREAM_BATCH_SIZE', DEFAULT_STREAM_BATCH_SIZE)
+
+    def generate():
+        lines = []
+        try:
+            for item in query.order_by(model.id.asc()).yield_per(batch_size):
+                lines.append(json.dumps(serialize(item)))
+                if len(lines) >= batch_size:
+                    yield '\n'.join(lines) + '\n'
+                    lines = []
+        except SQLAlchemyError as e:
+            lines.append(json.dumps({'status': 'error', 'message': 'Database error', 'error': str(e)}))
+        if lines:
+            yield '\n'.join(lines) + '\n'
+
+    return Response(stream_with_context(generate()), mimetype=NDJSON_MIMETYPE)
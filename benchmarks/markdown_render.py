@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for markdown rendering.
+
+Compares the per-call latency of the original rendering path (a new
+markdown.Markdown object and a bleach.clean call per text) with the pooled
+engine and shared Cleaner used by app.utils.markdown_parser. The render cache
+is bypassed so both sides do the full markdown and bleach passes.
+
+Usage:
+    python benchmarks/markdown_render.py [--iterations N]
+"""
+import argparse
+import os
+import sys
+import time
+import warnings
+
+# Add the parent directory to the path so we can import the app
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import bleach
+import markdown
+from markupsafe import Markup
+
+from app.utils.markdown_parser import (
+    ALLOWED_ATTRIBUTES, ALLOWED_TAGS, MARKDOWN_EXTENSIONS, _render
+)
+
+# Realistic task and issue details as written by people and AI assistants
+CORPUS = [
+    'Set up development environment',
+    'Implement **login** endpoint with `flask-login`\n\n- hash passwords\n- add rate limiting\n- return 401 on failure',
+    '## Acceptance criteria\n1. User can reset password\n2. Email is sent within 1 minute\n3. Token expires after 24h',
+    'Fix crash when sprint has no tasks:\n\n```python\nif not sprint.tasks:\n    return []\n```\n\nSee `app/routes/htmx_routes.py`.',
+    '| Endpoint | Method | Status |\n|---|---|---|\n| /api/tasks | GET | done |\n| /api/tasks | POST | open |',
+    'Investigate slow page load on project detail.\nSuspect N+1 queries in the sidebar.\nProfile with `EXPLAIN QUERY PLAN`.',
+    '> Users report the star icon does not toggle\n\nRepro: click star twice quickly. <script>alert(1)</script>',
+    '- [ ] write migration\n- [ ] backfill data\n- [ ] update API docs\n\nLinks: [docs](https://example.com/docs "Docs")',
+]
+
+
+def legacy_render(text):
+    """Original implementation: fresh Markdown object and allowlist per call"""
+    html = markdown.markdown(text, extensions=MARKDOWN_EXTENSIONS)
+    return Markup(bleach.clean(html, tags=ALLOWED_TAGS, attributes=ALLOWED_ATTRIBUTES, strip=True))
+
+
+def measure(render, iterations):
+    """Return the mean per-call latency in microseconds"""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        for text in CORPUS:
+            render(text)
+    elapsed = time.perf_counter() - start
+    return elapsed / (iterations * len(CORPUS)) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--iterations', type=int, default=200, help='Passes over the corpus (default: 200)')
+    args = parser.parse_args()
+
+    warnings.simplefilter('ignore')
+
+    # Both paths must produce identical HTML
+    for text in CORPUS:
+        assert legacy_render(text) == _render(text), text
+
+    # Warm up both paths so one-time imports are not measured
+    measure(legacy_render, 5)
+    measure(_render, 5)
+
+    before = measure(legacy_render, args.iterations)
+    after = measure(_render, args.iterations)
+
+    print(f'corpus: {len(CORPUS)} texts x {args.iterations} iterations')
+    print(f'before (markdown.markdown + bleach.clean): {before:8.1f} us/call')
+    print(f'after  (pooled engine + shared Cleaner):   {after:8.1f} us/call')
+    print(f'speedup: {before / after:.2f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the get_project_overview MCP tool.
+
+Seeds a temporary SQLite database with one project of 20 sprints, starts the
+app on it with `flask run` and compares fetching the project and the tasks and
+issues of every sprint one request at a time (as the synchronous tools had to)
+with the concurrent fan-out of get_project_overview.
+
+Usage:
+    python benchmarks/mcp_overview.py [--sprints N] [--items N] [--iterations N] [--port PORT]
+"""
+import argparse
+import asyncio
+import os
+import runpy
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+import warnings
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# Add the parent directory to the path so we can import the app
+sys.path.insert(0, ROOT)
+
+
+def seed(database_url, sprint_count, item_count):
+    """Create the schema and one project with sprint_count sprints of item_count tasks and issues"""
+    os.environ['DATABASE_URL'] = database_url
+    from app import create_app, db
+    from app.models import Issue, Project, Sprint, Task
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        project = Project(name='Benchmark Project')
+        db.session.add(project)
+        db.session.flush()
+        for number in range(sprint_count):
+            sprint = Sprint(name=f'Sprint {number + 1}', project_id=project.id)
+            db.session.add(sprint)
+            db.session.flush()
+            db.session.add_all([Task(details=f'Task {i}', sprint_id=sprint.id) for i in range(item_count)])
+            db.session.add_all([Issue(details=f'Issue {i}', sprint_id=sprint.id) for i in range(item_count)])
+        db.session.commit()
+        return project.id
+
+
+def wait_for_server(port):
+    """Poll the API until the server answers"""
+    for _ in range(100):
+        try:
+            urllib.request.urlopen(f'http://localhost:{port}/api/projects')
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError('The app did not start')
+
+
+async def run(tools, project_id, iterations):
+    """Return the mean latency in milliseconds of the serial and concurrent overviews"""
+    client = tools['client']
+
+    async def serial():
+        project = await client.get('projects', project_id)
+        for sprint in project['sprints']:
+            sprint['tasks'] = await client.list('tasks', sprint_id=sprint['id'])
+            sprint['issues'] = await client.list('issues', sprint_id=sprint['id'])
+        return {'project': project}
+
+    async def measure(overview):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            result = await overview()
+        return (time.perf_counter() - start) / iterations * 1000, result
+
+    # Warm up the connection pool and the app
+    await serial()
+    before, expected = await measure(serial)
+    after, result = await measure(lambda: tools['get_project_overview'](project_id))
+    # Both paths must return the same data
+    assert result == expected
+    return before, after
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sprints', type=int, default=20, help='Sprints in the project (default: 20)')
+    parser.add_argument('--items', type=int, default=10, help='Tasks and issues per sprint (default: 10)')
+    parser.add_argument('--iterations', type=int, default=20, help='Overviews fetched per variant (default: 20)')
+    parser.add_argument('--port', type=int, default=3959, help='Port for the benchmark app (default: 3959)')
+    args = parser.parse_args()
+
+    warnings.simplefilter('ignore')
+
+    with tempfile.TemporaryDirectory() as directory:
+        database_url = 'sqlite:///' + os.path.join(directory, 'benchmark.db')
+        project_id = seed(database_url, args.sprints, args.items)
+
+        server = subprocess.Popen(
+            [sys.executable, '-m', 'flask', 'run', '--port', str(args.port)],
+            cwd=ROOT, env=dict(os.environ, DATABASE_URL=database_url),
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+        try:
+            wait_for_server(args.port)
+            sys.argv = ['build_together_mcp.py', '--port', str(args.port), '--latency-log-every', '0', '--cache-ttl', '0']
+            tools = runpy.run_path(os.path.join(ROOT, 'mcp', 'build_together_mcp.py'))
+            # Keep the MCP server's request logging out of the results
+            tools['logger'].setLevel('WARNING')
+            before, after = asyncio.run(run(tools, project_id, args.iterations))
+        finally:
+            server.terminate()
+            server.wait()
+
+    print(f'project: {args.sprints} sprints x {args.items} tasks and {args.items} issues, {args.iterations} iterations')
+    print(f'before (one request at a time): {before:8.1f} ms/overview')
+    print(f'after  (concurrent fan-out):    {after:8.1f} ms/overview')
+    print(f'speedup: {before / after:.2f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Benchmark for concurrent reads and writes on the SQLite database.
+
+Runs a writer process that keeps running large write transactions, the way a
+bulk import or a long MCP batch does: rows are inserted in chunks with a pause
+for application work between them. Meanwhile reader threads list the tasks of a
+sprint. The same workload runs against three database files:
+
+- default: SQLite's defaults (rollback journal, synchronous=FULL) on one engine
+- tuned: the profile from config.Config (WAL, synchronous=NORMAL, larger
+  caches), still with reads and writes on one engine
+- split: the same profile with the engine split from app.utils.engines:
+  readers use the read-only engine (the file opened with mode=ro) and writes
+  go through the writer pool of one connection
+
+With the rollback journal a writer whose changes outgrow the page cache takes
+an exclusive lock until it commits, and readers stall behind it. In WAL mode
+readers keep reading the last committed state.
+
+Reported per profile: reads and write transactions completed, read latency
+percentiles and the number of "database is locked" errors.
+
+Usage:
+    python benchmarks/sqlite_concurrency.py [--seconds N] [--readers N] [--chunks N] [--chunk-size N] [--work-ms N]
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import threading
+import time
+import warnings
+
+# Add the parent directory to the path so we can import the app
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import insert, select
+from sqlalchemy.exc import OperationalError
+
+from app import create_app, db
+from app.models import Project, Sprint, Task
+from app.utils.engines import READER_BIND_KEY
+from config import Config
+
+
+class BenchmarkConfig(Config):
+    """Base configuration: no background maintenance, reads and writes on one engine with SQLAlchemy's pool"""
+    SQLITE_MAINTENANCE_INTERVAL = 0
+    SQLALCHEMY_ENGINE_OPTIONS = {'pool_size': 5, 'max_overflow': 10}
+    # Whether the readers use the read-only engine
+    READ_FROM_READER = False
+
+
+class DefaultProfile(BenchmarkConfig):
+    """SQLite's own defaults, as before the connection profile"""
+    SQLITE_JOURNAL_MODE = 'DELETE'
+    SQLITE_SYNCHRONOUS = 'FULL'
+    SQLITE_CACHE_SIZE = None
+    SQLITE_MMAP_SIZE = None
+    SQLITE_TEMP_STORE = None
+
+
+class SplitProfile(BenchmarkConfig):
+    """The connection profile with the writer pool of one and the read-only engine"""
+    SQLALCHEMY_ENGINE_OPTIONS = {}
+    READ_FROM_READER = True
+
+
+PROFILES = {'default': DefaultProfile, 'tuned': BenchmarkConfig, 'split': SplitProfile}
+
+
+def seed(engine, sprint_count, task_count):
+    """Create one project with sprint_count sprints of task_count tasks and return the sprint IDs"""
+    with engine.begin() as connection:
+        project_id = connection.execute(insert(Project.__table__).values(name='Benchmark')).inserted_primary_key[0]
+        sprint_ids = [
+            connection.execute(insert(Sprint.__table__).values(name=f'Sprint {i}', project_id=project_id)).inserted_primary_key[0]
+            for i in range(sprint_count)
+        ]
+        connection.execute(insert(Task.__table__), [
+            {'details': f'Task {i}', 'completed': i % 3 == 0, 'sprint_id': sprint_id}
+            for sprint_id in sprint_ids for i in range(task_count)
+        ])
+    return sprint_ids
+
+
+def create_engines_for(config_class, path):
+    """Create the app for a profile and database file and return its engines for writes and for reads"""
+    config_class = type(config_class.__name__, (config_class,), {'SQLALCHEMY_DATABASE_URI': 'sqlite:///' + path})
+    app = create_app(config_class)
+    with app.app_context():
+        db.create_all()
+        read_engine = db.engines[READER_BIND_KEY] if config_class.READ_FROM_READER else db.engine
+        return db.engine, read_engine
+
+
+def writer(profile, path, sprint_ids, shape, stop, writes, locked):
+    """Run large write transactions until stopped (runs in its own process)"""
+    warnings.simplefilter('ignore')
+    engine, _ = create_engines_for(PROFILES[profile], path)
+    tasks = Task.__table__
+    number = 0
+    while not stop.is_set():
+        chunks, chunk_size, work = shape
+        try:
+            with engine.begin() as connection:
+                for chunk in range(chunks):
+                    connection.execute(insert(tasks), [
+                        {'details': f'Written {number}-{chunk}-{i}', 'sprint_id': sprint_ids[number % len(sprint_ids)]}
+                        for i in range(chunk_size)
+                    ])
+                    # Application work between flushes (rendering, validation, ...)
+                    time.sleep(work)
+            writes.value += 1
+        except OperationalError as e:
+            if 'locked' not in str(e):
+                raise
+            locked.value += 1
+        number += 1
+    engine.dispose()
+
+
+def run_profile(profile, path, seconds, readers, shape):
+    """Run the mixed workload against a fresh database file and return its statistics"""
+    engine, read_engine = create_engines_for(PROFILES[profile], path)
+    sprint_ids = seed(engine, 10, 200)
+
+    # The writer runs in a separate process, like a second worker or an MCP
+    # client, so it competes with the readers for database locks and not the GIL
+    stop = multiprocessing.Event()
+    writes = multiprocessing.Value('i', 0)
+    write_locked = multiprocessing.Value('i', 0)
+    process = multiprocessing.Process(
+        target=writer, args=(profile, path, sprint_ids, shape, stop, writes, write_locked)
+    )
+    process.start()
+    # Let the writer connect before measuring
+    time.sleep(1)
+
+    tasks = Task.__table__
+    reading = threading.Event()
+    lock = threading.Lock()
+    stats = {'locked': 0, 'latencies': []}
+
+    def reader(offset):
+        query = select(tasks.c.id, tasks.c.details, tasks.c.completed).order_by(
+            tasks.c.completed, tasks.c.created_at).limit(100)
+        number = offset
+        latencies = []
+        locked = 0
+        while not reading.is_set():
+            sprint_id = sprint_ids[number % len(sprint_ids)]
+            start = time.perf_counter()
+            try:
+                with read_engine.connect() as connection:
+                    connection.execute(query.where(tasks.c.sprint_id == sprint_id)).all()
+                latencies.append(time.perf_counter() - start)
+            except OperationalError as e:
+                if 'locked' not in str(e):
+                    raise
+                locked += 1
+            number += 1
+        with lock:
+            stats['latencies'].extend(latencies)
+            stats['locked'] += locked
+
+    threads = [threading.Thread(target=reader, args=(i,)) for i in range(readers)]
+    writes_before = writes.value
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    reading.set()
+    for thread in threads:
+        thread.join()
+    writes_done = writes.value - writes_before
+    stop.set()
+    process.join()
+    read_engine.dispose()
+    engine.dispose()
+
+    latencies = sorted(stats['latencies'])
+    percentile = lambda p: latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000 if latencies else 0
+    return {
+        'reads': len(latencies), 'writes': writes_done, 'locked': stats['locked'] + write_locked.value,
+        'p50': percentile(0.5), 'p99': percentile(0.99), 'max': latencies[-1] * 1000 if latencies else 0
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--seconds', type=float, default=5, help='Duration of each run (default: 5)')
+    parser.add_argument('--readers', type=int, default=4, help='Reader threads (default: 4)')
+    parser.add_argument('--chunks', type=int, default=40, help='Inserts per write transaction (default: 40)')
+    parser.add_argument('--chunk-size', type=int, default=500, help='Tasks per insert (default: 500)')
+    parser.add_argument('--work-ms', type=float, default=5, help='Pause between inserts in milliseconds (default: 5)')
+    args = parser.parse_args()
+    shape = (args.chunks, args.chunk_size, args.work_ms / 1000)
+
+    warnings.simplefilter('ignore')
+
+    print(f'{args.readers} readers, 1 writer inserting {args.chunks} x {args.chunk_size} tasks per transaction '
+          f'with {args.work_ms:g} ms pauses, {args.seconds:g}s per profile')
+    print(f'{"profile":8} {"reads":>8} {"writes":>7} {"locked":>7} {"p50 ms":>8} {"p99 ms":>8} {"max ms":>8}')
+    with tempfile.TemporaryDirectory() as directory:
+        for name in PROFILES:
+            result = run_profile(name, os.path.join(directory, f'{name}.db'), args.seconds, args.readers, shape)
+            print(f'{name:8} {result["reads"]:8d} {result["writes"]:7d} {result["locked"]:7d} '
+                  f'{result["p50"]:8.2f} {result["p99"]:8.2f} {result["max"]:8.2f}')
+
+
+if __name__ == '__main__':
+    main()
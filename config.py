@@ -5,6 +5,24 @@ from dotenv import load_dotenv
 basedir = os.path.abspath(os.path.dirname(__file__))
 load_dotenv(os.path.join(basedir, '.env'))
 
+def optional_int(name, default):
+    """
+    Read an integer setting that may be set to an empty value to turn it off
+
+    Args:
+        name: Environment variable name
+        default: Value used when the variable is not set
+
+    Returns:
+        int or None: The integer value, or None if the variable is set but empty
+    """
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    if value.strip() == '':
+        return None
+    return int(value)
+
 class Config:
     """Configuration settings for the Flask application
     
@@ -25,3 +43,70 @@ class Config:
         'sqlite:///' + os.path.join(basedir, 'app.db')
     # Disable tracking modifications to reduce overhead
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+
+    # Engine split (see app.utils.engines); in-memory SQLite keeps a single engine
+    # Database for GET requests and read-only MCP tools, e.g. a replica (SQLite default: the main file opened read-only)
+    DATABASE_READ_URL = os.environ.get('DATABASE_READ_URL')
+    # Writer connections per process; 1 queues writes in the pool instead of on SQLite's write lock
+    DATABASE_WRITER_POOL_SIZE = int(os.environ.get('DATABASE_WRITER_POOL_SIZE') or 1)
+    # Read-only connections per process
+    DATABASE_READER_POOL_SIZE = int(os.environ.get('DATABASE_READER_POOL_SIZE') or 8)
+    
+    # PostgreSQL connection pool (see app.utils.postgres; ignored for other databases)
+    # Connections kept open per process; DATABASE_WRITER_POOL_SIZE only applies to SQLite
+    POSTGRES_POOL_SIZE = int(os.environ.get('POSTGRES_POOL_SIZE') or 10)
+    # Extra connections opened under load and closed when returned
+    POSTGRES_MAX_OVERFLOW = int(os.environ.get('POSTGRES_MAX_OVERFLOW') or 10)
+    # Seconds a request waits for a free connection before failing
+    POSTGRES_POOL_TIMEOUT = int(os.environ.get('POSTGRES_POOL_TIMEOUT') or 30)
+    # Seconds after which a connection is replaced, before proxies or the server drop it
+    POSTGRES_POOL_RECYCLE = int(os.environ.get('POSTGRES_POOL_RECYCLE') or 1800)
+    # Check each connection before use so server restarts and failovers do not fail requests
+    POSTGRES_POOL_PRE_PING = os.environ.get('POSTGRES_POOL_PRE_PING', 'true').lower() not in ('0', 'false', 'no')
+    # Milliseconds after which the server cancels a statement (0 disables it)
+    POSTGRES_STATEMENT_TIMEOUT = int(os.environ.get('POSTGRES_STATEMENT_TIMEOUT') or 30000)
+    
+    # SQLite connection profile, applied to every new connection (ignored for other databases)
+    # An empty value leaves that pragma at the SQLite default (text values are checked by app.utils.sqlite)
+    # Journal mode; WAL lets readers run while a write transaction is open
+    SQLITE_JOURNAL_MODE = os.environ.get('SQLITE_JOURNAL_MODE', 'WAL')
+    # Sync level; NORMAL is safe with WAL and only fsyncs at checkpoints
+    SQLITE_SYNCHRONOUS = os.environ.get('SQLITE_SYNCHRONOUS', 'NORMAL')
+    # Milliseconds a connection waits for a lock before failing with "database is locked"
+    SQLITE_BUSY_TIMEOUT = optional_int('SQLITE_BUSY_TIMEOUT', 5000)
+    # Page cache per connection; negative values are KiB (default: 64 MiB)
+    SQLITE_CACHE_SIZE = optional_int('SQLITE_CACHE_SIZE', -65536)
+    # Bytes of the database file read through memory mapping (0 disables it)
+    SQLITE_MMAP_SIZE = optional_int('SQLITE_MMAP_SIZE', 268435456)
+    # Where temporary tables and indexes for sorting are kept
+    SQLITE_TEMP_STORE = os.environ.get('SQLITE_TEMP_STORE', 'MEMORY')
+    # Seconds between background WAL checkpoints and PRAGMA optimize runs (0 disables them)
+    SQLITE_MAINTENANCE_INTERVAL = int(os.environ.get('SQLITE_MAINTENANCE_INTERVAL') or 300)
+    
+    # Markdown rendering settings
+    # Number of rendered markdown fragments kept in the in-memory LRU cache (0 disables it)
+    MARKDOWN_CACHE_SIZE = int(os.environ.get('MARKDOWN_CACHE_SIZE') or 1024)
+    # Worker processes used to render large markdown batches (0 renders in-process)
+    MARKDOWN_POOL_WORKERS = int(os.environ.get('MARKDOWN_POOL_WORKERS') or 0)
+    # Minimum number of uncached texts in a batch before the process pool is used
+    MARKDOWN_POOL_THRESHOLD = int(os.environ.get('MARKDOWN_POOL_THRESHOLD') or 64)
+    
+    # API settings
+    # Page size for /api list endpoints when the client sends no limit
+    API_PAGE_SIZE = int(os.environ.get('API_PAGE_SIZE') or 100)
+    # Largest page size a client may request with ?limit=
+    API_MAX_PAGE_SIZE = int(os.environ.get('API_MAX_PAGE_SIZE') or 1000)
+    # Rows fetched per batch when a list endpoint streams NDJSON
+    API_STREAM_BATCH_SIZE = int(os.environ.get('API_STREAM_BATCH_SIZE') or 1000)
+    # Largest number of items accepted by the /api/tasks/bulk and /api/issues/bulk endpoints
+    API_BULK_MAX_ITEMS = int(os.environ.get('API_BULK_MAX_ITEMS') or 1000)
+    # Largest number of tool calls accepted by /mcp/execute_batch
+    MCP_BATCH_MAX_CALLS = int(os.environ.get('MCP_BATCH_MAX_CALLS') or 100)
+    
+    # Response cache settings
+    # Number of rendered pages and JSON bodies kept in the in-process LRU cache (0 disables it)
+    RESPONSE_CACHE_SIZE = int(os.environ.get('RESPONSE_CACHE_SIZE') or 512)
+    # Redis URL for a cache shared between worker processes (requires the redis package)
+    RESPONSE_CACHE_URL = os.environ.get('RESPONSE_CACHE_URL')
+    # Lifetime of entries in the shared cache, in seconds
+    RESPONSE_CACHE_TTL = int(os.environ.get('RESPONSE_CACHE_TTL') or 3600)
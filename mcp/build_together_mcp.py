@@ -4,11 +4,20 @@ Build Together MCP Server
 Provides tools for retrieving project information and managing the Build Together app
 """
 
+import asyncio
+import atexit
+import bisect
+import copy
+import functools
 import logging
+import os
 import sys
-import requests
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import httpx
 from typing import List, Dict, Any
-import json
 import argparse
 from mcp.server.fastmcp import FastMCP
 
@@ -21,15 +30,116 @@ logging.basicConfig(
     ]
 )
 logger = logging.getLogger("build-together-mcp")
+# Keep the HTTP client's per-request logging out of the debug output
+logging.getLogger("httpx").setLevel(logging.WARNING)
+logging.getLogger("httpcore").setLevel(logging.WARNING)
 
 # Parse command line arguments
 parser = argparse.ArgumentParser(description="Build Together MCP Server")
+parser.add_argument("--transport", choices=["http", "direct"], default="http",
+                    help="Call the Build Together REST API over HTTP (default), or run the tools in-process against its database")
 parser.add_argument("--port", type=int, default=3149, help="Port where the Build Together app is running (default: 3149)")
+parser.add_argument("--connect-timeout", type=float, default=3.05, help="Seconds to wait for a connection to the API (default: 3.05)")
+parser.add_argument("--read-timeout", type=float, default=30.0, help="Seconds to wait for an API response (default: 30)")
+parser.add_argument("--retries", type=int, default=3, help="Retries for failed GET requests (default: 3)")
+parser.add_argument("--pool-size", type=int, default=10, help="Keep-alive connections kept open to the API (default: 10)")
+parser.add_argument("--cache-ttl", type=float, default=30.0, help="Seconds a read result is served from the cache, 0 disables the cache (default: 30)")
+parser.add_argument("--cache-size", type=int, default=256, help="Read results kept in the cache (default: 256)")
+parser.add_argument("--cache-revalidate", action="store_true",
+                    help="Send If-None-Match with GETs and reuse the last response on 304 Not Modified (HTTP transport)")
+parser.add_argument("--latency-log-every", type=int, default=50, help="Log the latency histograms after this many tool calls (default: 50)")
 args = parser.parse_args()
 
 # API configuration
 API_BASE_URL = f"http://localhost:{args.port}/api"
-logger.info(f"Using API base URL: {API_BASE_URL}")
+
+# Largest page the API serves; list tools follow the cursors until the last page
+API_PAGE_LIMIT = 1000
+
+# ==================== HTTP CLIENT ====================
+
+# Responses after which a GET is retried
+RETRY_STATUS_CODES = (502, 503, 504)
+
+# Base delay between GET retries, doubled after every attempt
+RETRY_BACKOFF = 0.2
+
+def create_http_client() -> httpx.AsyncClient:
+    """Create the shared keep-alive client used by all tools
+
+    The transport retries requests that could not connect, which is safe for
+    every method since the request never reached the API. GETs are
+    additionally retried after read errors and 502/503/504 by HTTPClient.
+
+    Returns:
+        An async client with a bounded connection pool
+    """
+    return httpx.AsyncClient(
+        base_url=API_BASE_URL,
+        timeout=httpx.Timeout(args.read_timeout, connect=args.connect_timeout),
+        limits=httpx.Limits(max_connections=args.pool_size, max_keepalive_connections=args.pool_size),
+        transport=httpx.AsyncHTTPTransport(retries=args.retries)
+    )
+
+# ==================== LATENCY HISTOGRAMS ====================
+
+# Upper bounds of the latency buckets, in milliseconds
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+class LatencyHistogram:
+    """Bucketed latencies of one tool"""
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def record(self, elapsed_ms: float):
+        self.counts[bisect.bisect_left(LATENCY_BUCKETS_MS, elapsed_ms)] += 1
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+
+    def format(self) -> str:
+        calls = sum(self.counts)
+        labels = [f"<={bound}ms" for bound in LATENCY_BUCKETS_MS] + [f">{LATENCY_BUCKETS_MS[-1]}ms"]
+        buckets = " ".join(f"{label}:{count}" for label, count in zip(labels, self.counts) if count)
+        return f"calls={calls} avg={self.total_ms / calls:.1f}ms max={self.max_ms:.1f}ms {buckets}"
+
+latency_histograms: Dict[str, LatencyHistogram] = {}
+latency_lock = threading.Lock()
+latency_calls = 0
+
+def log_latency_histograms():
+    """Write the latency histogram of every tool called so far to the log"""
+    with latency_lock:
+        lines = [f"{name}: {histogram.format()}" for name, histogram in sorted(latency_histograms.items())]
+    if isinstance(globals().get("client"), CachedClient):
+        lines.append(f"cache: {client.format_stats()}")
+    if lines:
+        logger.info("Tool latency histograms:\n  " + "\n  ".join(lines))
+
+atexit.register(log_latency_histograms)
+
+def tool():
+    """Register a function as an MCP tool and record the latency of its calls"""
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*func_args, **func_kwargs):
+            global latency_calls
+            start = time.perf_counter()
+            try:
+                return await func(*func_args, **func_kwargs)
+            finally:
+                elapsed_ms = (time.perf_counter() - start) * 1000
+                logger.debug(f"{func.__name__} took {elapsed_ms:.1f}ms")
+                with latency_lock:
+                    latency_histograms.setdefault(func.__name__, LatencyHistogram()).record(elapsed_ms)
+                    latency_calls += 1
+                    log_now = args.latency_log_every > 0 and latency_calls % args.latency_log_every == 0
+                if log_now:
+                    log_latency_histograms()
+        return mcp.tool()(wrapper)
+    return decorator
 
 # Create an MCP server
 logger.info("Creating MCP server")
@@ -49,10 +159,372 @@ def build_request_data(**kwargs):
         # Add other specific default checks if needed
     return data
 
+# ==================== TRANSPORTS ====================
+
+class APIError(Exception):
+    """Raised by a client when the app rejects a call or cannot be reached"""
+
+class HTTPClient:
+    """Calls the Build Together REST API over the shared keep-alive client"""
+
+    def __init__(self):
+        self.client = create_http_client()
+        # Last ETag and body per GET URL, used with --cache-revalidate
+        self.validators = OrderedDict()
+
+    async def _send(self, method: str, path: str, **kwargs) -> httpx.Response:
+        attempts = args.retries + 1 if method == "GET" else 1
+        for attempt in range(attempts):
+            if attempt:
+                await asyncio.sleep(RETRY_BACKOFF * 2 ** (attempt - 1))
+            try:
+                response = await self.client.request(method, path, **kwargs)
+            except httpx.TransportError as e:
+                # Connection failures were already retried by the transport
+                if attempt == attempts - 1 or isinstance(e, (httpx.ConnectError, httpx.ConnectTimeout)):
+                    raise APIError(str(e))
+                continue
+            if response.status_code not in RETRY_STATUS_CODES or attempt == attempts - 1:
+                return response
+
+    async def _call(self, method: str, path: str, **kwargs) -> Dict[str, Any]:
+        key = stored = None
+        if method == "GET" and args.cache_revalidate:
+            key = (path, tuple(sorted((kwargs.get("params") or {}).items())))
+            stored = self.validators.get(key)
+            if stored is not None:
+                kwargs["headers"] = {"If-None-Match": stored[0]}
+
+        response = await self._send(method, path, **kwargs)
+        if response.status_code == 304 and stored is not None:
+            self.validators.move_to_end(key)
+            return copy.deepcopy(stored[1])
+        try:
+            api_response = response.json()
+        except ValueError:
+            api_response = {}
+        if response.is_error:
+            message = api_response.get("message") or f"{response.status_code} {response.reason_phrase}"
+            if api_response.get("errors"):
+                message = f"{message}: {api_response['errors']}"
+            raise APIError(message)
+
+        if key is not None and "ETag" in response.headers:
+            self.validators[key] = (response.headers["ETag"], copy.deepcopy(api_response))
+            self.validators.move_to_end(key)
+            while len(self.validators) > args.cache_size:
+                self.validators.popitem(last=False)
+        return api_response
+
+    async def list(self, resource: str, **filters) -> List[Dict[str, Any]]:
+        """Fetch every item of a paginated list endpoint, following the cursors"""
+        params = dict(filters, limit=API_PAGE_LIMIT)
+        items = []
+        while True:
+            api_response = await self._call("GET", resource, params=params)
+            items.extend(api_response.get("data", []))
+            cursor = (api_response.get("pagination") or {}).get("next_cursor")
+            if not cursor:
+                return items
+            params["cursor"] = cursor
+
+    async def get(self, resource: str, item_id: int) -> Dict[str, Any]:
+        return (await self._call("GET", f"{resource}/{item_id}")).get("data", {})
+
+    async def create(self, resource: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        return (await self._call("POST", resource, json=data)).get("data", {})
+
+    async def update(self, resource: str, item_id: int, data: Dict[str, Any]) -> Dict[str, Any]:
+        return (await self._call("PUT", f"{resource}/{item_id}", json=data)).get("data", {})
+
+    async def delete(self, resource: str, item_id: int) -> None:
+        await self._call("DELETE", f"{resource}/{item_id}")
+
+    async def search(self, query: str, kind: str, limit: int) -> List[Dict[str, Any]]:
+        params = {"q": query, "limit": limit}
+        if kind:
+            params["kind"] = kind
+        return (await self._call("GET", "search", params=params)).get("data", [])
+
+class DirectClient:
+    """Calls the app.api.api tool functions in-process against the app's database
+
+    The Flask app is created once with its normal configuration (DATABASE_URL or
+    the default app.db), and every call runs inside a fresh app context, so the
+    session is removed after each tool call just like after a request. Calls run
+    on worker threads, which keeps the event loop free while the database is
+    busy: writes on a single thread, and read-only tools (list_*, get_* and
+    search) on a pool as large as the app's reader pool, using its read-only
+    engine so they do not queue behind writes.
+    """
+
+    # Singular names used by the app.api.api tool functions
+    SINGULAR = {"projects": "project", "sprints": "sprint", "tasks": "task", "issues": "issue"}
+
+    def __init__(self):
+        # The app package lives next to this directory
+        sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        from app import create_app, db
+        from app.mcp import ToolParameterError, get_compiled_tools
+        from app.utils.engines import use_reader
+
+        self.app = create_app()
+        with self.app.app_context():
+            self.tools = get_compiled_tools()
+        self.parameter_error = ToolParameterError
+        self.use_reader = lambda: use_reader(db.session)
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="btg-direct")
+        self.read_executor = ThreadPoolExecutor(
+            max_workers=self.app.config.get("DATABASE_READER_POOL_SIZE", 8), thread_name_prefix="btg-direct-read"
+        )
+
+    async def _call(self, tool_name: str, parameters: Dict[str, Any]):
+        loop = asyncio.get_running_loop()
+        executor = self.read_executor if self.tools[tool_name].read_only else self.executor
+        return await loop.run_in_executor(executor, self._run, tool_name, parameters)
+
+    def _run(self, tool_name: str, parameters: Dict[str, Any]):
+        tool = self.tools[tool_name]
+        with self.app.app_context():
+            if tool.read_only:
+                self.use_reader()
+            try:
+                result = tool(parameters)
+            except self.parameter_error as e:
+                raise APIError(str(e))
+            except Exception as e:
+                logger.exception(f"Error running {tool_name} in-process")
+                raise APIError(str(e))
+        if isinstance(result, dict) and "error" in result:
+            raise APIError(result["error"])
+        return result
+
+    async def list(self, resource: str, **filters) -> List[Dict[str, Any]]:
+        return await self._call(f"list_{resource}", filters)
+
+    async def get(self, resource: str, item_id: int) -> Dict[str, Any]:
+        name = self.SINGULAR[resource]
+        return await self._call(f"get_{name}", {f"{name}_id": item_id})
+
+    async def create(self, resource: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        return await self._call(f"create_{self.SINGULAR[resource]}", data)
+
+    async def update(self, resource: str, item_id: int, data: Dict[str, Any]) -> Dict[str, Any]:
+        name = self.SINGULAR[resource]
+        return await self._call(f"update_{name}", {f"{name}_id": item_id, **data})
+
+    async def delete(self, resource: str, item_id: int) -> None:
+        name = self.SINGULAR[resource]
+        await self._call(f"delete_{name}", {f"{name}_id": item_id})
+
+    async def search(self, query: str, kind: str, limit: int) -> List[Dict[str, Any]]:
+        return await self._call("search", {"query": query, "kind": kind or None, "limit": limit})
+
+class CachedClient:
+    """Read-through cache in front of a client
+
+    Reads are cached per call (resource plus arguments) for a short TTL, up to
+    a bounded number of entries evicted least recently used first. Every entry
+    is tagged with the entities it contains or was filtered by, e.g.
+    "sprint:3" or "list:tasks" for unfiltered lists, and writes drop the
+    entries tagged with the entities they change; search results are dropped
+    by every write. Failed calls raise APIError and are never cached.
+    """
+
+    # Singular names used in the entity tags
+    SINGULAR = {"projects": "project", "sprints": "sprint", "tasks": "task", "issues": "issue"}
+
+    # Filter of each list endpoint that names the parent entity
+    PARENT_FILTERS = {"sprints": ("project_id", "project"), "tasks": ("sprint_id", "sprint"), "issues": ("sprint_id", "sprint")}
+
+    # Tag of every cached search result
+    SEARCH_TAG = "search"
+
+    def __init__(self, client, ttl: float, maxsize: int):
+        self.client = client
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.tags = {}
+        # Sprint tag of the tasks and issues seen in results, e.g. "task:5" -> "sprint:3",
+        # least recently seen first and bounded like the entries
+        self.parents = OrderedDict()
+        # Bumped by every invalidation, so a read that overlapped a write is not stored
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def format_stats(self) -> str:
+        lookups = self.hits + self.misses
+        ratio = self.hits / lookups if lookups else 0.0
+        return (f"hits={self.hits} misses={self.misses} hit_ratio={ratio:.2f} "
+                f"invalidations={self.invalidations} size={len(self.entries)}")
+
+    def _entity_tags(self, resource: str, item: Dict[str, Any]) -> set:
+        """Return the tags of an item and of the sprints embedded in it"""
+        tags = {f"{self.SINGULAR[resource]}:{item.get('id')}"}
+        if resource in ("tasks", "issues") and item.get("sprint_id"):
+            self._remember_parent(f"{self.SINGULAR[resource]}:{item['id']}", f"sprint:{item['sprint_id']}")
+        for sprint in item.get("sprints") or []:
+            tags.add(f"sprint:{sprint.get('id')}")
+        return tags
+
+    def _remember_parent(self, item_tag: str, parent_tag: str):
+        self.parents[item_tag] = parent_tag
+        self.parents.move_to_end(item_tag)
+        while len(self.parents) > self.maxsize:
+            self.parents.popitem(last=False)
+
+    def _forget_parents(self, tag: str):
+        """Drop a deleted task or issue, or the tasks and issues of a deleted sprint"""
+        self.parents.pop(tag, None)
+        if tag.startswith("sprint:"):
+            for item_tag in [item_tag for item_tag, parent_tag in self.parents.items() if parent_tag == tag]:
+                del self.parents[item_tag]
+
+    def _discard(self, key):
+        entry = self.entries.pop(key, None)
+        if entry is None:
+            return
+        for tag in entry[2]:
+            keys = self.tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self.tags[tag]
+
+    def _invalidate(self, tags):
+        """Drop every entry tagged with any of tags; None drops everything"""
+        self.generation += 1
+        if tags is not None:
+            # Any write can change which items match a search
+            tags = set(tags) | {self.SEARCH_TAG}
+        if tags is None:
+            self.invalidations += len(self.entries)
+            self.entries.clear()
+            self.tags.clear()
+            return
+        keys = set()
+        for tag in tags:
+            keys.update(self.tags.get(tag, ()))
+        for key in keys:
+            self._discard(key)
+        self.invalidations += len(keys)
+
+    async def _read(self, key, tags: set, fetch):
+        entry = self.entries.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return copy.deepcopy(entry[1])
+
+        self.misses += 1
+        generation = self.generation
+        value = await fetch()
+        if generation == self.generation:
+            self._discard(key)
+            self.entries[key] = (time.monotonic() + self.ttl, copy.deepcopy(value), tags)
+            for tag in tags:
+                self.tags.setdefault(tag, set()).add(key)
+            while len(self.entries) > self.maxsize:
+                self._discard(next(iter(self.entries)))
+        return value
+
+    async def list(self, resource: str, **filters) -> List[Dict[str, Any]]:
+        async def fetch():
+            items = await self.client.list(resource, **filters)
+            for item in items:
+                tags.update(self._entity_tags(resource, item))
+            return items
+
+        field, parent = self.PARENT_FILTERS.get(resource, (None, None))
+        tags = {f"{parent}:{filters[field]}"} if filters.get(field) else {f"list:{resource}"}
+        return await self._read(("list", resource, tuple(sorted(filters.items()))), tags, fetch)
+
+    async def get(self, resource: str, item_id: int) -> Dict[str, Any]:
+        async def fetch():
+            item = await self.client.get(resource, item_id)
+            tags.update(self._entity_tags(resource, item))
+            return item
+
+        tags = {f"{self.SINGULAR[resource]}:{item_id}"}
+        return await self._read(("get", resource, item_id), tags, fetch)
+
+    async def search(self, query: str, kind: str, limit: int) -> List[Dict[str, Any]]:
+        return await self._read(("search", query, kind, limit), {self.SEARCH_TAG},
+                                lambda: self.client.search(query, kind, limit))
+
+    def _parent_tag(self, resource: str, item_id: int):
+        return self.parents.get(f"{self.SINGULAR[resource]}:{item_id}")
+
+    async def create(self, resource: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        tags = {f"list:{resource}"}
+        field, parent = self.PARENT_FILTERS.get(resource, (None, None))
+        if field in data:
+            tags.add(f"{parent}:{data[field]}")
+        try:
+            return await self.client.create(resource, data)
+        finally:
+            self._invalidate(tags)
+
+    async def update(self, resource: str, item_id: int, data: Dict[str, Any]) -> Dict[str, Any]:
+        tags = {f"{self.SINGULAR[resource]}:{item_id}"}
+        field, parent = self.PARENT_FILTERS.get(resource, (None, None))
+        if field in data:
+            tags.add(f"{parent}:{data[field]}")
+        old_parent = None
+        if resource in ("tasks", "issues"):
+            old_parent = self._parent_tag(resource, item_id)
+            if old_parent is None and field in data:
+                # Moved out of a sprint the cache has not seen it in
+                tags = None
+            elif old_parent is not None:
+                tags.add(old_parent)
+        item = None
+        try:
+            item = await self.client.update(resource, item_id, data)
+            return item
+        finally:
+            if tags is not None and item is not None and item.get(field):
+                tags.update(self._entity_tags(resource, item))
+                tags.add(f"{parent}:{item[field]}")
+            elif resource in ("tasks", "issues") and old_parent is None:
+                # The sprint whose counts may have changed is unknown, e.g.
+                # the response was lost after the update was applied
+                tags = None
+            self._invalidate(tags)
+
+    async def delete(self, resource: str, item_id: int) -> None:
+        tags = {f"{self.SINGULAR[resource]}:{item_id}"}
+        if resource == "projects":
+            # Deleting a project removes its sprints, tasks and issues too
+            tags = None
+        elif resource == "sprints":
+            tags.update({"list:tasks", "list:issues"})
+        else:
+            parent_tag = self._parent_tag(resource, item_id)
+            tags = None if parent_tag is None else tags | {parent_tag}
+        try:
+            await self.client.delete(resource, item_id)
+            self._forget_parents(f"{self.SINGULAR[resource]}:{item_id}")
+        finally:
+            self._invalidate(tags)
+
+if args.transport == "direct":
+    logger.info("Using the direct transport: tools run in-process against the app database")
+    client = DirectClient()
+else:
+    logger.info(f"Using API base URL: {API_BASE_URL}")
+    client = HTTPClient()
+
+if args.cache_ttl > 0 and args.cache_size > 0:
+    client = CachedClient(client, ttl=args.cache_ttl, maxsize=args.cache_size)
+
 # ==================== PROJECT MANAGEMENT TOOLS ====================
 
-@mcp.tool()
-def get_projects() -> Dict[str, Any]:
+@tool()
+async def get_projects() -> Dict[str, Any]:
     """Get a list of available projects to build together
     
     Returns:
@@ -61,20 +533,13 @@ def get_projects() -> Dict[str, Any]:
     logger.info("Fetching projects from BuildTogether API")
     
     try:
-        response = requests.get(f"{API_BASE_URL}/projects")
-        response.raise_for_status()
-        # Assuming API returns {"data": [...], "status": "success"}
-        api_response = response.json()
-        return {"projects": api_response.get("data", [])}
-    except requests.RequestException as e:
+        return {"projects": await client.list("projects")}
+    except APIError as e:
         logger.error(f"Error fetching projects from API: {e}")
         return {"projects": []}
-    except json.JSONDecodeError as e:
-        logger.error(f"Error decoding projects API response: {e}")
-        return {"projects": []}
 
-@mcp.tool()
-def get_project_details(project_id: int) -> Dict[str, Any]:
+@tool()
+async def get_project_details(project_id: int) -> Dict[str, Any]:
     """Get detailed information about a specific project
     
     Args:
@@ -86,19 +551,13 @@ def get_project_details(project_id: int) -> Dict[str, Any]:
     logger.info(f"Fetching details for project {project_id}")
     
     try:
-        response = requests.get(f"{API_BASE_URL}/projects/{project_id}")
-        response.raise_for_status()
-        api_response = response.json()
-        return {"project": api_response.get("data", {})}
-    except requests.RequestException as e:
+        return {"project": await client.get("projects", project_id)}
+    except APIError as e:
         logger.error(f"Error fetching project details: {e}")
         return {"error": str(e)}
-    except json.JSONDecodeError as e:
-         logger.error(f"Error decoding project details API response: {e}")
-         return {"error": f"JSON Decode Error: {e}"}
 
-@mcp.tool()
-def create_project(name: str, description: str = "") -> Dict[str, Any]:
+@tool()
+async def create_project(name: str, description: str = "") -> Dict[str, Any]:
     """Create a new project
     
     Args:
@@ -113,24 +572,13 @@ def create_project(name: str, description: str = "") -> Dict[str, Any]:
     try:
         # Use helper, description will be included if not empty
         data = build_request_data(name=name, description=description) 
-        response = requests.post(f"{API_BASE_URL}/projects", json=data)
-        response.raise_for_status()
-        api_response = response.json()
-        return {"project": api_response.get("data", {}), "message": "Project created successfully"}
-    except requests.RequestException as e:
+        return {"project": await client.create("projects", data), "message": "Project created successfully"}
+    except APIError as e:
         logger.error(f"Error creating project: {e}")
-        # Try to get more info from response if available
-        error_details = str(e)
-        try:
-            error_details = response.json().get("error", error_details)
-        except: pass
-        return {"error": error_details}
-    except json.JSONDecodeError as e:
-         logger.error(f"Error decoding create project API response: {e}")
-         return {"error": f"JSON Decode Error: {e}"}
-
-@mcp.tool()
-def update_project(project_id: int, data: Dict[str, Any]) -> Dict[str, Any]:
+        return {"error": str(e)}
+
+@tool()
+async def update_project(project_id: int, data: Dict[str, Any]) -> Dict[str, Any]:
     """Update a project with provided data dictionary.
     
     Args:
@@ -143,23 +591,13 @@ def update_project(project_id: int, data: Dict[str, Any]) -> Dict[str, Any]:
     logger.info(f"Updating project {project_id} with data: {data}")
     
     try:
-        response = requests.put(f"{API_BASE_URL}/projects/{project_id}", json=data)
-        response.raise_for_status()
-        api_response = response.json()
-        return {"project": api_response.get("data", {}), "message": "Project updated successfully"}
-    except requests.RequestException as e:
+        return {"project": await client.update("projects", project_id, data), "message": "Project updated successfully"}
+    except APIError as e:
         logger.error(f"Error updating project: {e}")
-        error_details = str(e)
-        try:
-            error_details = response.json().get("error", error_details)
-        except: pass
-        return {"error": error_details}
-    except json.JSONDecodeError as e:
-         logger.error(f"Error decoding API response: {e}")
-         return {"error": f"JSON Decode Error: {e}"}
-
-@mcp.tool()
-def delete_project(project_id: int) -> Dict[str, Any]:
+        return {"error": str(e)}
+
+@tool()
+async def delete_project(project_id: int) -> Dict[str, Any]:
     """Delete a project
     
     Args:
@@ -171,22 +609,47 @@ def delete_project(project_id: int) -> Dict[str, Any]:
     logger.info(f"Deleting project {project_id}")
     
     try:
-        response = requests.delete(f"{API_BASE_URL}/projects/{project_id}")
-        response.raise_for_status()
-        # Assuming API returns success message or just 2xx status
+        await client.delete("projects", project_id)
         return {"message": f"Project {project_id} deleted successfully"}
-    except requests.RequestException as e:
+    except APIError as e:
         logger.error(f"Error deleting project: {e}")
-        error_details = str(e)
-        try:
-            error_details = response.json().get("error", error_details)
-        except: pass
-        return {"error": error_details}
+        return {"error": str(e)}
+
+@tool()
+async def get_project_overview(project_id: int) -> Dict[str, Any]:
+    """Get a project with the tasks and issues of all its sprints in one call
+    
+    The project response already lists its sprints; the tasks and issues of
+    every sprint are then fetched concurrently.
+    
+    Args:
+        project_id: The ID of the project to retrieve
+        
+    Returns:
+        Project details whose sprints each include their tasks and issues
+    """
+    logger.info(f"Fetching overview for project {project_id}")
+    
+    try:
+        project = await client.get("projects", project_id)
+        sprints = project.get("sprints", [])
+        items = await asyncio.gather(*(
+            asyncio.gather(client.list("tasks", sprint_id=sprint["id"]), client.list("issues", sprint_id=sprint["id"]))
+            for sprint in sprints
+        ))
+    except APIError as e:
+        logger.error(f"Error fetching project overview: {e}")
+        return {"error": str(e)}
+    
+    for sprint, (tasks, issues) in zip(sprints, items):
+        sprint["tasks"] = tasks
+        sprint["issues"] = issues
+    return {"project": project}
 
 # ==================== SPRINT MANAGEMENT TOOLS ====================
 
-@mcp.tool()
-def list_sprints(project_id: int = 0) -> Dict[str, Any]:
+@tool()
+async def list_sprints(project_id: int = 0) -> Dict[str, Any]:
     """List all sprints, optionally filtered by project_id (use 0 for all).
     
     Args:
@@ -195,28 +658,21 @@ def list_sprints(project_id: int = 0) -> Dict[str, Any]:
     Returns:
         List of sprints
     """
-    url = f"{API_BASE_URL}/sprints"
-    params = {}
+    filters = {}
     if project_id > 0:
-        params['project_id'] = project_id
+        filters['project_id'] = project_id
         logger.info(f"Fetching sprints for project {project_id}")
     else:
         logger.info("Fetching all sprints")
     
     try:
-        response = requests.get(url, params=params)
-        response.raise_for_status()
-        api_response = response.json()
-        return {"sprints": api_response.get("data", [])}
-    except requests.RequestException as e:
+        return {"sprints": await client.list("sprints", **filters)}
+    except APIError as e:
         logger.error(f"Error fetching sprints: {e}")
         return {"sprints": []}
-    except json.JSONDecodeError as e:
-         logger.error(f"Error decoding list sprints API response: {e}")
-         return {"sprints": []}
 
-@mcp.tool()
-def get_sprint_details(sprint_id: int) -> Dict[str, Any]:
+@tool()
+async def get_sprint_details(sprint_id: int) -> Dict[str, Any]:
     """Get detailed information about a specific sprint
     
     Args:
@@ -228,23 +684,13 @@ def get_sprint_details(sprint_id: int) -> Dict[str, Any]:
     logger.info(f"Fetching details for sprint {sprint_id}")
     
     try:
-        response = requests.get(f"{API_BASE_URL}/sprints/{sprint_id}")
-        response.raise_for_status()
-        api_response = response.json()
-        return {"sprint": api_response.get("data", {})}
-    except requests.RequestException as e:
+        return {"sprint": await client.get("sprints", sprint_id)}
+    except APIError as e:
         logger.error(f"Error fetching sprint details: {e}")
-        error_details = str(e)
-        try:
-            error_details = response.json().get("error", error_details)
-        except: pass
-        return {"error": error_details}
-    except json.JSONDecodeError as e:
-         logger.error(f"Error decoding get sprint details API response: {e}")
-         return {"error": f"JSON Decode Error: {e}"}
-
-@mcp.tool()
-def create_sprint(
+        return {"error": str(e)}
+
+@tool()
+async def create_sprint(
     name: str,
     project_id: int,
     description: str = "",
@@ -271,23 +717,13 @@ def create_sprint(
         if 'project_id' not in data: data['project_id'] = project_id
         if 'status' not in data: data['status'] = status # Send default if not provided
 
-        response = requests.post(f"{API_BASE_URL}/sprints", json=data)
-        response.raise_for_status()
-        api_response = response.json()
-        return {"sprint": api_response.get("data", {}), "message": "Sprint created successfully"}
-    except requests.RequestException as e:
+        return {"sprint": await client.create("sprints", data), "message": "Sprint created successfully"}
+    except APIError as e:
         logger.error(f"Error creating sprint: {e}")
-        error_details = str(e)
-        try:
-            error_details = response.json().get("error", error_details)
-        except: pass
-        return {"error": error_details}
-    except json.JSONDecodeError as e:
-         logger.error(f"Error decoding create sprint API response: {e}")
-         return {"error": f"JSON Decode Error: {e}"}
-
-@mcp.tool()
-def update_sprint(
+        return {"error": str(e)}
+
+@tool()
+async def update_sprint(
     sprint_id: int,
     name: str = "",
     project_id: int = 0,
@@ -311,9 +747,7 @@ def update_sprint(
     try:
         # First, fetch the current sprint details to get the required fields
         try:
-            get_response = requests.get(f"{API_BASE_URL}/sprints/{sprint_id}")
-            get_response.raise_for_status()
-            current_sprint = get_response.json().get("data", {})
+            current_sprint = await client.get("sprints", sprint_id)
             
             if not current_sprint:
                 return {"error": f"Sprint with ID {sprint_id} not found"}
@@ -336,28 +770,18 @@ def update_sprint(
                 
             # Now we have a complete data object with all required fields
             
-        except Exception as fetch_error:
+        except APIError as fetch_error:
             logger.error(f"Error fetching current sprint data: {fetch_error}")
             return {"error": f"Could not get current sprint data: {str(fetch_error)}"}
 
         # Send the update request with complete data
-        response = requests.put(f"{API_BASE_URL}/sprints/{sprint_id}", json=data)
-        response.raise_for_status()
-        api_response = response.json()
-        return {"sprint": api_response.get("data", {}), "message": "Sprint updated successfully"}
-    except requests.RequestException as e:
+        return {"sprint": await client.update("sprints", sprint_id, data), "message": "Sprint updated successfully"}
+    except APIError as e:
         logger.error(f"Error updating sprint: {e}")
-        error_details = str(e)
-        try:
-            error_details = response.json().get("error", error_details)
-        except: pass
-        return {"error": error_details}
-    except json.JSONDecodeError as e:
-         logger.error(f"Error decoding update sprint API response: {e}")
-         return {"error": f"JSON Decode Error: {e}"}
-
-@mcp.tool()
-def delete_sprint(sprint_id: int) -> Dict[str, Any]:
+        return {"error": str(e)}
+
+@tool()
+async def delete_sprint(sprint_id: int) -> Dict[str, Any]:
     """Delete a sprint
     
     Args:
@@ -369,21 +793,16 @@ def delete_sprint(sprint_id: int) -> Dict[str, Any]:
     logger.info(f"Deleting sprint {sprint_id}")
     
     try:
-        response = requests.delete(f"{API_BASE_URL}/sprints/{sprint_id}")
-        response.raise_for_status()
+        await client.delete("sprints", sprint_id)
         return {"message": f"Sprint {sprint_id} deleted successfully"}
-    except requests.RequestException as e:
+    except APIError as e:
         logger.error(f"Error deleting sprint: {e}")
-        error_details = str(e)
-        try:
-            error_details = response.json().get("error", error_details)
-        except: pass
-        return {"error": error_details}
+        return {"error": str(e)}
 
 # ==================== TASK MANAGEMENT TOOLS ====================
 
-@mcp.tool()
-def list_tasks(sprint_id: int = 0) -> Dict[str, Any]:
+@tool()
+async def list_tasks(sprint_id: int = 0) -> Dict[str, Any]:
     """List all tasks, optionally filtered by sprint_id (use 0 for all).
     
     Args:
@@ -392,28 +811,21 @@ def list_tasks(sprint_id: int = 0) -> Dict[str, Any]:
     Returns:
         List of tasks
     """
-    url = f"{API_BASE_URL}/tasks"
-    params = {}
+    filters = {}
     if sprint_id > 0:
-        params['sprint_id'] = sprint_id
+        filters['sprint_id'] = sprint_id
         logger.info(f"Fetching tasks for sprint {sprint_id}")
     else:
         logger.info("Fetching all tasks")
 
     try:
-        response = requests.get(url, params=params)
-        response.raise_for_status()
-        api_response = response.json()
-        return {"tasks": api_response.get("data", [])}
-    except requests.RequestException as e:
+        return {"tasks": await client.list("tasks", **filters)}
+    except APIError as e:
         logger.error(f"Error fetching tasks: {e}")
         return {"tasks": []}
-    except json.JSONDecodeError as e:
-         logger.error(f"Error decoding list tasks API response: {e}")
-         return {"tasks": []}
 
-@mcp.tool()
-def get_task_details(task_id: int) -> Dict[str, Any]:
+@tool()
+async def get_task_details(task_id: int) -> Dict[str, Any]:
     """Get detailed information about a specific task
     
     Args:
@@ -425,23 +837,13 @@ def get_task_details(task_id: int) -> Dict[str, Any]:
     logger.info(f"Fetching details for task {task_id}")
     
     try:
-        response = requests.get(f"{API_BASE_URL}/tasks/{task_id}")
-        response.raise_for_status()
-        api_response = response.json()
-        return {"task": api_response.get("data", {})}
-    except requests.RequestException as e:
+        return {"task": await client.get("tasks", task_id)}
+    except APIError as e:
         logger.error(f"Error fetching task details: {e}")
-        error_details = str(e)
-        try:
-            error_details = response.json().get("error", error_details)
-        except: pass
-        return {"error": error_details}
-    except json.JSONDecodeError as e:
-         logger.error(f"Error decoding get task details API response: {e}")
-         return {"error": f"JSON Decode Error: {e}"}
-
-@mcp.tool()
-def create_task(
+        return {"error": str(e)}
+
+@tool()
+async def create_task(
     details: str,
     sprint_id: int,
     completed: bool = False # Default to False
@@ -466,23 +868,13 @@ def create_task(
             "completed": completed 
         }
             
-        response = requests.post(f"{API_BASE_URL}/tasks", json=data)
-        response.raise_for_status()
-        api_response = response.json()
-        return {"task": api_response.get("data", {}), "message": "Task created successfully"}
-    except requests.RequestException as e:
+        return {"task": await client.create("tasks", data), "message": "Task created successfully"}
+    except APIError as e:
         logger.error(f"Error creating task: {e}")
-        error_details = str(e)
-        try:
-            error_details = response.json().get("error", error_details)
-        except: pass
-        return {"error": error_details}
-    except json.JSONDecodeError as e:
-         logger.error(f"Error decoding create task API response: {e}")
-         return {"error": f"JSON Decode Error: {e}"}
-
-@mcp.tool()
-def update_task(
+        return {"error": str(e)}
+
+@tool()
+async def update_task(
     task_id: int,
     details: str = "",
     sprint_id: int = 0,
@@ -514,23 +906,13 @@ def update_task(
         if not data:
             return {"message": "No update data provided."}
             
-        response = requests.put(f"{API_BASE_URL}/tasks/{task_id}", json=data)
-        response.raise_for_status()
-        api_response = response.json()
-        return {"task": api_response.get("data", {}), "message": "Task updated successfully"}
-    except requests.RequestException as e:
+        return {"task": await client.update("tasks", task_id, data), "message": "Task updated successfully"}
+    except APIError as e:
         logger.error(f"Error updating task: {e}")
-        error_details = str(e)
-        try:
-            error_details = response.json().get("error", error_details)
-        except: pass
-        return {"error": error_details}
-    except json.JSONDecodeError as e:
-         logger.error(f"Error decoding update task API response: {e}")
-         return {"error": f"JSON Decode Error: {e}"}
-
-@mcp.tool()
-def complete_task(task_id: int) -> Dict[str, Any]:
+        return {"error": str(e)}
+
+@tool()
+async def complete_task(task_id: int) -> Dict[str, Any]:
     """Mark a task as completed
     
     Args:
@@ -543,23 +925,13 @@ def complete_task(task_id: int) -> Dict[str, Any]:
     
     try:
         data = {"completed": True} # Explicitly set completed to True
-        response = requests.put(f"{API_BASE_URL}/tasks/{task_id}", json=data)
-        response.raise_for_status()
-        api_response = response.json()
-        return {"task": api_response.get("data", {}), "message": "Task marked as completed"}
-    except requests.RequestException as e:
+        return {"task": await client.update("tasks", task_id, data), "message": "Task marked as completed"}
+    except APIError as e:
         logger.error(f"Error completing task: {e}")
-        error_details = str(e)
-        try:
-            error_details = response.json().get("error", error_details)
-        except: pass
-        return {"error": error_details}
-    except json.JSONDecodeError as e:
-         logger.error(f"Error decoding complete task API response: {e}")
-         return {"error": f"JSON Decode Error: {e}"}
-
-@mcp.tool()
-def delete_task(task_id: int) -> Dict[str, Any]:
+        return {"error": str(e)}
+
+@tool()
+async def delete_task(task_id: int) -> Dict[str, Any]:
     """Delete a task
     
     Args:
@@ -571,21 +943,16 @@ def delete_task(task_id: int) -> Dict[str, Any]:
     logger.info(f"Deleting task {task_id}")
     
     try:
-        response = requests.delete(f"{API_BASE_URL}/tasks/{task_id}")
-        response.raise_for_status()
+        await client.delete("tasks", task_id)
         return {"message": f"Task {task_id} deleted successfully"}
-    except requests.RequestException as e:
+    except APIError as e:
         logger.error(f"Error deleting task: {e}")
-        error_details = str(e)
-        try:
-            error_details = response.json().get("error", error_details)
-        except: pass
-        return {"error": error_details}
+        return {"error": str(e)}
 
 # ==================== ISSUE MANAGEMENT TOOLS ====================
 
-@mcp.tool()
-def list_issues(sprint_id: int = 0) -> Dict[str, Any]:
+@tool()
+async def list_issues(sprint_id: int = 0) -> Dict[str, Any]:
     """List all issues, optionally filtered by sprint_id (use 0 for all).
     
     Args:
@@ -594,28 +961,21 @@ def list_issues(sprint_id: int = 0) -> Dict[str, Any]:
     Returns:
         List of issues
     """
-    url = f"{API_BASE_URL}/issues"
-    params = {}
+    filters = {}
     if sprint_id > 0:
-        params['sprint_id'] = sprint_id
+        filters['sprint_id'] = sprint_id
         logger.info(f"Fetching issues for sprint {sprint_id}")
     else:
         logger.info("Fetching all issues")
     
     try:
-        response = requests.get(url, params=params)
-        response.raise_for_status()
-        api_response = response.json()
-        return {"issues": api_response.get("data", [])}
-    except requests.RequestException as e:
+        return {"issues": await client.list("issues", **filters)}
+    except APIError as e:
         logger.error(f"Error fetching issues: {e}")
         return {"issues": []}
-    except json.JSONDecodeError as e:
-         logger.error(f"Error decoding list issues API response: {e}")
-         return {"issues": []}
 
-@mcp.tool()
-def get_issue_details(issue_id: int) -> Dict[str, Any]:
+@tool()
+async def get_issue_details(issue_id: int) -> Dict[str, Any]:
     """Get detailed information about a specific issue
     
     Args:
@@ -627,23 +987,13 @@ def get_issue_details(issue_id: int) -> Dict[str, Any]:
     logger.info(f"Fetching details for issue {issue_id}")
     
     try:
-        response = requests.get(f"{API_BASE_URL}/issues/{issue_id}")
-        response.raise_for_status()
-        api_response = response.json()
-        return {"issue": api_response.get("data", {})}
-    except requests.RequestException as e:
+        return {"issue": await client.get("issues", issue_id)}
+    except APIError as e:
         logger.error(f"Error fetching issue details: {e}")
-        error_details = str(e)
-        try:
-            error_details = response.json().get("error", error_details)
-        except: pass
-        return {"error": error_details}
-    except json.JSONDecodeError as e:
-         logger.error(f"Error decoding get issue details API response: {e}")
-         return {"error": f"JSON Decode Error: {e}"}
-
-@mcp.tool()
-def create_issue(
+        return {"error": str(e)}
+
+@tool()
+async def create_issue(
     details: str,
     sprint_id: int,
     completed: bool = False # Default to False
@@ -667,23 +1017,13 @@ def create_issue(
             "completed": completed
         }
             
-        response = requests.post(f"{API_BASE_URL}/issues", json=data)
-        response.raise_for_status()
-        api_response = response.json()
-        return {"issue": api_response.get("data", {}), "message": "Issue created successfully"}
-    except requests.RequestException as e:
+        return {"issue": await client.create("issues", data), "message": "Issue created successfully"}
+    except APIError as e:
         logger.error(f"Error creating issue: {e}")
-        error_details = str(e)
-        try:
-            error_details = response.json().get("error", error_details)
-        except: pass
-        return {"error": error_details}
-    except json.JSONDecodeError as e:
-         logger.error(f"Error decoding create issue API response: {e}")
-         return {"error": f"JSON Decode Error: {e}"}
-
-@mcp.tool()
-def update_issue(
+        return {"error": str(e)}
+
+@tool()
+async def update_issue(
     issue_id: int,
     details: str = "",
     sprint_id: int = 0,
@@ -714,23 +1054,13 @@ def update_issue(
         if not data:
              return {"message": "No update data provided."}
             
-        response = requests.put(f"{API_BASE_URL}/issues/{issue_id}", json=data)
-        response.raise_for_status()
-        api_response = response.json()
-        return {"issue": api_response.get("data", {}), "message": "Issue updated successfully"}
-    except requests.RequestException as e:
+        return {"issue": await client.update("issues", issue_id, data), "message": "Issue updated successfully"}
+    except APIError as e:
         logger.error(f"Error updating issue: {e}")
-        error_details = str(e)
-        try:
-            error_details = response.json().get("error", error_details)
-        except: pass
-        return {"error": error_details}
-    except json.JSONDecodeError as e:
-         logger.error(f"Error decoding update issue API response: {e}")
-         return {"error": f"JSON Decode Error: {e}"}
-
-@mcp.tool()
-def resolve_issue(issue_id: int) -> Dict[str, Any]:
+        return {"error": str(e)}
+
+@tool()
+async def resolve_issue(issue_id: int) -> Dict[str, Any]:
     """Mark an issue as resolved
     
     Args:
@@ -743,23 +1073,13 @@ def resolve_issue(issue_id: int) -> Dict[str, Any]:
     
     try:
         data = {"completed": True} # Explicitly set completed to True
-        response = requests.put(f"{API_BASE_URL}/issues/{issue_id}", json=data)
-        response.raise_for_status()
-        api_response = response.json()
-        return {"issue": api_response.get("data", {}), "message": "Issue marked as resolved"}
-    except requests.RequestException as e:
+        return {"issue": await client.update("issues", issue_id, data), "message": "Issue marked as resolved"}
+    except APIError as e:
         logger.error(f"Error resolving issue: {e}")
-        error_details = str(e)
-        try:
-            error_details = response.json().get("error", error_details)
-        except: pass
-        return {"error": error_details}
-    except json.JSONDecodeError as e:
-         logger.error(f"Error decoding resolve issue API response: {e}")
-         return {"error": f"JSON Decode Error: {e}"}
-
-@mcp.tool()
-def delete_issue(issue_id: int) -> Dict[str, Any]:
+        return {"error": str(e)}
+
+@tool()
+async def delete_issue(issue_id: int) -> Dict[str, Any]:
     """Delete an issue
     
     Args:
@@ -771,16 +1091,33 @@ def delete_issue(issue_id: int) -> Dict[str, Any]:
     logger.info(f"Deleting issue {issue_id}")
     
     try:
-        response = requests.delete(f"{API_BASE_URL}/issues/{issue_id}")
-        response.raise_for_status()
+        await client.delete("issues", issue_id)
         return {"message": f"Issue {issue_id} deleted successfully"}
-    except requests.RequestException as e:
+    except APIError as e:
         logger.error(f"Error deleting issue: {e}")
-        error_details = str(e)
-        try:
-            error_details = response.json().get("error", error_details)
-        except: pass
-        return {"error": error_details}
+        return {"error": str(e)}
+
+# ==================== SEARCH TOOLS ====================
+
+@tool()
+async def search(query: str, kind: str = "", limit: int = 20) -> Dict[str, Any]:
+    """Search projects, sprints, tasks and issues by text, best matches first
+    
+    Args:
+        query: Words to search for; each must match a word or the start of one
+        kind: Comma separated kinds to return: project, sprint, task, issue (empty for all)
+        limit: Maximum number of results
+        
+    Returns:
+        Matching items with their kind, id, title, snippet, project_id and sprint_id
+    """
+    logger.info(f"Searching for {query!r}")
+    
+    try:
+        return {"results": await client.search(query, kind, limit)}
+    except APIError as e:
+        logger.error(f"Error searching: {e}")
+        return {"error": str(e)}
 
 # Run the server directly
 if __name__ == "__main__":
@@ -790,4 +1127,4 @@ if __name__ == "__main__":
         mcp.run()
     except Exception as e:
         logger.error(f"Error in MCP server: {e}")
-        sys.exit(1) 
\ No newline at end of file
+        sys.exit(1) 
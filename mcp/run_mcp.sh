@@ -7,6 +7,7 @@ exec 1>&2  # Redirect stdout to stderr
 # Parse command line arguments
 PORT=3149  # Default port
 AUTO_START=true  # Default to auto-start Build Together
+TRANSPORT=http  # Default to calling the Build Together API over HTTP
 
 # First argument is PORT
 if [ $# -gt 0 ]; then
@@ -18,6 +19,11 @@ if [ $# -gt 1 ]; then
     AUTO_START=$2
 fi
 
+# Third argument is TRANSPORT (http or direct)
+if [ $# -gt 2 ]; then
+    TRANSPORT=$3
+fi
+
 # Change to the project root directory
 cd "$(dirname "$0")/.."
 
@@ -27,30 +33,35 @@ if [ -d "venv" ]; then
     source venv/bin/activate
 fi
 
-# Check if Build Together is already running on the specified port
-echo "Checking if Build Together is running on port $PORT..."
-if curl -s "http://localhost:$PORT/api/projects" > /dev/null; then
-    echo "Build Together is already running on port $PORT"
-elif [ "$AUTO_START" = "true" ]; then
-    echo "Build Together is not running on port $PORT, starting it now..."
-    # Start Build Together in the background
-    ./run.sh &
-    
-    # Wait for server to start
-    echo "Waiting for Build Together to start..."
-    for i in {1..10}; do
-        if curl -s "http://localhost:$PORT/api/projects" > /dev/null; then
-            echo "Build Together started successfully on port $PORT"
-            break
-        fi
-        if [ $i -eq 10 ]; then
-            echo "Warning: Couldn't confirm Build Together started. Will proceed anyway..."
-        fi
-        sleep 1
-    done
+# The direct transport runs the tools in-process, so the app does not need to be running
+if [ "$TRANSPORT" = "direct" ]; then
+    echo "Using the direct transport, skipping the Build Together check"
 else
-    echo "Build Together is not running on port $PORT and auto-start is disabled."
-    echo "The MCP server will still start, but commands will fail until Build Together is running."
+    # Check if Build Together is already running on the specified port
+    echo "Checking if Build Together is running on port $PORT..."
+    if curl -s "http://localhost:$PORT/api/projects" > /dev/null; then
+        echo "Build Together is already running on port $PORT"
+    elif [ "$AUTO_START" = "true" ]; then
+        echo "Build Together is not running on port $PORT, starting it now..."
+        # Start Build Together in the background
+        ./run.sh &
+        
+        # Wait for server to start
+        echo "Waiting for Build Together to start..."
+        for i in {1..10}; do
+            if curl -s "http://localhost:$PORT/api/projects" > /dev/null; then
+                echo "Build Together started successfully on port $PORT"
+                break
+            fi
+            if [ $i -eq 10 ]; then
+                echo "Warning: Couldn't confirm Build Together started. Will proceed anyway..."
+            fi
+            sleep 1
+        done
+    else
+        echo "Build Together is not running on port $PORT and auto-start is disabled."
+        echo "The MCP server will still start, but commands will fail until Build Together is running."
+    fi
 fi
 
 # Run the MCP server
@@ -59,7 +70,7 @@ echo "Starting Build Together MCP server (connecting to port $PORT)..."
 exec 1>&3
 
 # Run the Python script, redirecting stderr to our stderr (fd 2)
-python mcp/build_together_mcp.py --port $PORT 2>&2
+python mcp/build_together_mcp.py --port $PORT --transport $TRANSPORT 2>&2
 
 # Deactivate virtual environment on exit
 if [ -n "$VIRTUAL_ENV" ]; then
@@ -0,0 +1,64 @@
+"""Add pre-rendered HTML columns for markdown fields
+
+Revision ID: a7c3e91f4b20
+Revises: 66357ad41baa
+Create Date: 2026-10-18 09:12:44.201733
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from app.utils.markdown_parser import RENDERER_VERSION, convert_markdown_to_html
+
+
+# revision identifiers, used by Alembic.
+revision = 'a7c3e91f4b20'
+down_revision = '66357ad41baa'
+branch_labels = None
+depends_on = None
+
+
+# Markdown source columns per table that get a stored `<column>_html` rendering
+MARKDOWN_COLUMNS = {
+    'projects': ['description', 'requirements', 'implementation_details'],
+    'sprints': ['description'],
+    'tasks': ['details'],
+    'issues': ['details'],
+}
+
+
+def backfill(table_name, columns):
+    """Render the stored HTML for every existing row of a table"""
+    connection = op.get_bind()
+    table = sa.table(
+        table_name,
+        sa.column('id', sa.Integer),
+        sa.column('html_version', sa.Integer),
+        *[sa.column(name, sa.Text) for name in columns],
+        *[sa.column(f'{name}_html', sa.Text) for name in columns]
+    )
+
+    rows = connection.execute(sa.select(table.c.id, *[table.c[name] for name in columns])).fetchall()
+    for row in rows:
+        values = {f'{name}_html': str(convert_markdown_to_html(getattr(row, name))) for name in columns}
+        values['html_version'] = RENDERER_VERSION
+        connection.execute(table.update().where(table.c.id == row.id).values(**values))
+
+
+def upgrade():
+    for table_name, columns in MARKDOWN_COLUMNS.items():
+        with op.batch_alter_table(table_name, schema=None) as batch_op:
+            for name in columns:
+                batch_op.add_column(sa.Column(f'{name}_html', sa.Text(), nullable=True))
+            batch_op.add_column(sa.Column('html_version', sa.Integer(), nullable=True))
+
+    for table_name, columns in MARKDOWN_COLUMNS.items():
+        backfill(table_name, columns)
+
+
+def downgrade():
+    for table_name, columns in reversed(list(MARKDOWN_COLUMNS.items())):
+        with op.batch_alter_table(table_name, schema=None) as batch_op:
+            batch_op.drop_column('html_version')
+            for name in reversed(columns):
+                batch_op.drop_column(f'{name}_html')
@@ -0,0 +1,63 @@
+"""Cascade deletes of projects and sprints in the database
+
+Revision ID: b8d4e1f07a32
+Revises: f3a9c6d21b58
+Create Date: 2026-10-18 14:37:12.604381
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b8d4e1f07a32'
+down_revision = 'f3a9c6d21b58'
+branch_labels = None
+depends_on = None
+
+
+# Names for foreign keys SQLite reports without one, so batch mode can drop them
+NAMING_CONVENTION = {'fk': 'fk_%(table_name)s_%(column_0_name)s_%(referred_table_name)s'}
+
+# Child table -> (column, parent table)
+FOREIGN_KEYS = {
+    'sprints': ('project_id', 'projects'),
+    'tasks': ('sprint_id', 'sprints'),
+    'issues': ('sprint_id', 'sprints'),
+}
+
+
+def _existing_foreign_keys(table_name, column, fallback, offline_name):
+    """Return the names of the foreign keys on table_name.column"""
+    if op.get_context().as_sql:
+        # Offline (--sql) there is no database to inspect
+        return [offline_name]
+    return [
+        fk['name'] or fallback
+        for fk in sa.inspect(op.get_bind()).get_foreign_keys(table_name)
+        if fk['constrained_columns'] == [column]
+    ]
+
+
+def _recreate_foreign_key(table_name, ondelete, offline_name=None):
+    """Replace the foreign key of table_name with one using the given ON DELETE action"""
+    column, referred_table = FOREIGN_KEYS[table_name]
+    fallback = NAMING_CONVENTION['fk'] % {
+        'table_name': table_name, 'column_0_name': column, 'referred_table_name': referred_table
+    }
+    existing = _existing_foreign_keys(table_name, column, fallback, offline_name or fallback)
+    with op.batch_alter_table(table_name, schema=None, naming_convention=NAMING_CONVENTION) as batch_op:
+        for name in existing:
+            batch_op.drop_constraint(name, type_='foreignkey')
+        batch_op.create_foreign_key(fallback, referred_table, [column], ['id'], ondelete=ondelete)
+
+
+def upgrade():
+    for table_name, (column, _) in FOREIGN_KEYS.items():
+        # PostgreSQL's generated name for the key created by the initial schema
+        _recreate_foreign_key(table_name, 'CASCADE', offline_name=f'{table_name}_{column}_fkey')
+
+
+def downgrade():
+    for table_name in reversed(list(FOREIGN_KEYS)):
+        _recreate_foreign_key(table_name, None)
@@ -0,0 +1,51 @@
+"""Add denormalized task and issue counters to sprints
+
+Revision ID: c41d8e2a9f63
+Revises: a7c3e91f4b20
+Create Date: 2026-10-18 10:03:17.552910
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c41d8e2a9f63'
+down_revision = 'a7c3e91f4b20'
+branch_labels = None
+depends_on = None
+
+
+COUNTER_COLUMNS = ['open_task_count', 'done_task_count', 'open_issue_count', 'done_issue_count']
+
+
+def upgrade():
+    with op.batch_alter_table('sprints', schema=None) as batch_op:
+        for name in COUNTER_COLUMNS:
+            batch_op.add_column(sa.Column(name, sa.Integer(), nullable=True))
+
+    # Backfill the counters from the existing tasks and issues
+    sprints = sa.table('sprints', sa.column('id', sa.Integer), *[sa.column(name, sa.Integer) for name in COUNTER_COLUMNS])
+
+    def count(table_name, done):
+        items = sa.table(table_name, sa.column('sprint_id', sa.Integer), sa.column('completed', sa.Boolean))
+        completed = items.c.completed == sa.true() if done else sa.or_(items.c.completed.is_(None), items.c.completed == sa.false())
+        return (
+            sa.select(sa.func.count())
+            .select_from(items)
+            .where(items.c.sprint_id == sprints.c.id, completed)
+            .scalar_subquery()
+        )
+
+    op.execute(sprints.update().values(
+        open_task_count=count('tasks', False),
+        done_task_count=count('tasks', True),
+        open_issue_count=count('issues', False),
+        done_issue_count=count('issues', True),
+    ))
+
+
+def downgrade():
+    with op.batch_alter_table('sprints', schema=None) as batch_op:
+        for name in reversed(COUNTER_COLUMNS):
+            batch_op.drop_column(name)
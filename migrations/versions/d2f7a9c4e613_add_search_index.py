@@ -0,0 +1,213 @@
+"""Add the full-text search index over projects, sprints, tasks and issues
+
+Revision ID: d2f7a9c4e613
+Revises: b8d4e1f07a32
+Create Date: 2026-10-18 16:05:27.418936
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'd2f7a9c4e613'
+down_revision = 'b8d4e1f07a32'
+branch_labels = None
+depends_on = None
+
+
+# The statements are spelled out so that this revision always creates the same
+# schema; app.models.search builds the current ones for db.create_all() and
+# flask reindex. Rows are keyed by id * 4 + kind (project 0, sprint 1, task 2,
+# issue 3).
+
+SQLITE_CREATE = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS search_index USING fts5("
+    "kind UNINDEXED, item_id UNINDEXED, title, body, tokenize='porter unicode61')",
+
+    "CREATE TRIGGER IF NOT EXISTS search_index_projects_insert AFTER INSERT ON projects BEGIN "
+    "INSERT INTO search_index (rowid, kind, item_id, title, body) VALUES (new.id * 4 + 0, 'project', new.id, "
+    "coalesce(new.name, ''), coalesce(new.description, '') || ' ' || coalesce(new.requirements, '') || ' ' || "
+    "coalesce(new.implementation_details, '')); END",
+    "CREATE TRIGGER IF NOT EXISTS search_index_projects_update "
+    "AFTER UPDATE OF name, description, requirements, implementation_details ON projects BEGIN "
+    "DELETE FROM search_index WHERE rowid = old.id * 4 + 0; "
+    "INSERT INTO search_index (rowid, kind, item_id, title, body) VALUES (new.id * 4 + 0, 'project', new.id, "
+    "coalesce(new.name, ''), coalesce(new.description, '') || ' ' || coalesce(new.requirements, '') || ' ' || "
+    "coalesce(new.implementation_details, '')); END",
+    "CREATE TRIGGER IF NOT EXISTS search_index_projects_delete AFTER DELETE ON projects BEGIN "
+    "DELETE FROM search_index WHERE rowid = old.id * 4 + 0; END",
+
+    "CREATE TRIGGER IF NOT EXISTS search_index_sprints_insert AFTER INSERT ON sprints BEGIN "
+    "INSERT INTO search_index (rowid, kind, item_id, title, body) VALUES (new.id * 4 + 1, 'sprint', new.id, "
+    "coalesce(new.name, ''), coalesce(new.description, '')); END",
+    "CREATE TRIGGER IF NOT EXISTS search_index_sprints_update AFTER UPDATE OF name, description ON sprints BEGIN "
+    "DELETE FROM search_index WHERE rowid = old.id * 4 + 1; "
+    "INSERT INTO search_index (rowid, kind, item_id, title, body) VALUES (new.id * 4 + 1, 'sprint', new.id, "
+    "coalesce(new.name, ''), coalesce(new.description, '')); END",
+    "CREATE TRIGGER IF NOT EXISTS search_index_sprints_delete AFTER DELETE ON sprints BEGIN "
+    "DELETE FROM search_index WHERE rowid = old.id * 4 + 1; END",
+
+    "CREATE TRIGGER IF NOT EXISTS search_index_tasks_insert AFTER INSERT ON tasks BEGIN "
+    "INSERT INTO search_index (rowid, kind, item_id, title, body) VALUES (new.id * 4 + 2, 'task', new.id, "
+    "'', coalesce(new.details, '')); END",
+    "CREATE TRIGGER IF NOT EXISTS search_index_tasks_update AFTER UPDATE OF details ON tasks BEGIN "
+    "DELETE FROM search_index WHERE rowid = old.id * 4 + 2; "
+    "INSERT INTO search_index (rowid, kind, item_id, title, body) VALUES (new.id * 4 + 2, 'task', new.id, "
+    "'', coalesce(new.details, '')); END",
+    "CREATE TRIGGER IF NOT EXISTS search_index_tasks_delete AFTER DELETE ON tasks BEGIN "
+    "DELETE FROM search_index WHERE rowid = old.id * 4 + 2; END",
+
+    "CREATE TRIGGER IF NOT EXISTS search_index_issues_insert AFTER INSERT ON issues BEGIN "
+    "INSERT INTO search_index (rowid, kind, item_id, title, body) VALUES (new.id * 4 + 3, 'issue', new.id, "
+    "'', coalesce(new.details, '')); END",
+    "CREATE TRIGGER IF NOT EXISTS search_index_issues_update AFTER UPDATE OF details ON issues BEGIN "
+    "DELETE FROM search_index WHERE rowid = old.id * 4 + 3; "
+    "INSERT INTO search_index (rowid, kind, item_id, title, body) VALUES (new.id * 4 + 3, 'issue', new.id, "
+    "'', coalesce(new.details, '')); END",
+    "CREATE TRIGGER IF NOT EXISTS search_index_issues_delete AFTER DELETE ON issues BEGIN "
+    "DELETE FROM search_index WHERE rowid = old.id * 4 + 3; END",
+]
+
+SQLITE_BACKFILL = [
+    "INSERT INTO search_index (rowid, kind, item_id, title, body) "
+    "SELECT id * 4 + 0, 'project', id, coalesce(name, ''), coalesce(description, '') || ' ' || "
+    "coalesce(requirements, '') || ' ' || coalesce(implementation_details, '') FROM projects",
+    "INSERT INTO search_index (rowid, kind, item_id, title, body) "
+    "SELECT id * 4 + 1, 'sprint', id, coalesce(name, ''), coalesce(description, '') FROM sprints",
+    "INSERT INTO search_index (rowid, kind, item_id, title, body) "
+    "SELECT id * 4 + 2, 'task', id, '', coalesce(details, '') FROM tasks",
+    "INSERT INTO search_index (rowid, kind, item_id, title, body) "
+    "SELECT id * 4 + 3, 'issue', id, '', coalesce(details, '') FROM issues",
+    "INSERT INTO search_index (search_index) VALUES ('optimize')",
+]
+
+SQLITE_DROP = [
+    "DROP TRIGGER IF EXISTS search_index_projects_insert",
+    "DROP TRIGGER IF EXISTS search_index_projects_update",
+    "DROP TRIGGER IF EXISTS search_index_projects_delete",
+    "DROP TRIGGER IF EXISTS search_index_sprints_insert",
+    "DROP TRIGGER IF EXISTS search_index_sprints_update",
+    "DROP TRIGGER IF EXISTS search_index_sprints_delete",
+    "DROP TRIGGER IF EXISTS search_index_tasks_insert",
+    "DROP TRIGGER IF EXISTS search_index_tasks_update",
+    "DROP TRIGGER IF EXISTS search_index_tasks_delete",
+    "DROP TRIGGER IF EXISTS search_index_issues_insert",
+    "DROP TRIGGER IF EXISTS search_index_issues_update",
+    "DROP TRIGGER IF EXISTS search_index_issues_delete",
+    "DROP TABLE IF EXISTS search_index",
+]
+
+POSTGRES_CREATE = [
+    "CREATE TABLE IF NOT EXISTS search_index (id bigint PRIMARY KEY, kind varchar(10) NOT NULL, "
+    "item_id integer NOT NULL, title text NOT NULL, body text NOT NULL, "
+    "document tsvector GENERATED ALWAYS AS (setweight(to_tsvector('english', title), 'A') || "
+    "setweight(to_tsvector('english', body), 'B')) STORED)",
+    "CREATE INDEX IF NOT EXISTS ix_search_index_document ON search_index USING gin (document)",
+
+    """CREATE OR REPLACE FUNCTION search_index_projects() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        DELETE FROM search_index WHERE id = OLD.id * 4 + 0;
+        RETURN OLD;
+    END IF;
+    INSERT INTO search_index (id, kind, item_id, title, body)
+    VALUES (NEW.id * 4 + 0, 'project', NEW.id, coalesce(NEW.name, ''), coalesce(NEW.description, '') || ' ' || coalesce(NEW.requirements, '') || ' ' || coalesce(NEW.implementation_details, ''))
+    ON CONFLICT (id) DO UPDATE SET title = EXCLUDED.title, body = EXCLUDED.body;
+    RETURN NEW;
+END
+$$""",
+    "DROP TRIGGER IF EXISTS search_index_projects ON projects",
+    "CREATE TRIGGER search_index_projects AFTER INSERT OR DELETE OR UPDATE OF name, description, requirements, "
+    "implementation_details ON projects FOR EACH ROW EXECUTE FUNCTION search_index_projects()",
+
+    """CREATE OR REPLACE FUNCTION search_index_sprints() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        DELETE FROM search_index WHERE id = OLD.id * 4 + 1;
+        RETURN OLD;
+    END IF;
+    INSERT INTO search_index (id, kind, item_id, title, body)
+    VALUES (NEW.id * 4 + 1, 'sprint', NEW.id, coalesce(NEW.name, ''), coalesce(NEW.description, ''))
+    ON CONFLICT (id) DO UPDATE SET title = EXCLUDED.title, body = EXCLUDED.body;
+    RETURN NEW;
+END
+$$""",
+    "DROP TRIGGER IF EXISTS search_index_sprints ON sprints",
+    "CREATE TRIGGER search_index_sprints AFTER INSERT OR DELETE OR UPDATE OF name, description ON sprints "
+    "FOR EACH ROW EXECUTE FUNCTION search_index_sprints()",
+
+    """CREATE OR REPLACE FUNCTION search_index_tasks() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        DELETE FROM search_index WHERE id = OLD.id * 4 + 2;
+        RETURN OLD;
+    END IF;
+    INSERT INTO search_index (id, kind, item_id, title, body)
+    VALUES (NEW.id * 4 + 2, 'task', NEW.id, '', coalesce(NEW.details, ''))
+    ON CONFLICT (id) DO UPDATE SET title = EXCLUDED.title, body = EXCLUDED.body;
+    RETURN NEW;
+END
+$$""",
+    "DROP TRIGGER IF EXISTS search_index_tasks ON tasks",
+    "CREATE TRIGGER search_index_tasks AFTER INSERT OR DELETE OR UPDATE OF details ON tasks "
+    "FOR EACH ROW EXECUTE FUNCTION search_index_tasks()",
+
+    """CREATE OR REPLACE FUNCTION search_index_issues() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        DELETE FROM search_index WHERE id = OLD.id * 4 + 3;
+        RETURN OLD;
+    END IF;
+    INSERT INTO search_index (id, kind, item_id, title, body)
+    VALUES (NEW.id * 4 + 3, 'issue', NEW.id, '', coalesce(NEW.details, ''))
+    ON CONFLICT (id) DO UPDATE SET title = EXCLUDED.title, body = EXCLUDED.body;
+    RETURN NEW;
+END
+$$""",
+    "DROP TRIGGER IF EXISTS search_index_issues ON issues",
+    "CREATE TRIGGER search_index_issues AFTER INSERT OR DELETE OR UPDATE OF details ON issues "
+    "FOR EACH ROW EXECUTE FUNCTION search_index_issues()",
+]
+
+POSTGRES_BACKFILL = [
+    "INSERT INTO search_index (id, kind, item_id, title, body) "
+    "SELECT id * 4 + 0, 'project', id, coalesce(name, ''), coalesce(description, '') || ' ' || "
+    "coalesce(requirements, '') || ' ' || coalesce(implementation_details, '') FROM projects",
+    "INSERT INTO search_index (id, kind, item_id, title, body) "
+    "SELECT id * 4 + 1, 'sprint', id, coalesce(name, ''), coalesce(description, '') FROM sprints",
+    "INSERT INTO search_index (id, kind, item_id, title, body) "
+    "SELECT id * 4 + 2, 'task', id, '', coalesce(details, '') FROM tasks",
+    "INSERT INTO search_index (id, kind, item_id, title, body) "
+    "SELECT id * 4 + 3, 'issue', id, '', coalesce(details, '') FROM issues",
+]
+
+POSTGRES_DROP = [
+    "DROP TRIGGER IF EXISTS search_index_projects ON projects",
+    "DROP FUNCTION IF EXISTS search_index_projects()",
+    "DROP TRIGGER IF EXISTS search_index_sprints ON sprints",
+    "DROP FUNCTION IF EXISTS search_index_sprints()",
+    "DROP TRIGGER IF EXISTS search_index_tasks ON tasks",
+    "DROP FUNCTION IF EXISTS search_index_tasks()",
+    "DROP TRIGGER IF EXISTS search_index_issues ON issues",
+    "DROP FUNCTION IF EXISTS search_index_issues()",
+    "DROP TABLE IF EXISTS search_index",
+]
+
+
+# Dialect name -> (create and backfill statements, drop statements); other
+# databases get no search index
+STATEMENTS = {
+    'sqlite': (SQLITE_CREATE + SQLITE_BACKFILL, SQLITE_DROP),
+    'postgresql': (POSTGRES_CREATE + POSTGRES_BACKFILL, POSTGRES_DROP),
+}
+
+
+def upgrade():
+    # Create the index and its triggers, then fill it from the existing rows
+    for statement in STATEMENTS.get(op.get_context().dialect.name, ([], []))[0]:
+        op.execute(statement)
+
+
+def downgrade():
+    for statement in STATEMENTS.get(op.get_context().dialect.name, ([], []))[1]:
+        op.execute(statement)
@@ -0,0 +1,34 @@
+"""Add composite indexes for the hot filter columns
+
+Revision ID: e5b81f0c2d47
+Revises: c41d8e2a9f63
+Create Date: 2026-10-18 11:20:36.918254
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5b81f0c2d47'
+down_revision = 'c41d8e2a9f63'
+branch_labels = None
+depends_on = None
+
+
+# Index name -> (table, columns); must match the models' __table_args__
+INDEXES = {
+    'ix_tasks_sprint_id_completed_created_at': ('tasks', ['sprint_id', 'completed', 'created_at']),
+    'ix_issues_sprint_id_completed_created_at': ('issues', ['sprint_id', 'completed', 'created_at']),
+    'ix_sprints_project_id_status': ('sprints', ['project_id', 'status']),
+}
+
+
+def upgrade():
+    for name, (table_name, columns) in INDEXES.items():
+        op.create_index(name, table_name, columns, unique=False)
+
+
+def downgrade():
+    for name, (table_name, columns) in reversed(list(INDEXES.items())):
+        op.drop_index(name, table_name=table_name)
@@ -0,0 +1,28 @@
+"""Add version counters to projects and sprints
+
+Revision ID: f3a9c6d21b58
+Revises: e5b81f0c2d47
+Create Date: 2026-10-18 12:04:51.337120
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f3a9c6d21b58'
+down_revision = 'e5b81f0c2d47'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    for table_name in ('projects', 'sprints'):
+        with op.batch_alter_table(table_name, schema=None) as batch_op:
+            batch_op.add_column(sa.Column('version', sa.Integer(), nullable=False, server_default='1'))
+
+
+def downgrade():
+    for table_name in ('sprints', 'projects'):
+        with op.batch_alter_table(table_name, schema=None) as batch_op:
+            batch_op.drop_column('version')
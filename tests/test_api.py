@@ -9,6 +9,7 @@ import sys
 import pytest
 import json
 import tempfile
+from datetime import datetime
 
 # Add the parent directory to the path so we can import the app
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
@@ -19,9 +20,9 @@ from config import Config
 
 # Test configuration
 class TestConfig(Config):
-    """Test configuration that uses a temporary SQLite database"""
+    """Test configuration that uses a temporary SQLite database, or TEST_DATABASE_URL if set (see test_postgres.sh)"""
     TESTING = True
-    SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+    SQLALCHEMY_DATABASE_URI = os.environ.get('TEST_DATABASE_URL') or 'sqlite:///:memory:'
     WTF_CSRF_ENABLED = False
 
 
@@ -450,3 +451,247 @@ def test_delete_issue(client):
     # Verify the issue was deleted
     deleted_issue = Issue.query.get(issue.id)
     assert deleted_issue is None
+
+
+# Pagination Tests
+def test_paginate_tasks(client):
+    """Test walking through tasks page by page with the cursor"""
+    sprint = Sprint.query.filter_by(name='Test Sprint').first()
+    
+    # Rows sharing a timestamp are ordered by ID
+    created_at = datetime(2024, 1, 1)
+    for i in range(4):
+        db.session.add(Task(details=f'Paged Task {i}', sprint_id=sprint.id, created_at=created_at))
+    db.session.commit()
+    
+    seen = []
+    url = f'/api/tasks?sprint_id={sprint.id}&limit=2'
+    while url:
+        response = client.get(url)
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert len(data['data']) <= 2
+        seen.extend(task['details'] for task in data['data'])
+        
+        next_cursor = data['pagination']['next_cursor']
+        if next_cursor:
+            assert 'rel="next"' in response.headers['Link']
+            url = f'/api/tasks?sprint_id={sprint.id}&limit=2&cursor={next_cursor}'
+        else:
+            assert 'Link' not in response.headers
+            url = None
+    
+    assert seen == [f'Paged Task {i}' for i in range(4)] + ['Test Task']
+
+
+def test_paginate_default_limit(client):
+    """Test that requests without a limit get a bounded page"""
+    client.application.config['API_PAGE_SIZE'] = 1
+    project = Project(name='Second Project')
+    db.session.add(project)
+    db.session.commit()
+    
+    response = client.get('/api/projects')
+    data = json.loads(response.data)
+    assert len(data['data']) == 1
+    assert data['pagination']['limit'] == 1
+    assert data['pagination']['next_cursor'] is not None
+
+
+def test_paginate_invalid_parameters(client):
+    """Test that malformed limit and cursor values are rejected"""
+    assert client.get('/api/issues?limit=0').status_code == 400
+    assert client.get('/api/issues?limit=abc').status_code == 400
+    
+    response = client.get('/api/issues?cursor=not-a-cursor')
+    assert response.status_code == 400
+    data = json.loads(response.data)
+    assert data['status'] == 'error'
+
+
+def test_stream_tasks_as_ndjson(client):
+    """Test that list endpoints stream every row as NDJSON when asked to"""
+    client.application.config['API_PAGE_SIZE'] = 1
+    client.application.config['API_STREAM_BATCH_SIZE'] = 2
+    sprint = Sprint.query.filter_by(name='Test Sprint').first()
+    for i in range(4):
+        db.session.add(Task(details=f'Streamed Task {i}', sprint_id=sprint.id))
+    db.session.commit()
+    
+    response = client.get(f'/api/tasks?sprint_id={sprint.id}', headers={'Accept': 'application/x-ndjson'})
+    assert response.status_code == 200
+    assert response.mimetype == 'application/x-ndjson'
+    
+    rows = [json.loads(line) for line in response.data.decode().splitlines()]
+    assert [row['details'] for row in rows] == ['Test Task'] + [f'Streamed Task {i}' for i in range(4)]
+
+
+# Conditional GET Tests
+def test_project_etag(client):
+    """Test that a matching If-None-Match returns 304 until the project changes"""
+    project = Project.query.filter_by(name='Test Project').first()
+    
+    response = client.get(f'/api/projects/{project.id}')
+    etag = response.headers['ETag']
+    assert response.status_code == 200
+    
+    response = client.get(f'/api/projects/{project.id}', headers={'If-None-Match': etag})
+    assert response.status_code == 304
+    assert response.data == b''
+    
+    # Adding a task to one of its sprints invalidates the project ETag
+    client.post('/api/tasks', json={'details': 'New Task', 'sprint_id': project.sprints.first().id})
+    response = client.get(f'/api/projects/{project.id}', headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert response.headers['ETag'] != etag
+
+
+def test_sprint_fragment_etag(client):
+    """Test that the HTMX sprint fragment supports conditional GETs"""
+    sprint = Sprint.query.filter_by(name='Test Sprint').first()
+    
+    response = client.get(f'/htmx/sprints/{sprint.id}')
+    assert response.status_code == 200
+    assert b'Test Task' in response.data
+    
+    response = client.get(f'/htmx/sprints/{sprint.id}', headers={'If-None-Match': response.headers['ETag']})
+    assert response.status_code == 304
+    
+    # The JSON and HTML representations have different ETags
+    json_etag = client.get(f'/api/sprints/{sprint.id}').headers['ETag']
+    assert json_etag != response.headers['ETag']
+
+    # Renaming the project changes the breadcrumb, so the fragment is sent again
+    etag = response.headers['ETag']
+    client.put(f'/api/projects/{sprint.project_id}', json={'name': 'Renamed Project'})
+    response = client.get(f'/htmx/sprints/{sprint.id}', headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert b'Renamed Project' in response.data
+
+
+def test_toggle_task_fragment(client):
+    """Test that toggling a task returns only the task and out-of-band counts"""
+    sprint = Sprint.query.filter_by(name='Test Sprint').first()
+    task = Task.query.filter_by(details='Test Task').first()
+    other = Task(details='Other Task', sprint_id=sprint.id)
+    db.session.add(other)
+    db.session.commit()
+
+    response = client.post(f'/htmx/tasks/{task.id}/toggle')
+    assert response.status_code == 200
+    html = response.data.decode()
+    assert f'id="task-{task.id}"' in html
+    assert 'Other Task' not in html
+    assert f'<span id="sprint-{sprint.id}-open-tasks" hx-swap-oob="innerHTML">1 Open</span>' in html
+    assert f'<span id="sprint-{sprint.id}-done-tasks" hx-swap-oob="innerHTML">1 Done</span>' in html
+
+
+def test_create_issue_fragment(client):
+    """Test that a new issue is inserted before the done issues of its sprint"""
+    sprint = Sprint.query.filter_by(name='Test Sprint').first()
+    done = Issue(details='Done Issue', completed=True, sprint_id=sprint.id)
+    db.session.add(done)
+    db.session.commit()
+
+    response = client.post('/htmx/issues/create', data={'sprint_id': sprint.id, 'details': 'New Issue'})
+    assert response.status_code == 200
+    html = response.data.decode()
+    assert f'hx-swap-oob="beforebegin:#issue-{done.id}"' in html
+    assert 'New Issue' in html
+    assert f'<span id="sidebar-sprint-{sprint.id}-open-issues" hx-swap-oob="innerHTML">2</span>' in html
+
+
+# Response Cache Tests
+def test_project_page_cache(client):
+    """Test that project pages are cached until something in the project changes"""
+    project = Project.query.filter_by(name='Test Project').first()
+    other = Project(name='Other Project')
+    db.session.add(other)
+    db.session.commit()
+    
+    client.get(f'/project/{project.id}')
+    client.get(f'/project/{other.id}')
+    response = client.get(f'/project/{project.id}')
+    assert b'Test Project' in response.data
+    
+    stats = json.loads(client.get('/api/stats').data)['data']['response_cache']
+    assert stats['hits'] == 1
+    assert stats['misses'] == 2
+    
+    # Toggling a task only drops the entries of its own project
+    task = Task.query.filter_by(details='Test Task').first()
+    client.post(f'/htmx/tasks/{task.id}/toggle')
+    stats = json.loads(client.get('/api/stats').data)['data']['response_cache']
+    assert stats['invalidations'] == 1
+    assert stats['size'] == 1
+    
+    client.get(f'/project/{other.id}')
+    stats = json.loads(client.get('/api/stats').data)['data']['response_cache']
+    assert stats['hits'] == 2
+
+
+# Bulk API Tests
+def test_bulk_tasks(client):
+    """Test creating, updating and deleting tasks in one bulk request"""
+    sprint = Sprint.query.filter_by(name='Test Sprint').first()
+    task = Task.query.filter_by(details='Test Task').first()
+    doomed = Task(details='Doomed Task', sprint_id=sprint.id)
+    db.session.add(doomed)
+    db.session.commit()
+    
+    response = client.post('/api/tasks/bulk', json={
+        'create': [{'details': f'Bulk Task {i}', 'sprint_id': sprint.id} for i in range(3)],
+        'update': [{'id': task.id, 'completed': True}],
+        'delete': [doomed.id]
+    })
+    assert response.status_code == 200
+    data = json.loads(response.data)['data']
+    assert [item['details'] for item in data['created']] == ['Bulk Task 0', 'Bulk Task 1', 'Bulk Task 2']
+    assert data['updated'][0]['completed'] is True
+    assert data['deleted'] == [doomed.id]
+    
+    # Counters and stored HTML are maintained for bulk writes too
+    sprint = Sprint.query.get(sprint.id)
+    assert sprint.get_counts()['open_tasks'] == 3
+    assert sprint.get_counts()['done_tasks'] == 1
+    assert Task.query.filter_by(details='Bulk Task 0').first().details_html == '<p>Bulk Task 0</p>'
+
+
+def test_bulk_tasks_with_string_ids(client):
+    """Test that IDs sent as strings are deserialized like in the single item endpoints"""
+    sprint = Sprint.query.filter_by(name='Test Sprint').first()
+    task = Task.query.filter_by(details='Test Task').first()
+    doomed = Task(details='Doomed Task', sprint_id=sprint.id)
+    db.session.add(doomed)
+    db.session.commit()
+
+    response = client.post('/api/tasks/bulk', json={
+        'create': [{'details': 'String Sprint Task', 'sprint_id': str(sprint.id)}],
+        'update': [{'id': str(task.id), 'sprint_id': str(sprint.id), 'completed': True}],
+        'delete': [str(doomed.id)]
+    })
+    assert response.status_code == 200
+    data = json.loads(response.data)['data']
+    assert data['created'][0]['sprint_id'] == sprint.id
+    assert data['updated'][0]['id'] == task.id
+    assert data['deleted'] == [doomed.id]
+    assert Task.query.get(doomed.id) is None
+
+
+def test_bulk_issues_are_atomic(client):
+    """Test that one invalid item rejects the whole bulk request"""
+    sprint = Sprint.query.filter_by(name='Test Sprint').first()
+    
+    response = client.post('/api/issues/bulk', json={
+        'create': [{'details': 'Good Issue', 'sprint_id': sprint.id}, {'sprint_id': sprint.id}]
+    })
+    assert response.status_code == 400
+    data = json.loads(response.data)
+    assert '1' in data['errors']['create']
+    
+    response = client.post('/api/issues/bulk', json={
+        'create': [{'details': 'Good Issue', 'sprint_id': sprint.id}],
+        'delete': [9999]
+    })
+    assert response.status_code == 404
+    assert Issue.query.filter_by(details='Good Issue').count() == 0
@@ -0,0 +1,120 @@
+"""
+Tests for the markdown rendering utilities.
+
+This file contains tests for the markdown to HTML conversion used by the
+`markdown` Jinja filter, including sanitization and the render cache.
+"""
+import os
+import sys
+
+# Add the parent directory to the path so we can import the app
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import threading
+from markupsafe import Markup
+from app.utils.markdown_parser import (
+    RenderCache, configure_pool, convert_markdown_to_html, get_cleaner, render_cache, render_many
+)
+
+
+def test_convert_markdown_to_html():
+    """Test that markdown is converted to HTML"""
+    html = convert_markdown_to_html('**bold** text')
+    assert isinstance(html, Markup)
+    assert '<strong>bold</strong>' in html
+
+
+def test_convert_markdown_strips_unsafe_tags():
+    """Test that disallowed tags are stripped from the output"""
+    html = convert_markdown_to_html('<script>alert(1)</script>hello')
+    assert '<script>' not in html
+    assert 'hello' in html
+
+
+def test_cleaner_per_thread():
+    """Test that each thread sanitizes with its own bleach cleaner, which is not thread-safe"""
+    cleaners = []
+    thread = threading.Thread(target=lambda: cleaners.append(get_cleaner()))
+    thread.start()
+    thread.join()
+    assert get_cleaner() is get_cleaner()
+    assert cleaners[0] is not get_cleaner()
+
+
+def test_convert_empty_markdown():
+    """Test that empty input returns empty Markup"""
+    assert convert_markdown_to_html('') == Markup('')
+    assert convert_markdown_to_html(None) == Markup('')
+
+
+def test_render_cache_hits_and_misses():
+    """Test that rendering the same text twice is served from the cache"""
+    render_cache.clear()
+    first = convert_markdown_to_html('- cached item')
+    second = convert_markdown_to_html('- cached item')
+    assert first is second
+    info = render_cache.info()
+    assert info['misses'] == 1
+    assert info['hits'] == 1
+
+
+def test_render_cache_evicts_least_recently_used():
+    """Test that the cache stays bounded and evicts the oldest entry"""
+    cache = RenderCache(maxsize=2)
+    cache.set('a', Markup('a'))
+    cache.set('b', Markup('b'))
+    cache.get('a')
+    cache.set('c', Markup('c'))
+    assert cache.get('b') is None
+    assert cache.get('a') == Markup('a')
+    assert cache.info()['evictions'] == 1
+    assert cache.info()['size'] == 2
+
+
+def test_render_many_deduplicates_and_keeps_order():
+    """Test that render_many renders each unique text once and keeps input order"""
+    render_cache.clear()
+    results = render_many(['*a*', '', '*b*', '*a*'])
+    assert results == [Markup('<p><em>a</em></p>'), Markup(''), Markup('<p><em>b</em></p>'), Markup('<p><em>a</em></p>')]
+    assert render_cache.info()['size'] == 2
+
+
+def test_render_many_with_process_pool():
+    """Test that large batches rendered in the process pool match in-process rendering"""
+    texts = [f'- item **{i}**' for i in range(8)]
+    expected = [convert_markdown_to_html(text) for text in texts]
+    render_cache.clear()
+    configure_pool(2, threshold=4)
+    try:
+        assert render_many(texts) == expected
+    finally:
+        configure_pool(0)
+
+
+def test_rendered_html_stored_on_write():
+    """Test that models store rendered HTML when markdown fields are written"""
+    from app import create_app, db
+    from app.models import Project
+    from app.utils.markdown_parser import RENDERER_VERSION
+    from tests.test_api import TestConfig
+
+    app = create_app(TestConfig)
+    with app.app_context():
+        db.create_all()
+        project = Project(name='Rendered', description='**first**')
+        db.session.add(project)
+        db.session.commit()
+        assert project.description_html == '<p><strong>first</strong></p>'
+        assert project.html_version == RENDERER_VERSION
+
+        project.description = '*second*'
+        db.session.commit()
+        assert project.description_html == '<p><em>second</em></p>'
+        assert project.rendered('description') == Markup('<p><em>second</em></p>')
+
+        # Rows rendered by an older renderer fall back to rendering on read
+        project.html_version = RENDERER_VERSION - 1
+        assert project.rendered('description') == Markup('<p><em>second</em></p>')
+
+        db.session.remove()
+        db.drop_all()
@@ -0,0 +1,137 @@
+"""
+Tests for the BTG MCP endpoints.
+
+This file contains tests for the /mcp endpoints used by the standalone MCP
+server, including batched tool execution.
+"""
+import os
+import sys
+import pytest
+import json
+
+# Add the parent directory to the path so we can import the app
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import create_app, db
+from app.models import Project, Sprint, Task, Issue
+from tests.test_api import TestConfig, create_test_data
+
+
+@pytest.fixture
+def client():
+    """
+    Test client fixture
+
+    Creates a test client with an in-memory database and the standard test data
+    """
+    app = create_app(TestConfig)
+    with app.test_client() as client:
+        with app.app_context():
+            db.create_all()
+            create_test_data()
+
+            yield client
+
+            db.session.remove()
+            db.drop_all()
+
+
+def test_execute_batch_with_references(client):
+    """Test that later calls can use IDs produced by earlier calls"""
+    project = Project.query.filter_by(name='Test Project').first()
+
+    response = client.post('/mcp/execute_batch', json={'calls': [
+        {'id': 'sprint', 'name': 'create_sprint', 'parameters': {'name': 'Batch Sprint', 'project_id': project.id}},
+        {'name': 'create_task', 'parameters': {'details': 'First', 'sprint_id': {'$ref': 'sprint.id'}}},
+        {'name': 'create_task', 'parameters': {'details': 'Second', 'sprint_id': {'$ref': '0.id'}}},
+        {'name': 'update_task', 'parameters': {'task_id': {'$ref': '1.id'}, 'completed': True}},
+    ]})
+    assert response.status_code == 200
+    data = json.loads(response.data)
+    assert data['committed'] is True
+    assert all('result' in entry for entry in data['results'])
+
+    sprint = Sprint.query.filter_by(name='Batch Sprint').first()
+    assert [task.details for task in sprint.get_sorted_tasks()] == ['Second', 'First']
+    assert sprint.get_counts()['done_tasks'] == 1
+
+
+def test_execute_batch_atomic_rolls_back(client):
+    """Test that a failing call rolls back the whole atomic batch"""
+    sprint = Sprint.query.filter_by(name='Test Sprint').first()
+
+    response = client.post('/mcp/execute_batch', json={'calls': [
+        {'name': 'create_task', 'parameters': {'details': 'Never saved', 'sprint_id': sprint.id}},
+        {'name': 'get_task', 'parameters': {'task_id': 9999}},
+        {'name': 'create_issue', 'parameters': {'details': 'Never run', 'sprint_id': sprint.id}},
+    ]})
+    data = json.loads(response.data)
+    assert data['committed'] is False
+    assert 'result' in data['results'][0]
+    assert 'not found' in data['results'][1]['error']
+    assert 'error' in data['results'][2]
+    assert Task.query.filter_by(details='Never saved').count() == 0
+
+
+def test_execute_batch_best_effort(client):
+    """Test that best-effort batches keep the calls that succeed"""
+    sprint = Sprint.query.filter_by(name='Test Sprint').first()
+
+    response = client.post('/mcp/execute_batch', json={'mode': 'best_effort', 'calls': [
+        {'name': 'create_task', 'parameters': {'details': 'Saved', 'sprint_id': sprint.id}},
+        {'name': 'update_sprint', 'parameters': {'sprint_id': sprint.id, 'status': 'Bogus'}},
+        {'name': 'update_task', 'parameters': {'task_id': {'$ref': '1.id'}, 'completed': True}},
+        {'name': 'create_issue', 'parameters': {'details': 'Also saved', 'sprint_id': sprint.id}},
+    ]})
+    data = json.loads(response.data)
+    assert data['committed'] is True
+    assert [('error' in entry) for entry in data['results']] == [False, True, True, False]
+    assert Task.query.filter_by(details='Saved').count() == 1
+    assert Issue.query.filter_by(details='Also saved').count() == 1
+
+
+def test_execute_coerces_parameters(client):
+    """Test that parameters are converted to the types of the tool signature"""
+    task = Task.query.filter_by(details='Test Task').first()
+
+    response = client.post('/mcp/execute', json={
+        'name': 'update_task', 'parameters': {'task_id': str(task.id), 'completed': 'true'}
+    })
+    data = json.loads(response.data)
+    assert data['result']['completed'] is True
+
+    response = client.post('/mcp/execute', json={
+        'name': 'update_task', 'parameters': {'task_id': 'abc'}
+    })
+    assert "expected integer" in json.loads(response.data)['error']
+
+    # Optional parameters for nullable columns accept null
+    response = client.post('/mcp/execute', json={
+        'name': 'create_project', 'parameters': {'name': 'Null Project', 'description': None}
+    })
+    assert json.loads(response.data)['result']['description'] is None
+
+    response = client.post('/mcp/execute', json={
+        'name': 'create_task', 'parameters': {'details': 'Null Task', 'sprint_id': None}
+    })
+    assert "expected integer" in json.loads(response.data)['error']
+
+
+def test_execute_rejects_unknown_parameters(client):
+    """Test that unknown parameters are rejected before the tool runs"""
+    sprint = Sprint.query.filter_by(name='Test Sprint').first()
+
+    response = client.post('/mcp/execute', json={
+        'name': 'create_task', 'parameters': {'title': 'Old name', 'sprint_id': sprint.id}
+    })
+    error = json.loads(response.data)['error']
+    assert "Unknown parameter(s) for tool 'create_task': title" in error
+    assert Task.query.count() == 1
+
+
+def test_tools_describe_parameters(client):
+    """Test that the tool list includes the introspected parameter types"""
+    tools = {tool['name']: tool for tool in json.loads(client.get('/mcp/tools').data)}
+    parameters = tools['create_task']['parameters']
+    assert parameters['sprint_id'] == {'type': 'integer', 'required': True}
+    assert parameters['completed'] == {'type': 'boolean', 'required': False, 'default': False}
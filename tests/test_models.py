@@ -0,0 +1,209 @@
+"""
+Tests for the BTG model helpers.
+
+This file contains tests for the query helpers on the Project and Sprint
+models that templates and API endpoints rely on.
+"""
+import os
+import sys
+import pytest
+
+# Add the parent directory to the path so we can import the app
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import event
+from app import create_app, db
+from app.models import Project, Sprint, Task, Issue
+from tests.test_api import TestConfig
+
+
+@pytest.fixture
+def app():
+    """
+    Application fixture
+    
+    Creates the app with an in-memory database and a project with two sprints
+    """
+    app = create_app(TestConfig)
+    with app.app_context():
+        db.create_all()
+        
+        project = Project(name='Model Project')
+        db.session.add(project)
+        db.session.commit()
+        
+        first = Sprint(name='First', status='Active', project_id=project.id)
+        second = Sprint(name='Second', status='Planned', project_id=project.id)
+        db.session.add_all([first, second])
+        db.session.commit()
+        
+        db.session.add_all([
+            Task(details='open task', completed=False, sprint_id=first.id),
+            Task(details='done task', completed=True, sprint_id=first.id),
+            Task(details='another open task', completed=False, sprint_id=first.id),
+            Issue(details='done issue', completed=True, sprint_id=first.id),
+            Issue(details='open issue', completed=False, sprint_id=second.id),
+        ])
+        db.session.commit()
+        
+        yield app
+        
+        db.session.remove()
+        db.drop_all()
+
+
+def count_queries():
+    """Return a list that collects every SQL statement executed on the engine"""
+    statements = []
+    event.listen(db.engine, 'before_cursor_execute',
+                 lambda conn, cursor, statement, *args: statements.append(statement))
+    return statements
+
+
+def test_sprint_counts(app):
+    """Test that sprint counts split tasks and issues into open and done"""
+    first = Sprint.query.filter_by(name='First').first()
+    second = Sprint.query.filter_by(name='Second').first()
+    
+    assert first.get_counts() == {'open_tasks': 2, 'done_tasks': 1, 'open_issues': 0, 'done_issues': 1}
+    assert second.get_counts() == {'open_tasks': 0, 'done_tasks': 0, 'open_issues': 1, 'done_issues': 0}
+
+
+def test_sorted_sprints_use_stored_counts(app):
+    """Test that sprint lists read counts from the stored counters"""
+    project = Project.query.filter_by(name='Model Project').first()
+    
+    statements = count_queries()
+    sprints = project.get_sorted_sprints()
+    for sprint in sprints:
+        sprint.get_counts()
+    
+    # Only the query loading the sprints themselves
+    assert len(statements) == 1
+    assert [sprint.name for sprint in sprints] == ['First', 'Second']
+
+
+def test_drifted_counts_fall_back_to_one_query(app):
+    """Test that drifted counters are replaced by live counts from a single query"""
+    Sprint.query.update({Sprint.open_task_count: None})
+    db.session.commit()
+    project = Project.query.filter_by(name='Model Project').first()
+    
+    statements = count_queries()
+    sprints = project.get_sorted_sprints()
+    
+    # One query for the sprints and one for the counts of all drifted sprints
+    assert len(statements) == 2
+    assert sprints[0].get_counts()['open_tasks'] == 2
+
+
+def test_counters_follow_task_and_issue_changes(app):
+    """Test that stored counters are updated on create, toggle, move and delete"""
+    first = Sprint.query.filter_by(name='First').first()
+    second = Sprint.query.filter_by(name='Second').first()
+    task = Task.query.filter_by(details='open task').first()
+    issue = Issue.query.filter_by(details='open issue').first()
+    
+    task.completed = True
+    db.session.commit()
+    assert (first.open_task_count, first.done_task_count) == (1, 2)
+    
+    task.sprint_id = second.id
+    db.session.commit()
+    assert (first.open_task_count, first.done_task_count) == (1, 1)
+    assert (second.open_task_count, second.done_task_count) == (0, 1)
+    
+    db.session.delete(issue)
+    db.session.add(Issue(details='new issue', sprint_id=first.id))
+    db.session.commit()
+    assert second.open_issue_count == 0
+    assert (first.open_issue_count, first.done_issue_count) == (1, 1)
+    
+    assert Sprint.recount(repair=False) == []
+
+
+def test_recount_repairs_drift(app):
+    """Test that recount detects and repairs counters changed outside the ORM"""
+    Sprint.query.filter_by(name='First').update({Sprint.done_task_count: 7})
+    db.session.commit()
+    
+    drifted = Sprint.recount()
+    assert [sprint.name for sprint, stored, expected in drifted] == ['First']
+    assert Sprint.query.filter_by(name='First').first().done_task_count == 1
+    assert Sprint.recount(repair=False) == []
+
+
+def test_sorted_items_use_one_query_and_are_memoized(app):
+    """Test that sorted tasks are loaded in one query and reused until expired"""
+    sprint = Sprint.query.filter_by(name='First').first()
+    statements = count_queries()
+    
+    tasks = sprint.get_sorted_tasks()
+    assert [task.completed for task in tasks] == [False, False, True]
+    assert sprint.get_sorted_tasks() is tasks
+    assert len(statements) == 1
+    
+    db.session.expire(sprint)
+    assert sprint.get_sorted_tasks() is not tasks
+
+
+def test_load_items_for_many_sprints(app):
+    """Test that tasks and issues for several sprints are loaded with one query each"""
+    sprints = Sprint.query.order_by(Sprint.id).all()
+    statements = count_queries()
+    
+    Sprint.load_items(sprints)
+    first, second = sprints
+    assert [task.details for task in first.get_sorted_tasks()][-1] == 'done task'
+    assert [issue.details for issue in first.get_sorted_issues()] == ['done issue']
+    assert second.get_sorted_tasks() == []
+    assert [issue.details for issue in second.get_sorted_issues()] == ['open issue']
+    assert len(statements) == 2
+
+
+def test_versions_bump_with_child_changes(app):
+    """Test that sprint and project versions change with the tasks and issues under them"""
+    project = Project.query.filter_by(name='Model Project').first()
+    first = Sprint.query.filter_by(name='First').first()
+    second = Sprint.query.filter_by(name='Second').first()
+    versions = (project.version, first.version, second.version)
+    
+    task = first.tasks.first()
+    task.completed = not task.completed
+    db.session.commit()
+    assert project.version == versions[0] + 1
+    assert first.version == versions[1] + 1
+    assert second.version == versions[2]
+    
+    # Renaming the project leaves its sprints alone
+    project.name = 'Renamed Project'
+    db.session.commit()
+    assert project.version == versions[0] + 2
+    assert first.version == versions[1] + 1
+
+
+def test_delete_project_cascades_in_database(app):
+    """Test that deleting a project removes its sprints, tasks and issues without loading them"""
+    project = Project.query.filter_by(name='Model Project').first()
+    db.session.expunge_all()
+    project = db.session.get(Project, project.id)
+    
+    statements = count_queries()
+    db.session.delete(project)
+    db.session.commit()
+    
+    assert not any(statement.lstrip().upper().startswith('SELECT') and 'FROM tasks' in statement
+                   for statement in statements)
+    assert Sprint.query.count() == 0
+    assert Task.query.count() == 0
+    assert Issue.query.count() == 0
+
+
+def test_delete_sprint_cascades_in_database(app):
+    """Test that deleting a sprint removes only its own tasks and issues"""
+    first = Sprint.query.filter_by(name='First').first()
+    db.session.delete(first)
+    db.session.commit()
+    
+    assert Task.query.count() == 0
+    assert [issue.details for issue in Issue.query.all()] == ['open issue']
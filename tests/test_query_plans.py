@@ -0,0 +1,103 @@
+"""
+Tests for the query plans of the hot list and filter paths.
+
+This file replays the SQL issued by the routes that filter tasks, issues and
+sprints and checks with EXPLAIN QUERY PLAN that none of them falls back to a
+full table scan.
+"""
+import os
+import re
+import sys
+import pytest
+
+# Add the parent directory to the path so we can import the app
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import event
+from app import create_app, db
+from app.models import Project, Sprint, Task, Issue
+from tests.test_api import TestConfig
+
+# Tables that must always be searched through an index on the hot paths
+INDEXED_TABLES = ('tasks', 'issues', 'sprints')
+
+# Plan lines of a full scan; SQLite before 3.36 prints "SCAN TABLE tasks"
+FULL_SCAN = re.compile(rf"^SCAN (TABLE )?({'|'.join(INDEXED_TABLES)})\b")
+
+# Routes that filter by project or sprint
+HOT_ROUTES = [
+    '/api/sprints?project_id={project_id}',
+    '/api/tasks?sprint_id={sprint_id}',
+    '/api/issues?sprint_id={sprint_id}',
+    '/project/{project_id}',
+    '/project/{project_id}/sprint/{sprint_id}',
+    '/projects?partial=project_sprints&project_id={project_id}',
+]
+
+
+@pytest.fixture
+def app():
+    """
+    Application fixture
+
+    Creates the app with an in-memory database and a small project
+    """
+    app = create_app(TestConfig)
+    with app.app_context():
+        db.create_all()
+
+        project = Project(name='Plan Project')
+        db.session.add(project)
+        db.session.commit()
+
+        sprint = Sprint(name='Plan Sprint', status='Active', project_id=project.id)
+        db.session.add(sprint)
+        db.session.commit()
+
+        db.session.add_all([
+            Task(details='plan task', sprint_id=sprint.id),
+            Issue(details='plan issue', sprint_id=sprint.id),
+        ])
+        db.session.commit()
+
+        yield app
+
+        db.session.remove()
+        db.drop_all()
+
+
+def full_scans(statement, parameters):
+    """Return the EXPLAIN QUERY PLAN lines that scan an indexed table without an index"""
+    connection = db.engine.raw_connection()
+    cursor = connection.cursor()
+    try:
+        cursor.execute(f'EXPLAIN QUERY PLAN {statement}', parameters)
+        details = [row[3] for row in cursor.fetchall()]
+    finally:
+        cursor.close()
+        connection.close()
+    return [detail for detail in details if FULL_SCAN.match(detail)]
+
+
+@pytest.mark.parametrize('route', HOT_ROUTES)
+def test_hot_route_queries_use_indexes(app, route):
+    """Test that the SELECTs behind a hot route never scan a whole table"""
+    project = Project.query.first()
+    sprint = Sprint.query.first()
+    url = route.format(project_id=project.id, sprint_id=sprint.id)
+
+    statements = []
+    def collect(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith('SELECT'):
+            statements.append((statement, parameters))
+    event.listen(db.engine, 'before_cursor_execute', collect)
+
+    try:
+        response = app.test_client().get(url)
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', collect)
+
+    assert response.status_code == 200
+    assert statements
+    for statement, parameters in statements:
+        assert full_scans(statement, parameters) == [], statement
@@ -0,0 +1,123 @@
+"""
+Tests for the full-text search.
+
+This file checks that the search index follows the projects, sprints, tasks
+and issues through the database triggers, and covers the /api/search
+endpoint, the HTMX search box and the search MCP tool.
+"""
+import os
+import sys
+import pytest
+
+# Add the parent directory to the path so we can import the app
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import create_app, db
+from app.mcp import get_compiled_tools
+from app.models import Project, Sprint, Task, Issue
+from tests.test_api import TestConfig
+
+
+@pytest.fixture
+def client():
+    """
+    Test client fixture
+
+    Creates a test client with an in-memory database holding one project
+    whose sprint, task and issue mention migrations
+    """
+    app = create_app(TestConfig)
+    with app.test_client() as client:
+        with app.app_context():
+            db.create_all()
+
+            project = Project(name='Database Migration', description='Move everything to a new schema')
+            db.session.add(project)
+            db.session.commit()
+
+            sprint = Sprint(name='Cleanup', description='Finish the migration scripts', project_id=project.id)
+            db.session.add(sprint)
+            db.session.commit()
+
+            db.session.add(Task(details='Write the <b>migration</b> for the sprint counters', sprint_id=sprint.id))
+            db.session.add(Task(details='Update the README', sprint_id=sprint.id))
+            db.session.add(Issue(details='Migrations fail on an empty database', sprint_id=sprint.id))
+            db.session.commit()
+
+            yield client
+
+            db.session.remove()
+            db.drop_all()
+
+
+def search(client, **params):
+    """Return the JSON body of a GET /api/search request"""
+    response = client.get('/api/search', query_string=params)
+    assert response.status_code == 200
+    return response.get_json()
+
+
+def test_search_ranks_and_paginates(client):
+    """Test that name matches rank first, prefixes match and pages follow the cursor"""
+    data = search(client, q='migrat')
+    results = data['data']
+    assert [result['kind'] for result in results][0] == 'project'
+    assert {result['kind'] for result in results} == {'project', 'sprint', 'task', 'issue'}
+    assert data['pagination']['next_cursor'] is None
+
+    task = next(result for result in results if result['kind'] == 'task')
+    assert task['title'] == 'Write the <b>migration</b> for the sprint counters'
+    assert '<mark>migration</mark>' in task['snippet']
+    assert '&lt;b&gt;' in task['snippet']
+    assert task['url'].endswith(f"/sprint/{task['sprint_id']}#task-{task['id']}")
+
+    first = search(client, q='migrat', limit=2)
+    assert len(first['data']) == 2
+    second = search(client, q='migrat', limit=2, cursor=first['pagination']['next_cursor'])
+    assert [r['id'] for r in first['data'] + second['data']] == [r['id'] for r in results]
+
+    assert {r['kind'] for r in search(client, q='migrat', kind='issue,task')['data']} == {'task', 'issue'}
+    assert search(client, q='migration readme')['data'] == []
+
+
+def test_index_follows_changes(client):
+    """Test that updates and cascaded deletes reach the index through the triggers"""
+    task = Task.query.filter(Task.details.like('Update%')).first()
+    response = client.put(f'/api/tasks/{task.id}', json={'details': 'Update the changelog'})
+    assert response.status_code == 200
+    assert search(client, q='readme')['data'] == []
+    assert [r['id'] for r in search(client, q='changelog')['data']] == [task.id]
+
+    project = Project.query.first()
+    assert client.delete(f'/api/projects/{project.id}').status_code == 200
+    assert search(client, q='migrat')['data'] == []
+
+
+def test_search_rejects_invalid_requests(client):
+    """Test that empty queries, unknown kinds and bad cursors are reported"""
+    for params in ({'q': '  "*'}, {'q': 'migration', 'kind': 'comment'}, {'q': 'migration', 'cursor': 'nope'}):
+        response = client.get('/api/search', query_string=params)
+        assert response.status_code == 400
+        assert response.get_json()['status'] == 'error'
+
+
+def test_search_box_and_tool(client):
+    """Test the HTMX search box fragment and the read-only search MCP tool"""
+    response = client.get('/htmx/search', query_string={'q': 'empty database'})
+    assert response.status_code == 200
+    html = response.get_data(as_text=True)
+    assert '<mark>empty</mark>' in html and '#issue-' in html
+    assert client.get('/htmx/search', query_string={'q': ''}).get_data(as_text=True) == ''
+
+    assert get_compiled_tools()['search'].read_only
+    response = client.post('/mcp/execute', json={'name': 'search', 'parameters': {'query': 'cleanup', 'kind': 'sprint'}})
+    results = response.get_json()['result']
+    assert [(result['kind'], result['title']) for result in results] == [('sprint', 'Cleanup')]
+
+
+def test_search_tool_rejects_invalid_parameters(client):
+    """Test that the search tool reports invalid input like other parameter errors"""
+    for parameters in ({'query': 'cleanup', 'kind': 'comment'}, {'query': 'cleanup', 'limit': 0}):
+        response = client.post('/mcp/execute', json={'name': 'search', 'parameters': parameters})
+        assert 'result' not in response.get_json()
+        assert response.get_json()['error']
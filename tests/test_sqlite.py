@@ -0,0 +1,113 @@
+"""
+Tests for the SQLite connection profile.
+
+This file checks that the pragmas configured in config.Config are applied to
+every connection of a file database.
+"""
+import os
+import sys
+import pytest
+
+# Add the parent directory to the path so we can import the app
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import create_app, db
+from app.utils.engines import READER_BIND_KEY
+from app.utils.sqlite import build_pragmas
+from config import optional_int
+from tests.test_api import TestConfig
+
+
+@pytest.fixture
+def app(tmp_path):
+    """
+    Application fixture
+
+    Creates the app with a SQLite database file in a temporary directory
+    """
+    class FileConfig(TestConfig):
+        SQLALCHEMY_DATABASE_URI = 'sqlite:///' + str(tmp_path / 'profile.db')
+
+    app = create_app(FileConfig)
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.engine.dispose()
+
+
+def test_profile_applied_to_connections(app):
+    """Test that new connections use WAL, the configured timeouts and foreign keys"""
+    with db.engine.connect() as connection:
+        pragma = lambda name: connection.exec_driver_sql(f'PRAGMA {name}').scalar()
+        assert pragma('journal_mode') == 'wal'
+        assert pragma('synchronous') == 1  # NORMAL
+        assert pragma('busy_timeout') == app.config['SQLITE_BUSY_TIMEOUT']
+        assert pragma('cache_size') == app.config['SQLITE_CACHE_SIZE']
+        assert pragma('temp_store') == 2  # MEMORY
+        assert pragma('foreign_keys') == 1
+
+
+def test_build_pragmas_skips_unset_and_rejects_invalid_values():
+    """Test that empty settings keep the SQLite default and values cannot inject SQL"""
+    pragmas = build_pragmas({'SQLITE_JOURNAL_MODE': 'WAL', 'SQLITE_MMAP_SIZE': None})
+    assert pragmas == ['PRAGMA foreign_keys=ON', 'PRAGMA journal_mode=WAL']
+
+    with pytest.raises(ValueError):
+        build_pragmas({'SQLITE_SYNCHRONOUS': 'OFF; DROP TABLE tasks'})
+
+
+def test_optional_int_settings(monkeypatch):
+    """Test that integer pragma settings are the default when unset, None when empty and int otherwise"""
+    monkeypatch.delenv('SQLITE_BUSY_TIMEOUT', raising=False)
+    assert optional_int('SQLITE_BUSY_TIMEOUT', 5000) == 5000
+
+    monkeypatch.setenv('SQLITE_BUSY_TIMEOUT', '')
+    assert optional_int('SQLITE_BUSY_TIMEOUT', 5000) is None
+
+    monkeypatch.setenv('SQLITE_BUSY_TIMEOUT', '2000')
+    assert optional_int('SQLITE_BUSY_TIMEOUT', 5000) == 2000
+
+    monkeypatch.setenv('SQLITE_BUSY_TIMEOUT', 'soon')
+    with pytest.raises(ValueError):
+        optional_int('SQLITE_BUSY_TIMEOUT', 5000)
+
+
+def test_reads_routed_to_reader_engine(app):
+    """Test that GET requests and read-only tools use the read-only engine and writes the writer"""
+    from sqlalchemy import event
+    from app.models import Project
+    from app.utils.engines import READER_BIND_KEY
+
+    project = Project(name='Routed Project')
+    db.session.add(project)
+    db.session.commit()
+
+    reader = db.engines[READER_BIND_KEY]
+    assert reader.url.query['mode'] == 'ro'
+    used = []
+    for name, engine in (('reader', reader), ('writer', db.engine)):
+        event.listen(engine, 'before_cursor_execute',
+                     lambda *args, name=name: used.append(name))
+
+    client = app.test_client()
+    assert client.get('/api/projects').status_code == 200
+    assert used and set(used) == {'reader'}
+
+    used.clear()
+    response = client.post('/mcp/execute', json={'name': 'get_project', 'parameters': {'project_id': project.id}})
+    assert response.get_json()['result']['name'] == 'Routed Project'
+    assert set(used) == {'reader'}
+
+    used.clear()
+    assert client.post('/api/projects', json={'name': 'Written Project'}).status_code == 201
+    assert set(used) == {'writer'}
+
+
+def test_reader_bind_not_in_create_all(app):
+    """Test that an app with a reader engine does not break create_all() for apps without one"""
+    assert READER_BIND_KEY not in db.metadatas
+    other = create_app(TestConfig)
+    with other.app_context():
+        db.create_all()
+        db.drop_all()